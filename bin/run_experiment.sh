@@ -21,7 +21,21 @@ function re_main ()
 
     re_parse_options "${@}" && shift $((OPTIND - 1)) || return "${?}";
 
-    wcet_generate_bc "${1}" "${ONE_DIR_ONE_BC}" || { return "${?}"; };
+    if (( 0 != MERGE_SHARDS )); then
+        wcet_merge_shards "${2}" "${MERGE_SHARDS}" "${@:3}" || { return "${?}"; };
+        return 0;
+    fi
+
+    # shards run over bytecode generated along with the manifest
+    if (( 0 == SHARD_COUNT )); then
+        wcet_generate_bc "${1}" "${ONE_DIR_ONE_BC}" || { return "${?}"; };
+    fi
+
+    if (( 0 != MANIFEST_ONLY )); then
+        wcet_write_manifest "${@:1:2}" "${UNROLL_LOOPS}" "${NUM_RANDOM_SEEDS}" \
+                            "${USE_EDGES_MATCH}" "${@:3}" || { return "${?}"; };
+        return 0;
+    fi
 
     wcet_run_experiment "${@:1:2}" "${UNROLL_LOOPS}" "${NUM_RANDOM_SEEDS}" \
                         "${USE_EDGES_MATCH}" "${@:3}" || { return "${?}"; };
@@ -69,8 +83,24 @@ function re_parse_options()
     ONE_DIR_ONE_BC=0    # treat all `.c` files in a directory as part of the same executable
     NUM_RANDOM_SEEDS=0  # 0: disabled, else: use up to # random [fixed] seeds [only for optimathsat]
     USE_EDGES_MATCH=0   # 0: disabled, else: use edge costs instead of block costs
+    PRINT_STATISTICS=0  # 0: disabled, else: collect omt solver statistics
+    MAX_CUTS=-1         # <0: disabled, 0: drop redundant cuts, else: keep only # top-ranked cuts
+    SIMPLIFY_GRAPH=0    # 0: disabled, else: simplify source code graph before encoding
+    PATH_CHECK=0        # 0: disabled, else: seconds to timeout for longest path feasibility check
+    TOP_PATHS=0         # 0: disabled, else: check feasibility of up to # longest paths to bound the optimum
+    GUARD_CUTS=0        # 0: disabled, else: share one formula with guarded cuts among handlers with/without cuts
+    REGION_JOBS=0       # 0: disabled, else: solve single-entry/single-exit regions with # parallel solvers
+    MANIFEST_ONLY=0     # 0: disabled, else: only write the manifest of the experiment
+    SHARD_INDEX=0       # index of the shard to be run, within [0, SHARD_COUNT)
+    SHARD_COUNT=0       # 0: disabled, else: run only the jobs of shard SHARD_INDEX out of #
+    MERGE_SHARDS=0      # 0: disabled, else: merge the results of # shards
+    RESUME=0            # 0: disabled, else: skip jobs already completed with the same inputs
+    ESCALATION=0        # 0: disabled, else: first timeout (seconds), doubled for unsolved jobs up to TIMEOUT
+    BC_JOBS=1           # number of compilation units compiled in parallel
+    MEM_BUDGET=0        # 0: disabled, else: memory budget of the generator (MB)
+    COMPRESSION=        # empty: disabled, else: tool compressing formulas and solver outputs
     OPTIND=1
-    while getopts "h?t:wfcs:r:vmuz:e" opt; do
+    while getopts "h?t:wfcs:r:vmuz:eak:gp:y:bd:Mx:X:Rl:j:B:Z:" opt; do
         case "${opt}" in
             h|\?)
                 re_usage; exit 0; ;;
@@ -102,6 +132,37 @@ function re_parse_options()
                 [[ "${OPTARG}" =~ ^[0-9]+$ ]] && NUM_RANDOM_SEEDS=$((OPTARG)) || { re_usage; return 1; }; ;;
             e)
                 USE_EDGES_MATCH=1; ;;
+            a)
+                PRINT_STATISTICS=1; ;;
+            k)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && MAX_CUTS=$((OPTARG))         || { re_usage; return 1; }; ;;
+            g)
+                SIMPLIFY_GRAPH=1; ;;
+            p)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && PATH_CHECK=$((OPTARG))       || { re_usage; return 1; }; ;;
+            y)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && TOP_PATHS=$((OPTARG))        || { re_usage; return 1; }; ;;
+            b)
+                GUARD_CUTS=1; ;;
+            d)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && REGION_JOBS=$((OPTARG))      || { re_usage; return 1; }; ;;
+            M)
+                MANIFEST_ONLY=1; ;;
+            x)
+                [[ "${OPTARG}" =~ ^([0-9]+)/([1-9][0-9]*)$ ]] && (( BASH_REMATCH[1] < BASH_REMATCH[2] )) || { re_usage; return 1; };
+                SHARD_INDEX=$((BASH_REMATCH[1])); SHARD_COUNT=$((BASH_REMATCH[2])); ;;
+            X)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && MERGE_SHARDS=$((OPTARG))     || { re_usage; return 1; }; ;;
+            R)
+                RESUME=1; ;;
+            l)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && ESCALATION=$((OPTARG))       || { re_usage; return 1; }; ;;
+            j)
+                [[ "${OPTARG}" =~ ^[1-9][0-9]*$ ]] && BC_JOBS=$((OPTARG))     || { re_usage; return 1; }; ;;
+            B)
+                [[ "${OPTARG}" =~ ^[0-9]+$ ]] && MEM_BUDGET=$((OPTARG))       || { re_usage; return 1; }; ;;
+            Z)
+                [[ "${OPTARG}" =~ ^(gzip|zstd)$ ]] && COMPRESSION="${OPTARG}"  || { re_usage; return 1; }; ;;
             *)
                 re_usage; return 1; ;;
         esac
@@ -158,6 +219,54 @@ DESCRIPTION
             maximum 100 random values.
     -e      set costs over edges instead of blocks, edge costs are expected to be
             saved in `<base_name>.edges.match` in the same directory as `base_name.bc`
+    -a      ask the omt solver to print all of its statistics, which are parsed
+            into `key value` pairs and saved in a `.stats` file next to each `.log`
+    -k N    drop cuts which are redundant w.r.t. the remaining ones, and rank these
+            by decreasing slack and sub-graph size; if N is different than zero,
+            keep only the N top-ranked cuts [only for handlers with cuts]
+    -g      simplify the source code graph before encoding it, by pruning nodes
+            that can not reach the end node and collapsing chains of nodes
+    -p N    if different than zero, first check whether the longest syntactic path
+            is feasible with a timeout of N seconds; if so, its cost is reported as
+            the optimum value and no optimization is performed, otherwise the unsat
+            assumptions are used to add a cut [only for handlers with cuts]
+    -y N    if different than zero, check the feasibility of up to N longest
+            syntactic paths, in order of decreasing cost, and use the result to
+            bound the optimum value in the omt formula
+    -b      generate a single formula in which each cut is guarded by a boolean
+            literal (ext: `.gcuts.smt2`), and share it among the handlers with and
+            without cuts, which only toggle the assertion of the guards
+    -d N    if different than zero, split the source code graph into single-entry/
+            single-exit regions, maximize the cost of each region with up to N solvers
+            running in parallel, and use the sum of the maxima to bound the optimum
+            value in the omt formula [exact if the worst-case paths are compatible]
+    -M      write the manifest of each handler (`STATISTICS_DIR/UID/UID.manifest`),
+            which lists every (bytecode, handler, seed) job in canonical order along
+            with its inputs, after generating the bytecode, and exit
+    -x I/N  run only the jobs of the manifest which belong to shard I out of N, the
+            shard of a job is given by a stable hash of its bytecode path, and store
+            the results in per-shard files; the manifests must be written beforehand
+            with -M and the same options, and shards can run as separate processes
+    -X N    merge the per-shard results of N completed shards into the summary file
+            of each handler, with rows in manifest order, and exit
+    -R      resume an interrupted experiment, skipping the jobs which the journal of
+            each handler (`STATISTICS_DIR/UID/UID.journal`) records as completed with
+            the same inputs; the journal is always appended to, and summary files are
+            always rebuilt from it
+    -l N    if different than zero and lower than the timeout, first run every job
+            with a timeout of N seconds, then run the jobs left unsolved again with
+            a timeout doubled at each round, up to the timeout given with -t; the
+            timeout of the last run of each job is reported in the summary file
+    -j N    compile up to N files (or directories, with -m) in parallel when generating
+            bytecode; bytecode whose sources did not change since it was generated
+            (see `<base_name>.bc.sha1`) is never compiled again, and the warnings of the
+            compiler are saved in `<base_name>.bc.log`
+    -B N    if different than zero, make the generator of OMT formulas fail with an
+            explicit error as soon as it exceeds N MB of memory, instead of being
+            killed by the system on large benchmarks
+    -Z TOOL compress the generated formulas (`.gen`, `.smt2`) and the outputs of the
+            solvers (`.log`) with TOOL, either gzip (`.gz`) or zstd (`.zst`), as they are
+            written; solvers and parsers read them through streaming decompression
 
 HANDLER UIDS
     z3_0                    -- z3          + default encoding
@@ -182,6 +291,19 @@ HANDLER UIDS
     smtopt_3_cuts           -- smtopt      + bad default encoding + cuts
     optimathsat_3           -- optimathsat + bad default encoding
     optimathsat_3_cuts      -- optimathsat + bad default encoding + cuts
+    z3_4                    -- z3          + bit-vector encoding
+    z3_4_cuts               -- z3          + bit-vector encoding  + cuts
+    optimathsat_4           -- optimathsat + bit-vector encoding
+    optimathsat_4_cuts      -- optimathsat + bit-vector encoding  + cuts
+    z3_5_cuts               -- z3          + partial-sums encoding + cuts
+    optimathsat_5_cuts      -- optimathsat + partial-sums encoding + cuts
+    z3_6                    -- z3          + parametric encoding
+    z3_6_cuts               -- z3          + parametric encoding   + cuts
+    optimathsat_6           -- optimathsat + parametric encoding
+    optimathsat_6_cuts      -- optimathsat + parametric encoding   + cuts
+    driver_z3_0_cuts        -- omt driver over z3          + default encoding + lazy cuts
+    driver_optimathsat_0_cuts
+                            -- omt driver over optimathsat + default encoding + lazy cuts
 
     for more, see `wcet_omt/wcet_lib/wcet_handlers.sh`
 
@@ -0,0 +1,157 @@
+import os, sys, io, gzip, subprocess
+
+###
+### Globals
+###
+
+# compression tools, by file suffix
+COMPRESSION_SUFFIXES = {".gz" : "gzip", ".zst" : "zstd"}
+
+###
+### Compressed files
+###
+#
+# Whether a file is compressed, and how, depends on its suffix only: `.gz` files
+# are handled by the gzip module, `.zst` files are piped through the zstd tool
+# (there is no zstd module in the standard library), any other file is a plain
+# text file. Compressed files are streamed, they are never decompressed as a
+# whole in memory nor on disk.
+
+class ZstdFile:
+    """class ZstdFile, a text file object whose content is piped through zstd.
+
+    Init:
+        - file_name : name of the compressed file
+        - mode      : 'r' (decompress from `file_name`) or 'w' (compress into `file_name`)
+        - out_fd    : file object receiving the compressed data in place of
+                      `file_name`, e.g. sys.stdout, mode 'w' only
+    """
+
+    def __init__(self, file_name, mode='r', out_fd=None):
+        assert(mode in ['r', 'w'])
+        if mode == 'r':
+            if not os.path.isfile(file_name):
+                raise IOError("file `" + file_name + "` does not exist")
+            self._proc = subprocess.Popen(["zstd", "-q", "-d", "-c", file_name],
+                                          stdout=subprocess.PIPE, universal_newlines=True)
+            self._fd = self._proc.stdout
+        else:
+            dst_fd = open(file_name, 'wb') if out_fd is None else out_fd
+            try:
+                self._proc = subprocess.Popen(["zstd", "-q", "-c"], stdin=subprocess.PIPE,
+                                              stdout=dst_fd, universal_newlines=True)
+            finally:
+                if out_fd is None:
+                    dst_fd.close() # zstd owns a copy of the descriptor
+            self._fd = self._proc.stdin
+        self._name = file_name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        return iter(self._fd)
+
+    def read(self, *args):
+        return self._fd.read(*args)
+
+    def readline(self, *args):
+        return self._fd.readline(*args)
+
+    def write(self, txt):
+        self._fd.write(txt)
+
+    def flush(self):
+        self._fd.flush()
+
+    def close(self):
+        if self._fd.closed:
+            return
+        self._fd.close()
+        if self._proc.wait() != 0:
+            raise IOError("zstd error on file `" + self._name + "`")
+
+def get_compression(file_name):
+    """returns the compression tool of a file, after its suffix, or None"""
+    return COMPRESSION_SUFFIXES.get(split_compression_suffix(file_name)[1])
+
+def split_compression_suffix(file_name):
+    """returns a pair (file name without compression suffix, suffix), where
+    the suffix is empty for plain text files"""
+    for suffix in COMPRESSION_SUFFIXES.keys():
+        if file_name.endswith(suffix):
+            return file_name[:-len(suffix)], suffix
+    return file_name, ""
+
+def open_file(file_name, mode='r'):
+    """opens a plain or compressed file, after its suffix, for reading ('r') or
+    writing ('w') text"""
+    tool = get_compression(file_name)
+    if tool == "gzip":
+        if sys.version_info[0] < 3:
+            return gzip.open(file_name, mode + 'b')
+        return gzip.open(file_name, mode + 't')
+    elif tool == "zstd":
+        return ZstdFile(file_name, mode)
+    return open(file_name, mode)
+
+def compress_stream(out_fd, tool):
+    """returns a text file object compressing anything written into it with
+    `tool` ("gzip" or "zstd") into the file object `out_fd`, e.g. sys.stdout;
+    the returned object must be closed to complete the compressed stream"""
+    if tool == "gzip":
+        if sys.version_info[0] < 3:
+            return gzip.GzipFile(filename="", fileobj=out_fd, mode='wb', mtime=0)
+        return io.TextIOWrapper(gzip.GzipFile(filename="", fileobj=out_fd.buffer, mode='wb', mtime=0))
+    elif tool == "zstd":
+        out_fd.flush()
+        return ZstdFile("<" + getattr(out_fd, "name", "stream") + ">", 'w', out_fd)
+    raise ValueError("unknown compression tool `" + str(tool) + "`")
+
+###
+###
+###
+
+def test():
+    """round-trips a text through plain, gzip and zstd files, the latter only
+    if the zstd tool is installed, and checks suffix handling"""
+    import shutil, tempfile
+    assert(split_compression_suffix("a/foo.0.smt2.gz") == ("a/foo.0.smt2", ".gz"))
+    assert(split_compression_suffix("a/foo.log.zst") == ("a/foo.log", ".zst"))
+    assert(split_compression_suffix("a/foo.gen") == ("a/foo.gen", ""))
+    assert(get_compression("foo.gz") == "gzip" and get_compression("foo") is None)
+
+    txt = "(declare-fun b_1 () Bool)\n(assert b_1)\n" * 100
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        suffixes = ["", ".gz"]
+        try:
+            subprocess.call(["zstd", "--version"], stdout=subprocess.PIPE)
+            suffixes.append(".zst")
+        except OSError:
+            print("zstd not installed, skipped")
+        for suffix in suffixes:
+            file_name = os.path.join(tmp_dir, "t.smt2" + suffix)
+            with open_file(file_name, 'w') as fd:
+                fd.write(txt)
+            with open_file(file_name, 'r') as fd:
+                assert(fd.read() == txt)
+            with open_file(file_name, 'r') as fd:
+                assert(len([line for line in fd]) == 200)
+            if suffix != "":
+                with open(file_name, 'rb') as fd:
+                    assert(len(fd.read()) < len(txt)) # actually compressed
+        try:
+            open_file(os.path.join(tmp_dir, "missing.zst"), 'r')
+            assert(False)
+        except IOError:
+            pass
+    finally:
+        shutil.rmtree(tmp_dir)
+    print("compression: ok")
+
+if (__name__ == "__main__"):
+    test()
@@ -0,0 +1,121 @@
+import os, mmap, array, struct, hashlib
+
+###
+### Globals
+###
+
+CTAB_MAGIC = b"WCETCTAB"
+CTAB_VERSION = 1
+
+# magic, version, digest, number of node costs, number of edge costs
+CTAB_HEADER = struct.Struct("<8sI20sII")
+
+###
+### Cost Table
+###
+#
+# A cost table is the compiled version of a matching file (toolchain generated),
+# in which labels are already resolved into node uids and costs are stored in
+# packed integer arrays:
+#
+#       HEADER | node uids | node costs | edge src uids | edge dst uids | edge costs
+#
+# All arrays hold 32-bit signed integers in native byte order. The digest in the
+# header is computed over the content of the matching file and the label to uid
+# mapping of the graph, hence the table is rebuilt as soon as either one changes.
+
+def get_cost_table_file(matching_file):
+    """returns the name of the cost table compiled from `matching_file`"""
+    if matching_file.endswith(".match"):
+        return matching_file[:-len(".match")] + ".ctab"
+    return matching_file + ".ctab"
+
+def get_cost_table(matching_file, label2uid):
+    """returns the cost table of `matching_file`, which is loaded from its compiled
+    version if this is up-to-date, and compiled (and stored) otherwise"""
+    with open(matching_file, 'rb') as fd:
+        matchings = fd.read()
+    digest = compute_digest(matchings, label2uid)
+    table_file = get_cost_table_file(matching_file)
+
+    table = load_cost_table(table_file, digest)
+    if table is None:
+        table = compile_cost_table(matchings.decode(), label2uid)
+        try:
+            write_cost_table(table_file, digest, table)
+        except (IOError, OSError):
+            pass # e.g. read-only benchmark directory, the table is rebuilt next time
+    return table
+
+def compute_digest(matchings, label2uid):
+    """returns the sha1 digest of a matching file content and of the label to
+    uid mapping used to resolve its labels"""
+    h = hashlib.sha1(matchings)
+    for label in sorted(label2uid.keys()):
+        h.update((label + ":" + str(label2uid[label]) + "\n").encode())
+    return h.digest()
+
+def compile_cost_table(matchings, label2uid):
+    """parses the input matching string (toolchain generated) and returns a tuple
+    of arrays (node uids, node costs, edge src uids, edge dst uids, edge costs)"""
+    table = tuple([array.array('i') for idx in range(0, 5)])
+    node_uids, node_costs, edge_srcs, edge_dsts, edge_costs = table
+    for line in matchings.split('\n'):
+        if len(line) <= 0:
+            continue
+        for offending_symbol in "()\n% ": # ignore pychecker: iteration over string is intended
+           line = line.replace(offending_symbol, "")
+        src_label, dst_label, cost = line.split(',')
+        if dst_label == "":
+            node_uids.append(label2uid[src_label])
+            node_costs.append(int(cost))
+        else:
+            edge_srcs.append(label2uid[src_label])
+            edge_dsts.append(label2uid[dst_label])
+            edge_costs.append(int(cost))
+    return table
+
+def write_cost_table(file, digest, table):
+    """stores a cost table into `file`, atomically"""
+    node_uids, node_costs, edge_srcs, edge_dsts, edge_costs = table
+    tmp_file = file + "." + str(os.getpid())
+    with open(tmp_file, 'wb') as fd:
+        fd.write(CTAB_HEADER.pack(CTAB_MAGIC, CTAB_VERSION, digest, len(node_uids), len(edge_srcs)))
+        for arr in table:
+            fd.write(arr.tostring() if hasattr(arr, "tostring") else arr.tobytes())
+    os.rename(tmp_file, file)
+
+def load_cost_table(file, digest):
+    """memory-maps a cost table from `file`, and returns it, or None if the file
+    does not exist, is malformed, or its digest differs from `digest`"""
+    try:
+        with open(file, 'rb') as fd:
+            buf = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError, ValueError):
+        return None # missing or empty file
+    try:
+        if len(buf) < CTAB_HEADER.size:
+            return None
+        magic, version, file_digest, num_nodes, num_edges = CTAB_HEADER.unpack(buf[0:CTAB_HEADER.size])
+        if magic != CTAB_MAGIC or version != CTAB_VERSION or file_digest != digest:
+            return None
+        item_size = array.array('i').itemsize
+        sizes = [num_nodes, num_nodes, num_edges, num_edges, num_edges]
+        if len(buf) != CTAB_HEADER.size + sum(sizes) * item_size:
+            return None
+        table = []
+        offset = CTAB_HEADER.size
+        for size in sizes:
+            table.append(array.array('i', buf[offset:offset + size * item_size]))
+            offset += size * item_size
+        return tuple(table)
+    finally:
+        buf.close()
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    # TODO: unit-testing
+    pass
@@ -1,6 +1,14 @@
-import copy
+import re, copy, heapq
 from smt2_env import *
 from graph_elements import *
+from cost_table import *
+
+###
+### Globals
+###
+
+# call annotating the iteration bound of the innermost loop containing it
+LOOP_BOUND = re.compile(r"@wcet_loop_bound\(i[0-9]+ ([0-9]+)\)")
 
 ###
 ### SourceCodeGraph
@@ -8,7 +16,7 @@ from graph_elements import *
 
 class SourceCodeGraph:
     """class SourceCodeGraph, stores the source code graph generated from a *loop-free*
-    piece of code."""
+    piece of code, or from a piece of code whose loops are bounded (see summarize_loops)."""
 
     def __init__(self):
         self.reset()
@@ -24,6 +32,13 @@ class SourceCodeGraph:
         self._start_uid = -1    # uid of graph's start node
         self._end_uid = -1      # uid of graph's end node
         self._cuts = {}         # map of cuts augmenting the graph
+        self._cuts_order = None # ranking of cuts, if any [uids]
+        self._segments = {}     # labels of chains of nodes collapsed into a single node [uids]
+        self._simplified = False
+        self._bv_widths = None  # bit-widths of costs and of their sums [bit-vector encoding]
+        self._nested_cuts = {}  # maximal cuts nested in each cut, None for the whole graph [partial-sum encoding]
+        self._loop_annotations = {} # iteration bounds annotated in blocks [uids]
+        self._loops = {}        # bound and iteration cost of each summarized loop [header uids]
         return
 
     def get_node(self, uid):
@@ -83,6 +98,11 @@ class SourceCodeGraph:
             self._nodes[b.get_uid()] = b
             self._label2uid[block_label] = b.get_uid()
 
+            # collect iteration bound annotations
+            bounds = [int(bound) for bound in LOOP_BOUND.findall(instructions)]
+            if len(bounds) > 0:
+                self._loop_annotations[b.get_uid()] = max(bounds)
+
             # collect edges
             if instructions.find('br ') != -1:
                 for succ in instructions.split('br ')[1].strip().split('label'):
@@ -115,41 +135,50 @@ class SourceCodeGraph:
     def update_costs_with_matchings(self, matchings):
         """updates cost of nodes and edges in the graph with the values specified
         in the input matching string (toolchain generated)."""
-        lines = matchings.split('\n')
-        updated_node_uids = []
-        for line in lines:
-            if len(line) <= 0:
-                continue
-            for offending_symbol in "()\n% ": # ignore pychecker: iteration over string is intended
-               line = line.replace(offending_symbol, "")
-            src_label, dst_label, cost = line.split(',')
-            if dst_label == "":
-                src_uid = self._label2uid[src_label]
-                self._nodes[src_uid].set_cost(cost)
-                updated_node_uids.append(src_uid)
-            else:
-                src_uid = self._label2uid[src_label]
-                dst_uid = self._label2uid[dst_label]
-                edge_id = str(src_uid) + "_" + str(dst_uid)
-                self._edges[edge_id].set_cost(cost)
-        # NOTE: rationale unknown
-        for node_uid in self._nodes.keys():
-            if node_uid not in updated_node_uids:
-                self._nodes[node_uid].set_cost(0)
+        self.update_costs_with_cost_table(compile_cost_table(matchings, self._label2uid))
         return
 
+    def update_costs_with_cost_table(self, table):
+        """updates cost of nodes and edges in the graph with the values stored in the
+        input cost table (see cost_table.py)."""
+        node_uids, node_costs, edge_srcs, edge_dsts, edge_costs = table
+        # NOTE: rationale unknown, nodes with no matching have no cost
+        for node in self._nodes.values():
+            node.set_cost(0)
+        for node_uid, cost in zip(node_uids, node_costs):
+            self._nodes[node_uid].set_cost(cost)
+        for src_uid, dst_uid, cost in zip(edge_srcs, edge_dsts, edge_costs):
+            self._edges[Edge.get_edge_uid(src_uid, dst_uid)].set_cost(cost)
+        return
+
+    def get_label2uid(self):
+        return self._label2uid
+
     def dump_graph(self):
         """prints the graph on stdout"""
         # TODO
         return
 
-    def add_graph_to_env(self, env, encoding):
-        """encodes the graph as a piece of SMT2 formula, and adds it to the input `env`"""
+    def add_graph_to_env(self, env, encoding, lower=None, upper=None, guard_cuts=False):
+        """encodes the graph as a piece of SMT2 formula, and adds it to the input `env`;
+        `lower` and `upper`, if not None, are known bounds on the optimum value that
+        replace 0 and the longest syntactic path respectively.
+
+        When `guard_cuts` is set, each cut is implied by a fresh boolean guard
+        `g_<cut uid>`, and every guard is asserted on a line of its own, so that any
+        subset of cuts can be disabled by commenting out these lines or by removing
+        them in favour of `check-sat-assuming`."""
 
         cost = None
 
         if (ENC_DIFFERENCE_LOGIC == encoding):
             cost = self._add_graph_to_env_with_difference_logic(env, encoding)
+        elif (ENC_BITVECTOR == encoding):
+            cost = self._add_graph_to_env_with_bitvectors(env, encoding)
+        elif (ENC_PARTIAL_SUMS == encoding):
+            cost = self._add_graph_to_env_with_partial_sums(env, encoding)
+        elif (ENC_PARAMETRIC == encoding):
+            cost = self._add_graph_to_env_parametric(env, encoding)
         elif (ENC_ASSERT_SOFT == encoding):
             cost = self._add_graph_to_env_with_assert_soft(env, encoding)
         elif (ENC_DEFAULT_BAD == encoding):
@@ -158,11 +187,17 @@ class SourceCodeGraph:
             cost = self._add_graph_to_env_default(env, encoding)
 
         # add cuts
-        uids = self._cuts.keys()
-        uids.sort()
+        uids = self._get_cut_uids()
+        guards = []
         for cut_uid in uids:
             cut = self._cuts[cut_uid]
-            cut.add_cut_to_env(env, encoding)
+            guard = None
+            if guard_cuts:
+                guard = env.declare_fun(cut.get_guard_var(), Environment.BOOL)
+                guards.append(guard)
+            cut.add_cut_to_env(env, encoding, guard)
+        for guard in guards:
+            env.assert_formula(guard)
 
         # extra assertion
         f = make_and([self._nodes[self._start_uid].get_bvar(),
@@ -170,10 +205,24 @@ class SourceCodeGraph:
         env.assert_formula(f)
 
         longest_path, max_path_cvars, node_cvars, edge_cvars = self.compute_longest_syntactic_path(False)
-        if (ENC_DEFAULT_BAD != encoding):
-            f = make_and([make_leq(0, cost), make_leq(cost, longest_path)])
+        lower = 0 if lower is None else lower
+        upper = longest_path if upper is None else upper
+        if (ENC_BITVECTOR == encoding):
+            width, sum_width = self._bv_widths
+            f = make_and([make_bvule(make_bv(lower, sum_width), cost), make_bvule(cost, make_bv(upper, sum_width))])
+            env.assert_formula(f)
+            env.maximize(cost, make_bv(lower, sum_width), make_bv(upper + 1, sum_width))
+        elif (ENC_PARAMETRIC == encoding):
+            cut_bounds = dict([(cut_uid, self._cuts[cut_uid].get_cost()) for cut_uid in uids])
+            for name, value in self.get_cost_constants(cut_bounds, lower, upper):
+                env.define_fun(name, Environment.INT, value)
+            f = make_and([make_leq("klower", cost), make_leq(cost, "kupper")])
+            env.assert_formula(f)
+            env.maximize(cost, None, None)
+        elif (ENC_DEFAULT_BAD != encoding):
+            f = make_and([make_leq(lower, cost), make_leq(cost, upper)])
             env.assert_formula(f)
-            env.maximize(cost, 0, longest_path + 1)
+            env.maximize(cost, lower, upper + 1)
         else:
             env.maximize(cost, None, None)
 
@@ -183,6 +232,8 @@ class SourceCodeGraph:
         env.add_comment("NB_PATHS = " + str(no_paths))
         env.add_comment("NB_PATHS_DIGITS = " + str(len(str(no_paths))))
         env.add_comment("NB_CUTS = " + str(len(self._cuts.keys()))) # includes cut from start to end node
+        if guard_cuts:
+            env.add_comment("NB_GUARDED_CUTS = " + str(len(guards)))
         env.add_comment("LONGEST_PATH = " + str(longest_path))
 
         return
@@ -199,6 +250,8 @@ class SourceCodeGraph:
             node = self._nodes[node_uid]
             if (node.get_cost() != 0):
                 csum.append(node.get_cost_var())
+            elif self._simplified:
+                continue # 0-cost variables appear nowhere else
             node.add_node_to_env(env, encoding)
 
         # add edges
@@ -208,6 +261,8 @@ class SourceCodeGraph:
             edge = self._edges[edge_uid]
             if (edge.get_cost() != 0):
                 csum.append(edge.get_cost_var())
+            elif self._simplified:
+                continue # 0-cost variables appear nowhere else
             edge.add_edge_to_env(env, encoding)
 
         # add objective function
@@ -216,7 +271,241 @@ class SourceCodeGraph:
 
         return cost
 
-    def _add_graph_to_env_default(self, env, encoding):
+    def _add_graph_to_env_with_bitvectors(self, env, encoding):
+        """like the default encoding, with costs encoded as bit-vectors which are wide
+        enough to hold LONGEST_PATH + 1, and sums of costs encoded with extra bits so
+        that they can not overflow"""
+        self._compute_bv_widths()
+        width, sum_width = self._bv_widths
+        csum = []
+        cost = env.declare_fun("cost", make_bv_sort(sum_width))
+
+        # add nodes
+        uids = self._nodes.keys()
+        uids.sort()
+        for node_uid in uids:
+            node = self._nodes[node_uid]
+            if (node.get_cost() != 0):
+                csum.append(make_zero_extend(node.get_cost_var(), sum_width - width))
+            elif self._simplified:
+                continue # 0-cost variables appear nowhere else
+            node.add_node_to_env(env, encoding)
+
+        # add edges
+        uids = self._edges.keys()
+        uids.sort()
+        for edge_uid in uids:
+            edge = self._edges[edge_uid]
+            if (edge.get_cost() != 0):
+                csum.append(make_zero_extend(edge.get_cost_var(), sum_width - width))
+            elif self._simplified:
+                continue # 0-cost variables appear nowhere else
+            edge.add_edge_to_env(env, encoding)
+
+        # add objective function
+        f = make_equal(cost, make_bvadd(csum) if len(csum) > 0 else make_bv(0, sum_width))
+        env.assert_formula(f)
+
+        return cost
+
+    def _add_graph_to_env_with_partial_sums(self, env, encoding):
+        """like the default encoding, only that the objective function and the cuts are
+        sums of the cost variables of the maximal cuts nested within them, plus the
+        costs of those nodes/edges that belong to no such cut"""
+        cost = env.declare_fun("cost", Environment.INT)
+        self._compute_nested_cuts()
+
+        # add nodes
+        uids = self._nodes.keys()
+        uids.sort()
+        for node_uid in uids:
+            node = self._nodes[node_uid]
+            if (node.get_cost() == 0) and self._simplified:
+                continue # 0-cost variables appear nowhere else
+            node.add_node_to_env(env, encoding)
+
+        # add edges
+        uids = self._edges.keys()
+        uids.sort()
+        for edge_uid in uids:
+            edge = self._edges[edge_uid]
+            if (edge.get_cost() == 0) and self._simplified:
+                continue # 0-cost variables appear nowhere else
+            edge.add_edge_to_env(env, encoding)
+
+        # add objective function
+        csum = self.get_partial_sum(self._nodes.keys(), self._edges.keys(), self._nested_cuts[None])
+        f = make_equal(cost, make_plus(csum) if len(csum) > 0 else 0)
+        env.assert_formula(f)
+
+        return cost
+
+    def _add_graph_to_env_parametric(self, env, encoding):
+        """like the default encoding, with the cost of each node and edge replaced by a
+        constant of the cost block (see get_cost_constants), so that the formula can be
+        re-timed by rewriting the cost block only"""
+        csum = []
+        cost = env.declare_fun("cost", Environment.INT)
+
+        # add nodes
+        uids = self._nodes.keys()
+        uids.sort()
+        for node_uid in uids:
+            node = self._nodes[node_uid]
+            csum.append(node.get_cost_var())
+            node.add_node_to_env(env, encoding)
+
+        # add edges
+        uids = self._edges.keys()
+        uids.sort()
+        for edge_uid in uids:
+            edge = self._edges[edge_uid]
+            csum.append(edge.get_cost_var())
+            edge.add_edge_to_env(env, encoding)
+
+        # add objective function
+        f = make_equal(cost, make_plus(csum))
+        env.assert_formula(f)
+
+        return cost
+
+    def get_cost_constants(self, cut_bounds, lower, upper):
+        """returns the list of pairs (name, value) of the cost block of the parametric
+        encoding, that is the cost of each node and edge, the bound of each cut in
+        `cut_bounds` (a map from cut uids to bounds) and the bounds on the optimum value"""
+        ret = []
+        uids = self._nodes.keys()
+        uids.sort()
+        for node_uid in uids:
+            ret.append((self._nodes[node_uid].get_cost_const(), self._nodes[node_uid].get_cost()))
+        uids = self._edges.keys()
+        uids.sort()
+        for edge_uid in uids:
+            ret.append((self._edges[edge_uid].get_cost_const(), self._edges[edge_uid].get_cost()))
+        uids = cut_bounds.keys()
+        uids.sort()
+        for cut_uid in uids:
+            ret.append(("kcut_" + cut_uid, cut_bounds[cut_uid]))
+        ret.append(("klower", lower))
+        ret.append(("kupper", upper))
+        return ret
+
+    def compute_cut_bounds(self, cut_uids):
+        """returns a map from each cut uid in `cut_uids` to the maximal cost of a path
+        connecting its source and destination nodes, as _compute_longest_path_cut would.
+
+        Rather than exploring the sub-graph of each cut, the costs of the longest paths
+        from each source node to every other node are computed at once, with a single
+        pass over a topological order of the graph shared by all cuts."""
+        order = self._compute_reverse_topological_order()
+        order.reverse()
+        sources = {}
+        for cut_uid in cut_uids:
+            src_uid, dst_uid = [int(uid) for uid in cut_uid.split('_')]
+            sources.setdefault(src_uid, []).append((cut_uid, dst_uid))
+
+        bounds = {}
+        for src_uid in sources.keys():
+            dists = { src_uid : self._nodes[src_uid].get_cost() }
+            for cur_uid in order[order.index(src_uid):]:
+                if cur_uid not in dists:
+                    continue
+                for succ_uid in self._nodes[cur_uid].get_successors():
+                    cost = dists[cur_uid] + self._edges[Edge.get_edge_uid(cur_uid, succ_uid)].get_cost() \
+                            + self._nodes[succ_uid].get_cost()
+                    if succ_uid not in dists or cost > dists[succ_uid]:
+                        dists[succ_uid] = cost
+            for cut_uid, dst_uid in sources[src_uid]:
+                bounds[cut_uid] = dists[dst_uid]
+        return bounds
+
+    def get_longest_path_cost(self):
+        """returns the cost of the longest syntactic path from the start to the end node"""
+        cut_uid = Cut.get_cut_uid(self._start_uid, self._end_uid)
+        return self.compute_cut_bounds([cut_uid])[cut_uid]
+
+    def _compute_nested_cuts(self):
+        """computes, for each cut and for the whole graph, the list of maximal cuts
+        nested within it, i.e. whose sub-graph is contained in its sub-graph and in
+        the sub-graph of no other nested cut. Cuts with the same sub-graph are nested
+        one within the other in order of uid."""
+        subgraphs = {}
+        for cut_uid in self._cuts.keys():
+            cut = self._cuts[cut_uid]
+            subgraphs[cut_uid] = (set(cut.get_node_uids()), set(cut.get_edge_uids()))
+        order = self._cuts.keys()
+        order.sort(key=lambda uid: (self._cuts[uid].get_size(), uid))
+
+        self._nested_cuts = {}
+        for idx in range(0, len(order)):
+            self._nested_cuts[order[idx]] = self._get_maximal_cuts_within(order[0:idx], subgraphs, subgraphs[order[idx]])
+        graph_subgraph = (set(self._nodes.keys()), set(self._edges.keys()))
+        self._nested_cuts[None] = self._get_maximal_cuts_within(order, subgraphs, graph_subgraph)
+        return
+
+    def _get_maximal_cuts_within(self, cut_uids, subgraphs, subgraph):
+        """returns the maximal cuts among `cut_uids` (sorted by size) whose sub-graph
+        is contained in `subgraph`"""
+        ret = []
+        for cut_uid in reversed(cut_uids):
+            node_uids, edge_uids = subgraphs[cut_uid]
+            if not (node_uids <= subgraph[0] and edge_uids <= subgraph[1]):
+                continue
+            covered = False
+            for other_uid in ret:
+                if node_uids <= subgraphs[other_uid][0] and edge_uids <= subgraphs[other_uid][1]:
+                    covered = True
+                    break
+            if not covered:
+                ret.append(cut_uid)
+        ret.reverse()
+        return ret
+
+    def get_nested_cut_uids(self, cut_uid):
+        return self._nested_cuts[cut_uid]
+
+    def get_partial_sum(self, node_uids, edge_uids, cut_uids):
+        """returns the list of terms whose sum is the cost of the sub-graph made of
+        `node_uids` and `edge_uids`, given the cuts `cut_uids` nested within it: the
+        cost variables of these cuts, the costs of nodes/edges in none of them, and
+        the negated costs of nodes/edges shared by k > 1 of them, k - 1 times."""
+        node_count = {}
+        edge_count = {}
+        terms = []
+        for cut_uid in cut_uids:
+            cut = self._cuts[cut_uid]
+            terms.append(cut.get_cost_var())
+            for node_uid in cut.get_node_uids():
+                node_count[node_uid] = node_count.get(node_uid, 0) + 1
+            for edge_uid in cut.get_edge_uids():
+                edge_count[edge_uid] = edge_count.get(edge_uid, 0) + 1
+        elements = [(self._nodes[uid], node_count.get(uid, 0)) for uid in sorted(node_uids)] + \
+                   [(self._edges[uid], edge_count.get(uid, 0)) for uid in sorted(edge_uids)]
+        for element, count in elements:
+            if element.get_cost() == 0:
+                continue
+            if count == 0:
+                terms.append(element.get_cost_var())
+            for idx in range(1, count):
+                terms.append(make_minus(element.get_cost_var()))
+        return terms
+
+    def _compute_bv_widths(self):
+        """computes the bit-width of the cost of each node/edge, which must hold any
+        such cost and LONGEST_PATH + 1, and the bit-width of the sum of these costs,
+        which must hold the sum of all non-zero costs without overflowing."""
+        longest_path, max_path_cvars, node_cvars, edge_cvars = self.compute_longest_syntactic_path(False)
+        costs = [n.get_cost() for n in self._nodes.values()] + [e.get_cost() for e in self._edges.values()]
+        costs = [c for c in costs if c != 0]
+        width = max([longest_path + 1] + costs).bit_length()
+        sum_width = width + max(len(costs) - 1, 0).bit_length()
+        self._bv_widths = (width, sum_width)
+        return
+
+    def get_bv_widths(self):
+        return self._bv_widths
+
+    def _add_graph_to_env_default_bad(self, env, encoding):
         """uses the original encoding used in LCTES14: cost = SUM cost(node_i) + SUM cost(edge_i)"""
         """NOTE: this encoding actually matches the original one more closely, it discards some  """
         """      minor improvements that I inadvertedly brought when rewriting the code. This    """
@@ -319,12 +608,131 @@ class SourceCodeGraph:
                     for offending_symbol in "% \n": # ignore pychecker: iteration over string is intended
                        line = line.replace(offending_symbol, "")
                     head_label, tail_label = line.split(',')
+                    if head_label not in self._label2uid or tail_label not in self._label2uid:
+                        continue # pruned by simplify()
                     head_uid = self._label2uid[head_label]
                     tail_uid = self._label2uid[tail_label]
                     semantic_cuts[-1]["head_uids"].append(head_uid)
                     semantic_cuts[-1]["tail_uids"].append(tail_uid)
         return semantic_cuts        
 
+    def simplify(self):
+        """simplifies the graph, so that its encoding requires fewer variables and
+        atoms. Nodes which do not belong to any path from the start node to the end
+        node are pruned, and each edge `u -> v` such that `u` has no other successor
+        and `v` has no other predecessor is collapsed, merging `v` into `u` and
+        summing up their costs.
+
+        The simplification is sound because any model of the formula represents
+        a path from the start node to the end node, in which `u` is taken iff both
+        `u -> v` and `v` are taken. The boolean terms of merged nodes and edges
+        are still constrained by the original formula, hence `dump_label2vars`
+        is not affected, whereas `dump_longest_syntactic_path` expands each
+        merged node into the chain of labels it stands for.
+
+        The graph must contain no loop. Returns the number of removed nodes."""
+        num_nodes = len(self._nodes.keys())
+
+        # 1st: prune nodes that can not be reached from start or can not reach end
+        fwd_uids = self._collect_reachable(self._start_uid, Node.get_successors)
+        bwd_uids = self._collect_reachable(self._end_uid, Node.get_predecessors)
+        node_uids = self._nodes.keys()
+        node_uids.sort()
+        for node_uid in node_uids:
+            if node_uid not in fwd_uids or node_uid not in bwd_uids:
+                self._remove_node(node_uid)
+
+        # 2nd: collapse chains
+        node_uids = self._nodes.keys()
+        node_uids.sort()
+        for node_uid in node_uids:
+            if node_uid not in self._nodes:
+                continue # already merged
+            node = self._nodes[node_uid]
+            while node.get_num_successors() == 1:
+                succ_uid = node.get_successors()[0]
+                if self._nodes[succ_uid].get_num_predecessors() != 1:
+                    break
+                self._merge_nodes(node_uid, succ_uid)
+
+        self._simplified = True
+        return num_nodes - len(self._nodes.keys())
+
+    def _collect_reachable(self, src_uid, get_neighbours):
+        """returns the uids of the nodes reachable from `src_uid` in the direction
+        given by `get_neighbours` [Node.get_successors, Node.get_predecessors]"""
+        visited_uids = set([src_uid])
+        to_visit_uids = [src_uid]
+        while len(to_visit_uids) > 0:
+            cur_uid = to_visit_uids.pop()
+            for next_uid in get_neighbours(self._nodes[cur_uid]):
+                if next_uid not in visited_uids:
+                    visited_uids.add(next_uid)
+                    to_visit_uids.append(next_uid)
+        return visited_uids
+
+    def _remove_node(self, uid):
+        """removes a node, along with its ingoing and outgoing edges, from the graph"""
+        node = self._nodes[uid]
+        for pred_uid in list(node.get_predecessors()):
+            self._nodes[pred_uid].remove_successor(uid)
+            del self._edges[Edge.get_edge_uid(pred_uid, uid)]
+        for succ_uid in list(node.get_successors()):
+            self._nodes[succ_uid].remove_predecessor(uid)
+            del self._edges[Edge.get_edge_uid(uid, succ_uid)]
+        del self._nodes[uid]
+        del self._label2uid[node.get_label()]
+        return
+
+    def _merge_nodes(self, src_uid, dst_uid):
+        """merges the node `dst_uid` into the node `src_uid`, given that the only
+        successor of `src_uid` is `dst_uid` and the only predecessor of `dst_uid`
+        is `src_uid`. The edges leaving `dst_uid` are moved to `src_uid`, but they
+        retain their original boolean terms."""
+        src_node = self._nodes[src_uid]
+        dst_node = self._nodes[dst_uid]
+        edge = self._edges.pop(Edge.get_edge_uid(src_uid, dst_uid))
+
+        src_node.set_cost(src_node.get_cost() + edge.get_cost() + dst_node.get_cost())
+        src_node.remove_successor(dst_uid)
+
+        src_var = self._label2var[src_node.get_label()]
+        for succ_uid in dst_node.get_successors():
+            old_edge = self._edges.pop(Edge.get_edge_uid(dst_uid, succ_uid))
+            succ_node = self._nodes[succ_uid]
+            succ_var = self._label2var[succ_node.get_label()]
+            new_edge = Edge(src_var, succ_var, old_edge.get_cost(), self, old_edge.get_bvar())
+            self._edges[new_edge.get_uid()] = new_edge
+            src_node.add_successor(succ_uid)
+            succ_node.remove_predecessor(dst_uid)
+            succ_node.add_predecessor(src_uid)
+
+        for node in self._nodes.values():
+            if node.get_dominator() == dst_uid:
+                node.set_dominator(src_uid)
+
+        self._segments[src_uid] = self._get_segment_labels(src_uid) + \
+                                  self._get_segment_labels(dst_uid)
+        if dst_uid in self._segments:
+            del self._segments[dst_uid]
+
+        for label in self._label2uid.keys():
+            if self._label2uid[label] == dst_uid:
+                self._label2uid[label] = src_uid
+
+        if dst_uid == self._end_uid:
+            self._end_uid = src_uid
+            self._end_var = src_var
+
+        del self._nodes[dst_uid]
+        return
+
+    def _get_segment_labels(self, uid):
+        """returns the labels of the chain of nodes represented by the node `uid`"""
+        if uid in self._segments:
+            return self._segments[uid]
+        return [self._nodes[uid].get_label()]
+
     def _compute_semantic_cuts(self):
         """retuns a list of candidate semantic cuts computed on-the-fly over the graph"""
         # back-ward collect dominators as candidate merging points
@@ -393,6 +801,173 @@ class SourceCodeGraph:
                 return 1
 	return 0
 
+    def summarize_loops(self, loops_file=None, default_bound=0):
+        """replaces each natural loop of the graph with a single summary node, so
+        that the graph contains no loop afterwards. Returns the number of summarized
+        loops.
+
+        The iteration bound of a loop, i.e. the maximum number of times its back
+        edges are taken, is the one given for the label of its header in `loops_file`,
+        or else the one annotated within its body by a call to `wcet_loop_bound(N)`,
+        or else `default_bound` if positive. The header node stands for the whole
+        loop, and its cost is the bound times the cost of the longest iteration, plus
+        the cost of the longest path leaving the loop. Edges leaving the loop are moved
+        to the header, but they retain their original boolean terms.
+
+        Loops are summarized innermost first, so that the cost of the body of each loop
+        is computed only once and reused by the enclosing ones. An exception is raised
+        if a loop has no bound, or if the graph contains an irreducible loop."""
+        loop_bounds = {}
+        if loops_file is not None:
+            loop_bounds = self._load_loop_bounds_from_file(loops_file)
+
+        num_loops = 0
+        loops = self._compute_natural_loops()
+        while len(loops) > 0:
+            header_uid, body_uids = min(loops, key=lambda loop: (len(loop[1]), loop[0]))
+            header_label = self._nodes[header_uid].get_label()
+            if header_label in loop_bounds:
+                bound = loop_bounds[header_label]
+            elif any(uid in self._loop_annotations for uid in body_uids):
+                bound = max(self._loop_annotations[uid] for uid in body_uids if uid in self._loop_annotations)
+            elif default_bound > 0:
+                bound = default_bound
+            else:
+                raise Exception("loop detected, no iteration bound for `" + header_label + "`")
+            self._summarize_loop(header_uid, body_uids, bound)
+            num_loops += 1
+            loops = self._compute_natural_loops()
+
+        if self.has_loop() > 0:
+            raise Exception("irreducible loop detected")
+        return num_loops
+
+    def _load_loop_bounds_from_file(self, file):
+        """parses file containing a list of `header label, bound` pairs, one per line,
+        and returns a map from labels to bounds"""
+        loop_bounds = {}
+        with open(file, 'r') as fd:
+            for line in fd:
+                for offending_symbol in "% \n": # ignore pychecker: iteration over string is intended
+                   line = line.replace(offending_symbol, "")
+                if len(line) == 0 or line[0] == "#":
+                    continue
+                header_label, bound = line.split(',')
+                loop_bounds[header_label] = int(bound)
+        return loop_bounds
+
+    def _compute_natural_loops(self):
+        """returns the list of (header uid, body uids) pairs of the natural loops of
+        the graph, in which the loops sharing the same header are merged together.
+        The body of a loop is the set of nodes reaching one of its back edges, i.e.
+        an edge whose destination is a dominator of its source, without going
+        through its header."""
+        loops = {}
+        for edge in self._edges.values():
+            header_uid = edge.get_dst_uid()
+            latch_uid = edge.get_src_uid()
+            if not self._is_dominator(header_uid, latch_uid):
+                continue
+            body_uids = loops.setdefault(header_uid, set([header_uid]))
+            to_visit_uids = [latch_uid] if latch_uid not in body_uids else []
+            body_uids.update(to_visit_uids)
+            while len(to_visit_uids) > 0:
+                cur_uid = to_visit_uids.pop()
+                for pred_uid in self._nodes[cur_uid].get_predecessors():
+                    if pred_uid not in body_uids:
+                        body_uids.add(pred_uid)
+                        to_visit_uids.append(pred_uid)
+        return loops.items()
+
+    def _summarize_loop(self, header_uid, body_uids, bound):
+        """replaces the loop with the given header and body with its header node"""
+        header = self._nodes[header_uid]
+        header_var = self._label2var[header.get_label()]
+
+        # longest paths from the header to each node of the body, back edges excluded
+        dists = {header_uid : header.get_cost()}
+        num_preds = {}
+        for node_uid in body_uids:
+            num_preds[node_uid] = len([pred_uid for pred_uid in self._nodes[node_uid].get_predecessors()
+                                       if pred_uid in body_uids])
+        to_visit_uids = [header_uid]
+        while len(to_visit_uids) > 0:
+            cur_uid = to_visit_uids.pop()
+            for succ_uid in self._nodes[cur_uid].get_successors():
+                if succ_uid not in body_uids or succ_uid == header_uid:
+                    continue
+                edge = self._edges[Edge.get_edge_uid(cur_uid, succ_uid)]
+                cost = dists[cur_uid] + edge.get_cost() + self._nodes[succ_uid].get_cost()
+                if succ_uid not in dists or cost > dists[succ_uid]:
+                    dists[succ_uid] = cost
+                num_preds[succ_uid] -= 1
+                if num_preds[succ_uid] == 0:
+                    to_visit_uids.append(succ_uid)
+        if len(dists) != len(body_uids):
+            raise Exception("irreducible loop detected at `" + header.get_label() + "`")
+
+        # cost of the longest iteration, and of the longest path leaving the loop
+        iteration_cost = 0
+        exit_cost = 0
+        exit_edges = []
+        for node_uid in body_uids:
+            for succ_uid in self._nodes[node_uid].get_successors():
+                edge = self._edges[Edge.get_edge_uid(node_uid, succ_uid)]
+                if succ_uid == header_uid:
+                    iteration_cost = max(iteration_cost, dists[node_uid] + edge.get_cost())
+                elif succ_uid not in body_uids:
+                    exit_cost = max(exit_cost, dists[node_uid])
+                    exit_edges.append(edge)
+            if node_uid == self._end_uid:
+                exit_cost = max(exit_cost, dists[node_uid])
+        header.set_cost(bound * iteration_cost + exit_cost)
+        self._loops[header_uid] = (bound, iteration_cost)
+
+        # move edges leaving the loop to the header, merging those sharing the same
+        # destination
+        exits = {}
+        for edge in exit_edges:
+            cost, bvars = exits.get(edge.get_dst_uid(), (0, []))
+            exits[edge.get_dst_uid()] = (max(cost, edge.get_cost()), bvars + [edge.get_bvar()])
+        for edge in exit_edges:
+            if edge.get_src_uid() == header_uid:
+                del self._edges[edge.get_uid()]
+                header.remove_successor(edge.get_dst_uid())
+                self._nodes[edge.get_dst_uid()].remove_predecessor(header_uid)
+        for succ_uid, (cost, bvars) in sorted(exits.items()):
+            succ_node = self._nodes[succ_uid]
+            succ_var = self._label2var[succ_node.get_label()]
+            bvar = bvars[0] if len(bvars) == 1 else make_or(bvars)
+            new_edge = Edge(header_var, succ_var, cost, self, bvar)
+            self._edges[new_edge.get_uid()] = new_edge
+            header.add_successor(succ_uid)
+            succ_node.add_predecessor(header_uid)
+
+        # drop the rest of the loop
+        if header_uid in header.get_successors():
+            del self._edges[Edge.get_edge_uid(header_uid, header_uid)]
+            header.remove_successor(header_uid)
+            header.remove_predecessor(header_uid)
+        for node_uid in sorted(body_uids):
+            if node_uid != header_uid:
+                self._remove_node(node_uid)
+                self._loop_annotations.pop(node_uid, None)
+                self._segments.pop(node_uid, None)
+        self._loop_annotations.pop(header_uid, None)
+
+        for node in self._nodes.values():
+            if node.get_dominator() in body_uids:
+                node.set_dominator(header_uid)
+        if self._end_uid in body_uids:
+            self._end_uid = header_uid
+            self._end_var = header_var
+        return
+
+    def get_loops(self):
+        """returns a map from the uid of the header of each summarized loop to the
+        pair (bound, cost of the longest iteration)"""
+        return self._loops
+
     def _compute_longest_path_cut(self, src_uid, dst_uid):
         """returns the maximal cost of a path connecting src_uid to dst_uid,
         the list of node uids appearing over the path of maximal syntactic cost,
@@ -541,11 +1116,327 @@ class SourceCodeGraph:
         the start and end node in the source code graph"""
         max_cost, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self._compute_longest_path_cut(self._start_uid, self._end_uid)
         cut_uid = Cut.get_cut_uid(self._start_uid, self._end_uid)
-        if add_cut and cut_uid not in self._cuts.keys():
+        if add_cut and cut_uid not in self._cuts.keys() and len(subgraph_edge_uids) > 0:
             c = Cut(self._start_uid, self._end_uid, max_cost, subgraph_node_uids, subgraph_edge_uids, self)
             self._cuts[c.get_uid()] = c
         return max_cost, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids
 
+    def select_cuts(self, max_cuts=0):
+        """drops those cuts that can not prune the search space any further than the
+        remaining ones, ranks the others by their estimated pruning power and, if
+        `max_cuts > 0`, retains only the `max_cuts` top-ranked cuts.
+
+        A cut is dropped when its bound is not smaller than the sum of the costs of
+        its sub-graph (no slack), or when it is implied by a chain of retained cuts
+        along the dominator chain of its tail node. The remaining cuts are ranked
+        by decreasing slack first, and by decreasing sub-graph size next.
+
+        Returns the number of dropped cuts."""
+        num_cuts = len(self._cuts.keys())
+
+        # 1st: drop cuts with no slack
+        slacks = {}
+        for cut_uid in self._cuts.keys():
+            cut = self._cuts[cut_uid]
+            slack = self._compute_trivial_bound(cut) - cut.get_cost()
+            if slack > 0:
+                slacks[cut_uid] = slack
+
+        # 2nd: drop cuts implied by smaller ones
+        uids = sorted(slacks.keys(), key=lambda uid: (self._cuts[uid].get_size(), uid))
+        kept_cuts = {}
+        for cut_uid in uids:
+            cut = self._cuts[cut_uid]
+            if not self._is_implied_cut(cut, kept_cuts):
+                kept_cuts[(cut.get_src_uid(), cut.get_dst_uid())] = cut
+
+        # 3rd: rank the remaining cuts, within budget
+        ranked_cuts = sorted(kept_cuts.values(),
+                key=lambda cut: (-slacks[cut.get_uid()], -cut.get_size(), cut.get_uid()))
+        if max_cuts > 0:
+            ranked_cuts = ranked_cuts[:max_cuts]
+
+        self._cuts = {}
+        self._cuts_order = []
+        for cut in ranked_cuts:
+            self._cuts[cut.get_uid()] = cut
+            self._cuts_order.append(cut.get_uid())
+
+        return num_cuts - len(ranked_cuts)
+
+    def _compute_trivial_bound(self, cut):
+        """returns the sum of the costs of all nodes and edges in the sub-graph
+        of `cut`, that is the bound holding even in the absence of the cut"""
+        bound = 0
+        for node_uid in cut.get_node_uids():
+            bound += max(0, self._nodes[node_uid].get_cost())
+        for edge_uid in cut.get_edge_uids():
+            bound += max(0, self._edges[edge_uid].get_cost())
+        return bound
+
+    def _is_implied_cut(self, cut, kept_cuts):
+        """returns True iff the bound of `cut` is implied by a chain of cuts in
+        `kept_cuts` [(src_uid, dst_uid) -> cut] connecting its head to its tail
+        through merging points on the dominator chain of its tail, and such that
+        their sub-graphs sum up to the sub-graph of `cut`"""
+        head_uid = cut.get_src_uid()
+        tail_uid = cut.get_dst_uid()
+
+        # back-ward collect merging points from tail to head
+        merging_points = [tail_uid]
+        cur_uid = tail_uid
+        while cur_uid != head_uid:
+            cur_uid = self._nodes[cur_uid].get_dominator()
+            if cur_uid < 0:
+                return False # head is not a dominator of tail
+            merging_points.append(cur_uid)
+        merging_points.reverse()
+
+        # chains[j]: the chain of kept cuts from head to merging_points[j] with the
+        # least bound, as (bound, node_uids, edge_uids); merging points are shared
+        # by two consecutive cuts, thus their cost must be counted only once
+        chains = { 0 : (0, set(), set()) }
+        mp_len = len(merging_points)
+        for j in range(1, mp_len):
+            for i in range(0, j):
+                key = (merging_points[i], merging_points[j])
+                if i not in chains or key not in kept_cuts:
+                    continue
+                inner_cut = kept_cuts[key]
+                bound, node_uids, edge_uids = chains[i]
+                bound += inner_cut.get_cost()
+                if i > 0:
+                    bound -= self._nodes[merging_points[i]].get_cost()
+                if j not in chains or bound < chains[j][0]:
+                    chains[j] = (bound, node_uids | set(inner_cut.get_node_uids()),
+                                 edge_uids | set(inner_cut.get_edge_uids()))
+
+        if (mp_len - 1) not in chains:
+            return False
+        bound, node_uids, edge_uids = chains[mp_len - 1]
+        return bound <= cut.get_cost() \
+                and node_uids == set(cut.get_node_uids()) \
+                and edge_uids == set(cut.get_edge_uids())
+
+    def _get_cut_uids(self):
+        """returns the uids of the cuts augmenting the graph, in rank order if
+        `select_cuts` has been called and sorted by uid otherwise"""
+        uids = self._cuts.keys()
+        uids.sort()
+        if self._cuts_order is not None:
+            uids = [uid for uid in self._cuts_order if uid in self._cuts] + \
+                   [uid for uid in uids if uid not in self._cuts_order]
+        return uids
+
+    def add_path_check_to_env(self, env):
+        """encodes a satisfiability query checking whether the longest syntactic
+        path of the graph is feasible, by assuming the boolean terms of its nodes
+        and edges, and adds it to the input `env` in place of the cost function"""
+        longest_path, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self.compute_longest_syntactic_path(False)
+
+        env.set_option("produce-unsat-assumptions", True)
+        env.set_assumptions(self.get_path_bvars(maxpath_node_uids))
+
+        # add comments
+        env.add_comment("PATH_CHECK = 1")
+        env.add_comment("NB_CUTS = 0")
+        env.add_comment("LONGEST_PATH = " + str(longest_path))
+        return
+
+    def get_path_bvars(self, node_uids):
+        """returns the boolean terms of the nodes and edges along the path
+        visiting the nodes in `node_uids`, in order"""
+        terms = [self._nodes[node_uids[0]].get_bvar()]
+        for idx in range(1, len(node_uids)):
+            edge_uid = Edge.get_edge_uid(node_uids[idx - 1], node_uids[idx])
+            terms.append(self._edges[edge_uid].get_bvar())
+            terms.append(self._nodes[node_uids[idx]].get_bvar())
+        return terms
+
+    def enumerate_longest_paths(self):
+        """lazily enumerates the paths from the start node to the end node in
+        order of non-increasing syntactic cost, yielding (cost, node_uids) pairs.
+
+        The enumeration is a best-first search over path prefixes, in which the
+        cost of a prefix is extended with the exact cost of the longest path from
+        its last node to the end node. Hence, each path is yielded after expanding
+        no more prefixes than its length. The graph must contain no loop."""
+        # longest path from each node to end, nodes not reaching end are ignored
+        dists = { self._end_uid : self._nodes[self._end_uid].get_cost() }
+        for node_uid in self._compute_reverse_topological_order():
+            if node_uid == self._end_uid:
+                continue
+            node = self._nodes[node_uid]
+            for succ_uid in node.get_successors():
+                if succ_uid not in dists:
+                    continue
+                edge = self._edges[Edge.get_edge_uid(node_uid, succ_uid)]
+                dist = node.get_cost() + edge.get_cost() + dists[succ_uid]
+                if node_uid not in dists or dist > dists[node_uid]:
+                    dists[node_uid] = dist
+
+        if self._start_uid not in dists:
+            return
+
+        # NOTE: prefixes are ranked by their negated cost, since heapq is a
+        #   min-heap, the counter breaks ties in order of insertion
+        counter = 0
+        heap = [(-dists[self._start_uid], counter, 0, [self._start_uid])]
+        while len(heap) > 0:
+            neg_cost, idx, prefix_cost, prefix = heapq.heappop(heap)
+            last_uid = prefix[-1]
+            last_node = self._nodes[last_uid]
+            if last_uid == self._end_uid:
+                yield -neg_cost, prefix
+                continue
+            prefix_cost += last_node.get_cost()
+            for succ_uid in last_node.get_successors():
+                if succ_uid not in dists:
+                    continue
+                edge = self._edges[Edge.get_edge_uid(last_uid, succ_uid)]
+                cost = prefix_cost + edge.get_cost()
+                counter += 1
+                heapq.heappush(heap, (-(cost + dists[succ_uid]), counter, cost, prefix + [succ_uid]))
+        return
+
+    def _compute_reverse_topological_order(self):
+        """returns the uids of all nodes, so that each node appears after all of
+        its successors. The graph must contain no loop."""
+        order = []
+        num_succs = {}
+        to_visit_uids = []
+        for node_uid in self._nodes.keys():
+            num_succs[node_uid] = self._nodes[node_uid].get_num_successors()
+            if num_succs[node_uid] == 0:
+                to_visit_uids.append(node_uid)
+        while len(to_visit_uids) > 0:
+            cur_uid = to_visit_uids.pop()
+            order.append(cur_uid)
+            for pred_uid in self._nodes[cur_uid].get_predecessors():
+                num_succs[pred_uid] -= 1
+                if num_succs[pred_uid] == 0:
+                    to_visit_uids.append(pred_uid)
+        return order
+
+    def _compute_post_dominators(self):
+        """returns a map from the uid of each node reaching the end node to the set
+        of uids of its post-dominators, the node itself included. The graph must
+        contain no loop."""
+        pdoms = {}
+        for node_uid in self._compute_reverse_topological_order():
+            if node_uid == self._end_uid:
+                pdoms[node_uid] = set([node_uid])
+                continue
+            succ_pdoms = [pdoms[succ_uid] for succ_uid in self._nodes[node_uid].get_successors()
+                          if succ_uid in pdoms]
+            if len(succ_pdoms) > 0:
+                pdoms[node_uid] = set.intersection(*succ_pdoms) | set([node_uid])
+        return pdoms
+
+    def compute_sese_regions(self):
+        """returns the list of (entry uid, exit uid) pairs of the single-entry/single-exit
+        regions every path from the start node to the end node goes through, in order.
+
+        Region boundaries are the nodes that both dominate the end node and post-dominate
+        the start node, so that the sub-graphs of any two regions share no edge and meet
+        at a single node."""
+        pdoms = self._compute_post_dominators()
+        if self._start_uid not in pdoms:
+            return []
+        boundary_uids = []
+        cur_uid = self._end_uid
+        while cur_uid >= 0:
+            if cur_uid in pdoms[self._start_uid]:
+                boundary_uids.append(cur_uid)
+            cur_uid = self._nodes[cur_uid].get_dominator()
+        boundary_uids.reverse()
+        return [(boundary_uids[idx - 1], boundary_uids[idx]) for idx in range(1, len(boundary_uids))]
+
+    def add_region_to_env(self, env, entry_uid, exit_uid, objective):
+        """encodes the cost of the region `entry_uid` -> `exit_uid` as `objective`,
+        along with the assumption that both nodes are reached, and adds it to the
+        input `env`. The cost of the entry node is counted only if it is the start
+        node, so that the costs of consecutive regions add up to the cost of a path.
+
+        Returns the boolean terms of the nodes and edges of the region, and the
+        cost of its longest syntactic path."""
+        max_cost, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self._compute_longest_path_cut(entry_uid, exit_uid)
+        if entry_uid != self._start_uid:
+            max_cost -= self._nodes[entry_uid].get_cost()
+
+        csum = []
+        bvars = []
+        for node_uid in subgraph_node_uids:
+            node = self._nodes[node_uid]
+            bvars.append(node.get_bvar())
+            if node.get_cost() == 0 or (node_uid == entry_uid and node_uid != self._start_uid):
+                continue
+            csum.append(node.get_cost_var())
+            node.add_node_to_env(env, ENC_DEFAULT)
+        for edge_uid in subgraph_edge_uids:
+            edge = self._edges[edge_uid]
+            bvars.append(edge.get_bvar())
+            if edge.get_cost() == 0:
+                continue
+            csum.append(edge.get_cost_var())
+            edge.add_edge_to_env(env, ENC_DEFAULT)
+
+        env.declare_fun(objective, Environment.INT)
+        f = make_equal(objective, make_plus(csum) if len(csum) > 0 else 0)
+        env.assert_formula(f)
+        f = make_and([self._nodes[entry_uid].get_bvar(), self._nodes[exit_uid].get_bvar()])
+        env.assert_formula(f)
+        return bvars, max_cost
+
+    def add_path_core_cuts(self, core_vars):
+        """adds a cut spanning the portion of the longest syntactic path whose boolean
+        terms `core_vars`, the unsat assumptions of a path check, can not hold together.
+
+        The head of the cut is the first node of the path appearing in `core_vars`,
+        or its closest dominator that also dominates the tail of the cut, which is the
+        last node of the path appearing in `core_vars`."""
+        longest_path, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self.compute_longest_syntactic_path(False)
+
+        # map boolean terms back to node uids
+        var2uids = {}
+        for label in self._label2uid.keys():
+            var = self._label2var[label]
+            var2uids[var] = [self._label2uid[label]]
+            var2uids[var.replace("bd_", "bs_")] = [self._label2uid[label]]
+        for edge in self._edges.values():
+            var2uids[edge.get_bvar()] = [edge.get_src_uid(), edge.get_dst_uid()]
+
+        core_uids = []
+        for var in core_vars:
+            if var in var2uids:
+                core_uids += var2uids[var]
+
+        path_uids = [uid for uid in maxpath_node_uids if uid in core_uids]
+        if len(path_uids) == 0:
+            return
+
+        head_uid = path_uids[0]
+        tail_uid = path_uids[-1]
+        while not self._is_dominator(head_uid, tail_uid):
+            head_uid = self._nodes[head_uid].get_dominator()
+
+        cut_uid = Cut.get_cut_uid(head_uid, tail_uid)
+        if head_uid == tail_uid or cut_uid in self._cuts.keys():
+            return
+        max_cost, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self._compute_longest_path_cut(head_uid, tail_uid)
+        c = Cut(head_uid, tail_uid, max_cost, subgraph_node_uids, subgraph_edge_uids, self)
+        self._cuts[cut_uid] = c
+        return
+
+    def _is_dominator(self, src_uid, dst_uid):
+        """returns True iff `src_uid` is `dst_uid` or one of its dominators"""
+        cur_uid = dst_uid
+        while cur_uid >= 0:
+            if cur_uid == src_uid:
+                return True
+            cur_uid = self._nodes[cur_uid].get_dominator()
+        return False
+
     def _compute_paths_among(self, src_uid, dst_uid):
         """computes the number of paths from src_uid to dst_uid."""
         to_visit_uids = [dst_uid]
@@ -554,7 +1445,7 @@ class SourceCodeGraph:
         dsp = 0
 
         if (src_uid == dst_uid): # NOTE: deals with single-block graphs
-            return [src_uid]
+            return 1
 
         # NOTE: the generated block graph might contain dead ends, thus
         # visited_uids must be pre-computed
@@ -629,22 +1520,19 @@ class SourceCodeGraph:
         assert(file_name is not None)
         with open(file_name, 'w') as fd:
             longest_path, maxpath_node_uids, subgraph_node_uids, subgraph_edge_uids = self.compute_longest_syntactic_path(False)
+            labels = []
             for cur_uid in maxpath_node_uids:
-                cur_node = self._nodes[cur_uid]
-                s = ""
-                if cur_uid != self._start_uid:
-                    s += ", " + cur_node.get_label() + ")\n"
-                if cur_uid != self._end_uid:
-                    s += "(" + cur_node.get_label()
-                fd.write(s)
+                labels += self._get_segment_labels(cur_uid)
+            for idx in range(1, len(labels)):
+                fd.write("(" + labels[idx - 1] + ", " + labels[idx] + ")\n")
         return
 
     def dump_cuts_list(self, file_name):
-        """dumps all the cuts used in the graph in the specified file."""
+        """dumps all the cuts used in the graph in the specified file, in rank
+        order if `select_cuts` has been called and sorted by uid otherwise."""
         assert(file_name is not None)
         with open(file_name, 'w') as fd:
-            uids = self._cuts.keys()
-            uids.sort()
+            uids = self._get_cut_uids()
             for cut_uid in uids:
                 cut = self._cuts[cut_uid]
                 fd.write(cut.get_cost_var() + " " + str(cut.get_cost()) + "\n")
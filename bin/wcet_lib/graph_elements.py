@@ -20,6 +20,7 @@ class Node:
         self._bvar = bvar
         self._uid = int(bvar.split('_')[1])
         self._cost_var = "c" + str(self._uid)
+        self._cost_const = "k" + str(self._uid)
         self._cost = int(cost)
         self._dominator = int(dominator) # '< 0' for starting block
         self._preds = [] if preds is None else preds
@@ -32,6 +33,12 @@ class Node:
     def add_predecessor(self, pred_block):
         self._preds.append(pred_block)
 
+    def remove_successor(self, succ_block):
+        self._succs.remove(succ_block)
+
+    def remove_predecessor(self, pred_block):
+        self._preds.remove(pred_block)
+
     def add_node_to_env(self, env, encoding, args = None):
         """encodes the node as a piece of SMT2 formula, and adds it to the input `env`"""
         if (ENC_DIFFERENCE_LOGIC == encoding):
@@ -56,6 +63,24 @@ class Node:
             if self._cost > 0:
                 env.assert_soft_formula(make_not(self._bvar), self._cost, asoft_id)
 
+        elif (ENC_BITVECTOR == encoding):
+            width, sum_width = self._graph.get_bv_widths()
+            env.declare_fun(self._cost_var, make_bv_sort(width))
+            if self._dominator < 0 or int(self._cost) == 0:
+                f = make_equal(self._cost_var, make_bv(self._cost, width))
+            else:
+                f = make_equal(self._cost_var, make_ite(self._bvar, make_bv(self._cost, width), make_bv(0, width)))
+            env.assert_formula(f)
+
+        elif (ENC_PARAMETRIC == encoding):
+            # no simplification depending on the cost, which is not known yet
+            env.declare_fun(self._cost_var, Environment.INT)
+            if self._dominator < 0:
+                f = make_equal(self._cost_var, self._cost_const)
+            else:
+                f = make_equal(self._cost_var, make_ite(self._bvar, self._cost_const, "0"))
+            env.assert_formula(f)
+
         elif (ENC_DEFAULT_BAD == encoding):
             env.declare_fun(self._cost_var, Environment.INT)
             if self._dominator < 0: # no ITE simplification allowed
@@ -85,6 +110,9 @@ class Node:
     def get_cost_var(self):
         return self._cost_var
 
+    def get_cost_const(self):
+        return self._cost_const
+
     def set_cost(self, cost):
         self._cost = int(cost)
 
@@ -94,6 +122,9 @@ class Node:
     def get_dominator(self):
         return self._dominator
 
+    def set_dominator(self, dominator):
+        self._dominator = int(dominator)
+
     def get_predecessors(self):
         return self._preds
 
@@ -133,6 +164,7 @@ class Cut:
         self._dst_node_uid = dst_uid
         self._uid = Cut.get_cut_uid(self._src_node_uid, self._dst_node_uid)
         self._cost_var = "cut_" + self._uid
+        self._cost_const = "kcut_" + self._uid
         self._node_uids = node_uids
         self._edge_uids = edge_uids
         self._graph = graph
@@ -141,8 +173,9 @@ class Cut:
     def get_cut_uid(src_uid, dst_uid): # static
         return str(src_uid) + "_" + str(dst_uid)
 
-    def add_cut_to_env(self, env, encoding):
-        """encodes the cut as a piece of SMT2 formula, and adds it to the input `env`"""
+    def add_cut_to_env(self, env, encoding, guard=None):
+        """encodes the cut as a piece of SMT2 formula, and adds it to the input `env`;
+        if `guard` is not None, each hard assertion of the cut is implied by it"""
 
         if (ENC_DIFFERENCE_LOGIC == encoding):
             src_node = self._graph.get_node(self._src_node_uid)
@@ -150,7 +183,7 @@ class Cut:
             # c_dst - c_src <= max_path + cost(dst)
             cvalue = self._cost + dst_node.get_cost()
             f = make_leq(make_diff(dst_node.get_cost_var(), src_node.get_cost_var()), cvalue)
-            env.assert_formula(f)
+            self._assert_formula(env, f, guard)
 
         elif (ENC_ASSERT_SOFT == encoding):
             cost = env.declare_fun(self._cost_var, Environment.REAL)
@@ -162,7 +195,50 @@ class Cut:
                 edge = self._graph.get_edge(edge_uid)
                 edge.add_edge_to_env(env, encoding, opts)
             f = make_leq(cost, self._cost)
+            self._assert_formula(env, f, guard)
+
+        elif (ENC_PARTIAL_SUMS == encoding):
+            # NOTE: the sum is never guarded, since it may appear within the sums
+            #   of enclosing cuts and within the objective function
+            terms = self._graph.get_partial_sum(self._node_uids, self._edge_uids,
+                                                self._graph.get_nested_cut_uids(self._uid))
+            env.declare_fun(self._cost_var, Environment.INT)
+            f = make_equal(self._cost_var, make_plus(terms) if len(terms) > 0 else 0)
             env.assert_formula(f)
+            f = make_leq(self._cost_var, self._cost)
+            self._assert_formula(env, f, guard)
+
+        elif (ENC_BITVECTOR == encoding):
+            # collect cvars, extended so that their sum does not overflow
+            width, sum_width = self._graph.get_bv_widths()
+            cvars = []
+            for node_uid in self._node_uids:
+                node = self._graph.get_node(node_uid)
+                if node.get_cost() != 0:
+                    cvars.append(make_zero_extend(node.get_cost_var(), sum_width - width))
+            for edge_uid in self._edge_uids:
+                edge = self._graph.get_edge(edge_uid)
+                if edge.get_cost() != 0:
+                    cvars.append(make_zero_extend(edge.get_cost_var(), sum_width - width))
+
+            env.declare_fun(self._cost_var, make_bv_sort(sum_width))
+            if len(cvars) > 0:
+                f = make_equal(self._cost_var, make_bvadd(cvars))
+            else:
+                f = make_equal(self._cost_var, make_bv(0, sum_width))
+            self._assert_formula(env, f, guard)
+            f = make_bvule(self._cost_var, make_bv(self._cost, sum_width))
+            self._assert_formula(env, f, guard)
+
+        elif (ENC_PARAMETRIC == encoding):
+            # 0-cost variables added all the same, since costs may change
+            cvars = [self._graph.get_node(uid).get_cost_var() for uid in self._node_uids]
+            cvars += [self._graph.get_edge(uid).get_cost_var() for uid in self._edge_uids]
+            env.declare_fun(self._cost_var, Environment.INT)
+            f = make_equal(self._cost_var, make_plus(cvars))
+            self._assert_formula(env, f, guard)
+            f = make_leq(self._cost_var, self._cost_const)
+            self._assert_formula(env, f, guard)
 
         elif (ENC_DEFAULT_BAD == encoding):
             # collect cvars
@@ -183,9 +259,9 @@ class Cut:
                 f = make_equal(self._cost_var, cvars[0])
             else:
                 f = make_equal(self._cost_var, 0)
-            env.assert_formula(f)
+            self._assert_formula(env, f, guard)
             f = make_leq(self._cost_var, self._cost)
-            env.assert_formula(f)
+            self._assert_formula(env, f, guard)
 
         else:
             # collect cvars
@@ -208,20 +284,46 @@ class Cut:
                 f = make_equal(self._cost_var, cvars[0])
             else:
                 f = make_equal(self._cost_var, 0)
-            env.assert_formula(f)
+            self._assert_formula(env, f, guard)
             f = make_leq(self._cost_var, self._cost)
-            env.assert_formula(f)
+            self._assert_formula(env, f, guard)
         return
 
+    def _assert_formula(self, env, term, guard):
+        if guard is not None:
+            term = make_imply(guard, term)
+        env.assert_formula(term)
+
     def get_uid(self):
         return self._uid
 
+    def get_guard_var(self):
+        return "g_" + self._uid
+
     def get_cost_var(self):
         return self._cost_var
 
+    def get_cost_const(self):
+        return self._cost_const
+
     def get_cost(self):
         return self._cost
 
+    def get_src_uid(self):
+        return self._src_node_uid
+
+    def get_dst_uid(self):
+        return self._dst_node_uid
+
+    def get_node_uids(self):
+        return self._node_uids
+
+    def get_edge_uids(self):
+        return self._edge_uids
+
+    def get_size(self):
+        return len(self._node_uids) + len(self._edge_uids)
+
 
 ###
 ### Edge
@@ -230,11 +332,12 @@ class Cut:
 class Edge:
     """class Edge, a wrapper for an edge connecting two nodes in the source code graph."""
 
-    def __init__(self, src_var, dst_var, cost, graph):
+    def __init__(self, src_var, dst_var, cost, graph, bvar = None):
         """Init:
             - src_var : the boolean var associated with source node
             - dst_var : the boolean var associated with destination node
             - cost    : cost of traversing this edge
+            - bvar    : edge's boolean term, if different from the default one
         """
         # NOTE: do not use block labels as inputs, only block's boolean variables
         self._cost = int(cost)
@@ -242,7 +345,8 @@ class Edge:
         self._dst_node_uid = int(dst_var.split('_')[1])
         self._uid = Edge.get_edge_uid(self._src_node_uid, self._dst_node_uid)
         self._cost_var = "c_" + self._uid
-        self._bvar = "t_" + self._uid       # true in SMT2 model if edge taken
+        self._cost_const = "k_" + self._uid
+        self._bvar = "t_" + self._uid if bvar is None else bvar # true in SMT2 model if edge taken
         self._graph = graph
 
     @staticmethod
@@ -272,6 +376,20 @@ class Edge:
             if self._cost > 0:
                 env.assert_soft_formula(make_not(self._bvar), self._cost, asoft_id)
 
+        elif (ENC_BITVECTOR == encoding):
+            width, sum_width = self._graph.get_bv_widths()
+            env.declare_fun(self._cost_var, make_bv_sort(width))
+            if self._cost != 0:
+                f = make_equal(self._cost_var, make_ite(self._bvar, make_bv(self._cost, width), make_bv(0, width)))
+            else:
+                f = make_equal(self._cost_var, make_bv(0, width))
+            env.assert_formula(f)
+
+        elif (ENC_PARAMETRIC == encoding):
+            env.declare_fun(self._cost_var, Environment.INT)
+            f = make_equal(self._cost_var, make_ite(self._bvar, self._cost_const, "0"))
+            env.assert_formula(f)
+
         elif (ENC_DEFAULT_BAD == encoding):
             env.declare_fun(self._cost_var, Environment.INT)
             # no ITE semplification
@@ -305,6 +423,9 @@ class Edge:
     def get_cost_var(self):
         return self._cost_var
 
+    def get_cost_const(self):
+        return self._cost_const
+
     def get_bvar(self):
         return self._bvar
 
@@ -0,0 +1,163 @@
+import gc, sys, time, resource
+
+try:
+    import tracemalloc # python >= 3.4
+except ImportError:
+    tracemalloc = None
+
+###
+### Globals
+###
+
+PROC_STATUS = "/proc/self/status"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+###
+### MemoryProfile
+###
+
+class MemoryProfile:
+    """class MemoryProfile, records the peak memory of each phase of a process and
+    the sites holding most of the memory, and enforces a memory budget.
+
+    Peak memory is the high water mark of the resident set size, which is reset
+    at the beginning of each phase where the kernel allows it (Linux >= 4.0),
+    otherwise the peak of a phase is the peak of the process up to its end.
+    Allocation sites are source lines if tracemalloc is available, and object
+    types otherwise.
+
+    The budget is enforced as a limit on the address space of the process, and
+    of its children, so that an allocation exceeding it raises MemoryError
+    instead of attracting the OOM killer."""
+
+    def __init__(self, budget=0, track_sites=False, num_sites=10):
+        """Init:
+            - budget      : memory budget (MB), 0: disabled
+            - track_sites : record the sites holding most of the memory
+            - num_sites   : number of sites recorded
+        """
+        self._budget = int(budget)
+        self._track_sites = track_sites
+        self._num_sites = num_sites
+        self._phases = []       # list of (name, peak rss, rss, time) [KB, KB, s.]
+        self._phase = None      # name of the current phase
+        self._start_time = time.time()
+        self._sites = None      # (phase, kind, sites) of the phase with the largest rss
+        self._sites_rss = -1
+        if self._budget > 0:
+            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = self._budget * 1024 * 1024
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        if self._track_sites and tracemalloc is not None:
+            tracemalloc.start()
+        self._reset_peak()
+
+    def get_budget(self):
+        return self._budget
+
+    def get_phase(self):
+        return self._phase
+
+    def enter(self, name):
+        """ends the current phase, if any, and begins phase `name`"""
+        if self._phase is not None:
+            self._end_phase()
+        self._phase = name
+        self._start_time = time.time()
+
+    def close(self):
+        """ends the current phase, if any"""
+        if self._phase is not None:
+            self._end_phase()
+        self._phase = None
+
+    def dump(self, file_name):
+        """dumps the peak memory of each phase, and the sites holding most of
+        the memory at the end of the phase with the largest resident set size,
+        into the specified file"""
+        assert(file_name is not None)
+        with open(file_name, 'w') as fd:
+            fd.write("| phase | peak rss (KB) | rss (KB) | time (s.) |\n")
+            for name, peak, rss, elapsed in self._phases:
+                fd.write("| " + name + " | " + str(peak) + " | " + str(rss) + " | " + "%.3f" % elapsed + " |\n")
+            if self._sites is not None:
+                phase, kind, sites = self._sites
+                fd.write("| " + kind + " (" + phase + ") | size (KB) | count |\n")
+                for site, size, count in sites:
+                    fd.write("| " + site + " | " + str(size // 1024) + " | " + str(count) + " |\n")
+        return
+
+    def _end_phase(self):
+        rss, peak = read_rss()
+        self._phases.append((self._phase, peak, rss, time.time() - self._start_time))
+        if self._track_sites and rss > self._sites_rss:
+            self._sites_rss = rss
+            if tracemalloc is not None:
+                self._sites = (self._phase, "top allocation sites", get_top_allocation_sites(self._num_sites))
+            else:
+                self._sites = (self._phase, "top object types", get_top_object_types(self._num_sites))
+        self._reset_peak()
+
+    def _reset_peak(self):
+        try:
+            with open(PROC_CLEAR_REFS, 'w') as fd:
+                fd.write("5")
+        except (IOError, OSError):
+            pass # the peak of each phase is the peak up to its end
+
+###
+### help functions
+###
+
+def read_rss():
+    """returns the current and the peak resident set size of the process (KB)"""
+    rss, peak = None, None
+    try:
+        with open(PROC_STATUS, 'r') as fd:
+            for line in fd:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1])
+    except (IOError, OSError):
+        pass
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if rss is None:
+        rss = peak
+    return rss, peak
+
+def get_top_allocation_sites(num_sites):
+    """returns a list of (source line, size, count) triplets of the lines holding
+    most of the memory allocated since tracing started"""
+    stats = tracemalloc.take_snapshot().statistics("lineno")
+    return [(str(stat.traceback[0]), stat.size, stat.count) for stat in stats[0:num_sites]]
+
+def get_top_object_types(num_types):
+    """returns a list of (type name, size, count) triplets of the types of object
+    holding most of the memory, i.e. the objects tracked by the garbage collector
+    and the untracked ones they refer to (e.g. strings), where the size of
+    containers does not include the size of their items"""
+    sizes = {}
+    counts = {}
+    seen_ids = set()
+    for obj in gc.get_objects():
+        for ref in [obj] + [ref for ref in gc.get_referents(obj) if not gc.is_tracked(ref)]:
+            if id(ref) in seen_ids:
+                continue
+            seen_ids.add(id(ref))
+            name = type(ref).__name__
+            sizes[name] = sizes.get(name, 0) + sys.getsizeof(ref, 0)
+            counts[name] = counts.get(name, 0) + 1
+    names = sorted(sizes.keys(), key=lambda name: (-sizes[name], name))
+    return [(name, sizes[name], counts[name]) for name in names[0:num_types]]
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    # TODO: unit-testing
+    pass
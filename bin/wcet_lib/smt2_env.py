@@ -6,6 +6,9 @@ ENC_DEFAULT          = 0
 ENC_ASSERT_SOFT      = 1
 ENC_DIFFERENCE_LOGIC = 2
 ENC_DEFAULT_BAD      = 3 # like 0, but without reasonable improvements
+ENC_BITVECTOR        = 4 # like 0, but with bit-vector costs
+ENC_PARTIAL_SUMS     = 5 # like 0, but sums of costs reuse the sums of nested cuts
+ENC_PARAMETRIC       = 6 # like 0, but costs are constants defined in a separate cost block
 
 ###
 ###
@@ -36,6 +39,7 @@ class Environment:
         self._assertions = []
         self._soft_assertions = []
         self._objectives = []
+        self._assumptions = None
         self._comments = []
 
     # options
@@ -53,6 +57,14 @@ class Environment:
             self._declarations.append(d)
         return name
 
+    def define_fun(self, name, type, value):
+        """adds the definition of a constant of name `name`, type `type` and
+        value `value` to the environment."""
+        d = "(define-fun " + str(name) + " () " + str(type) + " " + str(value) + ")"
+        if (d not in self._declarations):
+            self._declarations.append(d)
+        return name
+
     def declare_private_fun(self, type):
         """adds a declaration of a function with a fresh, unique, internal
         name and type `type` to the environment, and returns the name."""
@@ -70,6 +82,9 @@ class Environment:
         """adds a declaration (unchecked) to the environment."""
         self._declarations.append(decl)
 
+    def get_declarations(self):
+        return self._declarations
+
     def is_declared(self, var):
         for decl in self._declarations:
             idx = decl.index('()')
@@ -94,6 +109,9 @@ class Environment:
             if not term in self._assertions:
                 self._assertions.append(str(term))
 
+    def get_assertions(self):
+        return self._assertions
+
     # soft assertions
 
     def assert_soft_formula(self, term, weight, id):
@@ -123,6 +141,14 @@ class Environment:
         t += ")"
         self._objectives.append(t)
 
+    # assumptions
+
+    def set_assumptions(self, terms):
+        """replaces `(check-sat)` with a satisfiability check under the assumption
+        that the boolean terms in `terms` hold, followed by a request of the subset
+        of these terms responsible for unsatisfiability, if any."""
+        self._assumptions = list(terms)
+
     # comments
     def add_comment(self, comment):
         """adds comment to the list of comments, which are printed at the end of the smt2 formula."""
@@ -148,7 +174,11 @@ class Environment:
         for o in self._objectives:
             print o
 
-        print "(check-sat)"
+        if self._assumptions is None:
+            print "(check-sat)"
+        else:
+            print "(check-sat-assuming (" + " ".join(self._assumptions) + "))"
+            print "(get-unsat-assumptions)"
 
         if (get_model):
             print "(set-model -1)"
@@ -214,6 +244,27 @@ def make_equal(term1, term2):
 def make_ite(bterm, term1, term2):
     return "(ite " + str(bterm) + " " + str(term1) + " " + str(term2) + ")"
 
+def make_bv_sort(width):
+    return "(_ BitVec " + str(width) + ")"
+
+def make_bv(value, width):
+    return "(_ bv" + str(value) + " " + str(width) + ")"
+
+def make_bvadd(terms):
+    if len(terms) > 1:
+        return "(bvadd" + ''.join(map(lambda t: " " + str(t), terms)) + ")"
+    else:
+        return ''.join(terms)
+
+def make_bvule(term1, term2):
+    return "(bvule " + str(term1) + " " + str(term2) + ")"
+
+def make_zero_extend(term, bits):
+    if bits > 0:
+        return "((_ zero_extend " + str(bits) + ") " + str(term) + ")"
+    else:
+        return str(term)
+
 ###
 ###
 ###
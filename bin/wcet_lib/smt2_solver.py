@@ -0,0 +1,170 @@
+import subprocess
+
+###
+### Globals
+###
+
+# command line used to run each solver in interactive mode, reading
+# SMT-LIB commands from stdin
+SOLVER_CMDS = {
+    "z3"          : ["z3", "-in", "-smt2"],
+    "optimathsat" : ["optimathsat"],
+}
+
+# multiplier converting a timeout in seconds into the unit expected by the
+# `:timeout` option of each solver
+TIMEOUT_SCALE = {
+    "z3"          : 1000,
+    "optimathsat" : 1,
+}
+
+###
+### SmtSolver
+###
+
+class SmtSolver:
+    """class SmtSolver, a wrapper for an SMT solver running as a child process,
+    which is fed with SMT-LIB commands through a pipe.
+
+    Only the handful of commands needed to query a formula incrementally are
+    supported, and any answer of the solver is returned unparsed."""
+
+    def __init__(self, name, timeout=None):
+        """Init:
+            - name    : solver identifier, key of SOLVER_CMDS
+            - timeout : seconds to timeout for each satisfiability check
+        """
+        if name not in SOLVER_CMDS:
+            raise Exception("unknown smt solver: " + str(name))
+        self._name = name
+        self._proc = subprocess.Popen(SOLVER_CMDS[name], stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE, universal_newlines=True)
+        self.send("(set-option :print-success false)")
+        self.send("(set-option :produce-models true)")
+        self.send("(set-option :produce-unsat-assumptions true)")
+        if timeout:
+            self.set_timeout(timeout)
+
+    def get_name(self):
+        return self._name
+
+    def set_timeout(self, timeout):
+        """sets the timeout of each subsequent satisfiability check, in seconds"""
+        self.send("(set-option :timeout " + str(int(timeout) * TIMEOUT_SCALE[self._name]) + ".0)")
+
+    # communication
+
+    def send(self, cmd):
+        """sends a command (unchecked) to the solver"""
+        self._proc.stdin.write(cmd + "\n")
+        self._proc.stdin.flush()
+
+    def receive(self):
+        """reads one answer from the solver, that is either a symbol or a
+        balanced s-expression, possibly spanning multiple lines"""
+        answer = ""
+        depth = 0
+        while True:
+            line = self._proc.stdout.readline()
+            if len(line) == 0:
+                raise Exception("smt solver " + self._name + " terminated unexpectedly")
+            answer += line
+            depth += line.count("(") - line.count(")")
+            if depth <= 0 and len(answer.strip()) > 0:
+                return answer.strip()
+
+    def close(self):
+        """terminates the solver"""
+        try:
+            self.send("(exit)")
+            self._proc.stdin.close()
+        except IOError:
+            pass
+        self._proc.wait()
+
+    # commands
+
+    def load_environment(self, env):
+        """sends declarations and assertions of an Environment to the solver"""
+        for d in env.get_declarations():
+            self.send(d)
+        for f in env.get_assertions():
+            self.send(f)
+
+    def push(self):
+        self.send("(push 1)")
+
+    def pop(self):
+        self.send("(pop 1)")
+
+    def assert_formula(self, term):
+        self.send("(assert " + str(term) + ")")
+
+    def check_sat(self):
+        """returns one of `sat`, `unsat` or `unknown`"""
+        self.send("(check-sat)")
+        return self._receive_status()
+
+    def check_sat_assuming(self, terms):
+        """returns one of `sat`, `unsat` or `unknown`"""
+        self.send("(check-sat-assuming (" + " ".join(terms) + "))")
+        return self._receive_status()
+
+    def get_unsat_assumptions(self):
+        """returns the list of assumptions responsible for unsatisfiability"""
+        self.send("(get-unsat-assumptions)")
+        return self.receive().strip("()").split()
+
+    def get_value(self, terms):
+        """returns a dictionary with the value of each term in the current model,
+        each value is the string printed by the solver"""
+        self.send("(get-value (" + " ".join(terms) + "))")
+        return self._receive_pairs()
+
+    # optimization
+
+    def maximize(self, term):
+        """adds `term` to the objectives of the current scope, the solver must
+        support OMT for this to work"""
+        self.send("(maximize " + str(term) + ")")
+
+    def get_objectives(self):
+        """returns a dictionary with the value of each objective after the last
+        check, each value is the string printed by the solver"""
+        self.send("(get-objectives)")
+        return self._receive_pairs()
+
+    def _receive_pairs(self):
+        answer = self.receive()
+        values = {}
+        depth = 0
+        start = 0
+        for idx in range(0, len(answer)):
+            if answer[idx] == "(":
+                depth += 1
+                if depth == 2:
+                    start = idx
+            elif answer[idx] == ")":
+                if depth == 2:
+                    term, value = answer[start + 1:idx].split(None, 1)
+                    values[term] = value.strip()
+                depth -= 1
+        return values
+
+    def _receive_status(self):
+        answer = self.receive()
+        while answer == "unsupported": # unknown option, ignored by the solver
+            answer = self.receive()
+        if answer in ["sat", "unsat", "unknown"]:
+            return answer
+        elif "timeout" in answer or "canceled" in answer:
+            return "unknown"
+        raise Exception("unexpected answer from smt solver " + self._name + ": " + answer)
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    # TODO: unit-testing requires an smt solver
+    pass
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+import os, re, argparse
+from compression import *
+
+###
+### Globals
+###
+
+# s-expression statistics, as printed by `(get-info :all-statistics)` and by
+# the `-st` command-line flag of z3, e.g. ` :conflicts 12` or `(:time 0.01`
+SEXPR_STAT = re.compile(r"[(\s]:([A-Za-z][\w\-.]*)\s+(-?[0-9]+(?:\.[0-9]+)?)(?=[\s)])")
+
+# line-oriented statistics, as printed by smtopt in verbose mode and by
+# `/usr/bin/time`, e.g. `# real-time: 0.12` or `number of calls = 7`
+LINE_STAT = re.compile(r"^[#;\s]*([A-Za-z][\w\-. ]*?)\s*[:=]\s*(-?[0-9]+(?:\.[0-9]+)?)\s*$")
+
+# solver specific names mapped onto a common vocabulary, so that the same
+# quantity can be compared across solvers
+ALIASES = {
+    "time_sec"            : "time",
+    "total_time_sec"      : "total_time",
+    "sat_conflicts"       : "conflicts",
+    "sat_decisions"       : "decisions",
+    "sat_propagations"    : "propagations",
+    "binary_propagations" : "propagations_binary",
+    "memory"              : "memory_mb",
+    "max_memory"          : "max_memory_mb",
+}
+
+###
+### main
+###
+
+def main():
+    """Parses the statistics block printed by an OMT solver into normalized
+    `key value` pairs, or joins a summary file with the statistics of each
+    one of its result rows."""
+    opts = get_options()
+
+    if opts.join:
+        print_joined_statistics(opts.filename)
+    else:
+        stats = parse_statistics(opts.filename)
+        for key in sorted(stats.keys()):
+            print(key + " " + str(stats[key]))
+
+###
+### help functions
+###
+
+def get_options():
+    """parses and returns input options"""
+    parser = argparse.ArgumentParser(description="solver_stats")
+    parser.add_argument("filename", type=str, help="solver output file, or summary file with --join")
+    parser.add_argument("--join", help="join each row of a summary file with its `.stats` file", action="store_true")
+    return parser.parse_args()
+
+def normalize_key(key):
+    """returns the normalized version of a statistic name"""
+    key = re.sub(r"[^a-z0-9]+", "_", key.strip().lower()).strip("_")
+    return ALIASES.get(key, key)
+
+def normalize_value(value):
+    """returns `value` as an int, if possible, and as a float otherwise"""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def parse_statistics(file):
+    """parses the output of z3, optimathsat or smtopt and returns a dictionary
+    with the collected statistics; when a statistic is printed more than once,
+    the last value is retained"""
+    stats = {}
+    with open_file(file, 'r') as fd:
+        txt = fd.read()
+    for key, value in SEXPR_STAT.findall(txt):
+        stats[normalize_key(key)] = normalize_value(value)
+    for line in txt.split('\n'):
+        res = LINE_STAT.match(line)
+        if res is not None:
+            stats[normalize_key(res.group(1))] = normalize_value(res.group(2))
+    return stats
+
+def load_statistics(file):
+    """loads a `.stats` file generated by this script"""
+    stats = {}
+    with open(file, 'r') as fd:
+        for line in fd:
+            if len(line.strip()) == 0:
+                continue
+            key, value = line.split()
+            stats[key] = normalize_value(value)
+    return stats
+
+def print_joined_statistics(summary_file):
+    """prints, for each row of a summary file, the benchmark name followed
+    by its statistics; statistics missing for a row are printed as `-`"""
+    rows = []
+    keys = []
+    with open_file(summary_file, 'r') as fd:
+        idx = 0
+        for line in fd:
+            if idx != 0:
+                out_file = split_compression_suffix(''.join(line.split()).split("|")[12])[0]
+                stats_file = os.path.splitext(out_file)[0] + ".stats"
+                stats = load_statistics(stats_file) if os.path.isfile(stats_file) else {}
+                for key in stats.keys():
+                    if key not in keys:
+                        keys.append(key)
+                rows.append((os.path.splitext(os.path.basename(out_file))[0], stats))
+            idx += 1
+    keys.sort()
+    print(" ".join(["benchmark"] + keys))
+    for bench, stats in rows:
+        print(" ".join([bench] + [str(stats[key]) if key in stats else "-" for key in keys]))
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    main()
@@ -1,8 +1,28 @@
 #!/usr/bin/env python
 
-import os, sys, argparse, errno, math, re, copy
+import os, sys, argparse, errno, math, re, copy, struct, zlib, hashlib, multiprocessing
 import numpy as np
+import matplotlib
+matplotlib.use("Agg") # non-interactive backend, safe within worker processes
 import matplotlib.pyplot as plt
+from compression import *
+
+###
+### Globals
+###
+
+# version of the rendering code, part of the fingerprint of each plot, to be
+# increased whenever the rendering code changes
+PLOT_VERSION = 1
+
+# keyword of the PNG text chunk holding the fingerprint of a plot
+FINGERPRINT_KEY = "wcet-fingerprint"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# data shared with worker processes, which inherit it when forked instead of
+# loading or receiving it again
+shared = {}
 
 ###
 ### main
@@ -12,7 +32,7 @@ def main():
     opts = get_options()
 
     if len(opts.files) <= 0:
-        print("usage: stats_plot [-n title] [-d plots_dir] [-t timeout] stats_file ...")
+        print("usage: stats_plot [-n title] [-d plots_dir] [-t timeout] [-j jobs] [-f] stats_file ...")
         quit(1)
 
     tools = []
@@ -24,15 +44,37 @@ def main():
         mkdir_p(opts.d)
 
     c_tools, c_results = collapse_stats(tools, results)
-    for bench in c_results.keys():
-        small_results = {}
-        small_results[bench] = c_results[bench]
-        name = opts.n + "_" + bench
-        plot_bars(opts.d, name, c_tools, small_results, opts.t)
-
     cs_results = cactus_stats(c_tools, c_results, opts.t)
 
-    plot_scatter(opts.d, opts.n + "_scatter", cs_results)
+    shared["plots_dir"] = opts.d
+    shared["timeout"] = opts.t
+    shared["tools"] = c_tools
+    shared["results"] = c_results
+    shared["cactus"] = cs_results
+
+    # skip plots whose input data did not change since they were rendered
+    plots = [("bars", opts.n + "_" + bench, bench) for bench in sorted(c_results.keys())]
+    plots.append(("scatter", opts.n + "_scatter", None))
+    tasks = []
+    for kind, title, bench in plots:
+        fingerprint = get_fingerprint(kind, title, bench)
+        if opts.d is not None and not opts.f and \
+                read_png_fingerprint(get_plot_file(opts.d, title)) == fingerprint:
+            continue
+        tasks.append((kind, title, bench, fingerprint))
+
+    if opts.j > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(opts.j)
+        try:
+            pool.map(render_plot, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for task in tasks:
+            render_plot(task)
+
+    print("plots: " + str(len(tasks)) + " rendered, " + str(len(plots) - len(tasks)) + " up-to-date")
 
 ###
 ### help functions
@@ -44,16 +86,78 @@ def get_options():
     parser.add_argument("-n", type=str, help="plot name", default="default")
     parser.add_argument("-d", type=str, help="plots directory", default=None)
     parser.add_argument("-t", type=int, help="timeout", default=600)
+    parser.add_argument("-j", type=int, help="number of plots rendered in parallel", default=multiprocessing.cpu_count())
+    parser.add_argument("-f", help="render every plot, even if up-to-date", action="store_true")
     parser.add_argument("files", type=str, nargs=argparse.REMAINDER)
     return parser.parse_args()
 
+def get_plot_file(plots_dir, title):
+    return "%s/%s.png" % (plots_dir, title)
+
+def get_fingerprint(kind, title, bench):
+    """returns the fingerprint of the input data of a plot, that is either the
+    bar chart of `bench` or the cactus plot (see render_plot)"""
+    if kind == "bars":
+        data = (sorted(shared["tools"]), sorted(shared["results"][bench].items()))
+    else:
+        data = sorted(shared["cactus"].items())
+    return hashlib.sha1(repr((PLOT_VERSION, kind, title, shared["timeout"], data)).encode()).hexdigest()
+
+def render_plot(task):
+    """renders a plot, described by a tuple (kind, title, benchmark, fingerprint),
+    and stores the fingerprint within the plot file"""
+    kind, title, bench, fingerprint = task
+    plots_dir = shared["plots_dir"]
+    if kind == "bars":
+        plot_bars(plots_dir, title, list(shared["tools"]), {bench : shared["results"][bench]}, shared["timeout"])
+    else:
+        plot_scatter(plots_dir, title, shared["cactus"])
+    if plots_dir is not None:
+        write_png_fingerprint(get_plot_file(plots_dir, title), fingerprint)
+
+def read_png_fingerprint(file):
+    """returns the fingerprint stored in a text chunk of a PNG file, or None if
+    the file does not exist or holds no fingerprint"""
+    try:
+        with open(file, 'rb') as fd:
+            if fd.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+                return None
+            while True:
+                header = fd.read(8)
+                if len(header) < 8:
+                    return None
+                length, chunk_type = struct.unpack(">I4s", header)
+                if chunk_type in [b"IDAT", b"IEND"]:
+                    return None # text chunks are written before image data
+                data = fd.read(length)
+                fd.read(4) # crc
+                if chunk_type == b"tEXt":
+                    key, value = data.split(b"\0", 1)
+                    if key == FINGERPRINT_KEY.encode():
+                        return value.decode()
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+def write_png_fingerprint(file, fingerprint):
+    """stores a fingerprint in a text chunk right after the header of a PNG file"""
+    with open(file, 'rb') as fd:
+        content = fd.read()
+    data = FINGERPRINT_KEY.encode() + b"\0" + fingerprint.encode()
+    chunk = struct.pack(">I", len(data)) + b"tEXt" + data + \
+            struct.pack(">I", zlib.crc32(b"tEXt" + data) & 0xffffffff)
+    ihdr_end = len(PNG_SIGNATURE) + 8 + struct.unpack(">I", content[8:12])[0] + 4
+    tmp_file = file + "." + str(os.getpid())
+    with open(tmp_file, 'wb') as fd:
+        fd.write(content[:ihdr_end] + chunk + content[ihdr_end:])
+    os.rename(tmp_file, file)
+
 def collect_stats(file, tools, results):
     """parses statistics summary file generated by wcet_omt, saving
     the interesting values in 'tools' and 'results'"""
     try:
-        with open(file, 'r') as fd:
+        with open_file(file, 'r') as fd:
             file = os.path.realpath(file)
-            tool, ext = os.path.splitext(os.path.basename(file))
+            tool, ext = os.path.splitext(os.path.basename(split_compression_suffix(file)[0]))
             if tool not in tools:
                 tools.append(tool)
 
@@ -64,9 +168,9 @@ def collect_stats(file, tools, results):
                     max_path, opt_value, gain, num_cuts, \
                     real_time, status, timeout, errors, \
                     llvm_size, num_blocks, smt2_file, \
-                    out_file = ''.join(line.split()).split("|")[1:-1]
+                    out_file = ''.join(line.split()).split("|")[1:13]
 
-                    bench, ext = os.path.splitext(os.path.basename(out_file))
+                    bench, ext = os.path.splitext(os.path.basename(split_compression_suffix(out_file)[0]))
 
                     if bench not in results.keys():
                         results[bench] = {}
@@ -196,7 +300,7 @@ def plot_bars(plots_dir, title, tools, benchmarks, timeout):
 
     # save, show
     if plots_dir is not None:
-        file_name = "%s/%s.png" % (plots_dir, title)
+        file_name = get_plot_file(plots_dir, title)
         plt.savefig(file_name, bbox_extra_artists=(lgd,), bbox_inches='tight')
 
 #    plt.show()
@@ -326,7 +430,7 @@ def plot_scatter(plots_dir, title, data):
 
     # save, show
     if plots_dir is not None:
-        file_name = "%s/%s.png" % (plots_dir, title)
+        file_name = get_plot_file(plots_dir, title)
         plt.savefig(file_name, bbox_extra_artists=(lgd,), bbox_inches='tight')
 
 #    plt.show()
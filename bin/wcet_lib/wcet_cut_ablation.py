@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+import re, time, argparse
+from smt2_solver import *
+from wcet_omt_driver import split_commands
+
+###
+### Globals
+###
+
+GUARD_DECL = re.compile(r"^\(declare-fun (g_[0-9]+_[0-9]+) \(\) Bool\)$")
+GUARD = re.compile(r"^\(assert g_[0-9]+_[0-9]+\)$")
+
+# commands of the input formula which are replaced by the ones issued in
+# each configuration
+SKIPPED = ["maximize", "minimize", "check-sat", "check-sat-assuming", "get-objectives",
+           "get-model", "get-value", "get-info", "exit"]
+
+###
+### main
+###
+
+def main():
+    """Runs an OMT formula generated by wcet_generator.py with --guardcuts under
+    several subsets of its cuts, over a single incremental solver instance which
+    parses the formula only once.
+
+    Each configuration is solved within a push/pop scope in which every guard
+    is either asserted or negated, and is reported on a line of its own with
+    the solver status, the optimum value and the time taken."""
+    opts = get_options()
+
+    try:
+        with open(opts.filename, 'r') as fd:
+            commands = split_commands(fd.read())
+    except IOError:
+        print(";; ERROR: file `" + opts.filename + "` does not exist or can not be read, quitting.")
+        quit(1)
+
+    guards = []
+    objective = None
+    formula = []
+    for cmd in commands:
+        head = cmd[1:-1].split(None, 1)[0]
+        res = GUARD_DECL.match(cmd)
+        if res is not None:
+            guards.append(res.group(1))
+        if head == "maximize":
+            objective = cmd[1:-1].split()[1]
+        if head in SKIPPED or GUARD.match(cmd) is not None:
+            continue
+        formula.append(cmd)
+
+    if objective is None:
+        print(";; ERROR: no objective to maximize, quitting.")
+        quit(1)
+    if len(guards) == 0:
+        print(";; ERROR: no guarded cuts, see wcet_generator.py --guardcuts, quitting.")
+        quit(1)
+
+    solver = SmtSolver(opts.solver, opts.timeout)
+    try:
+        for d in formula:
+            solver.send(d)
+        print("| config | status | optimum | time (s.) |")
+        for name, active in get_configurations(guards, opts.configs):
+            status, value, elapsed = solve(solver, guards, active, objective)
+            print("| " + name + " | " + status + " | " + str(value) + " | " + "%.3f" % elapsed + " |")
+    finally:
+        solver.close()
+
+###
+### help functions
+###
+
+def get_options():
+    """parses and returns input options"""
+    parser = argparse.ArgumentParser(description="wcet_cut_ablation")
+    parser.add_argument("filename", type=str, help="omt formula generated by wcet_generator.py --guardcuts")
+    parser.add_argument("--solver", type=str, help="omt solver, z3 or optimathsat", default="z3")
+    parser.add_argument("--timeout", type=int, help="Timeout value of each configuration (seconds)", default=0)
+    parser.add_argument("--configs", type=str, nargs="+", help="configurations to be run, "
+                        "all: every cut, none: no cut, drop: every cut but one, for each cut, "
+                        "only: a single cut, for each cut", choices=["all", "none", "drop", "only"],
+                        default=["all", "none", "drop"])
+    return parser.parse_args()
+
+def get_configurations(guards, configs):
+    """returns the list of pairs (name, active guards) for the given kinds of
+    configurations"""
+    ret = []
+    for config in configs:
+        if config == "all":
+            ret.append(("all", list(guards)))
+        elif config == "none":
+            ret.append(("none", []))
+        elif config == "drop":
+            ret += [("-" + g[2:], [h for h in guards if h != g]) for g in guards]
+        elif config == "only":
+            ret += [("+" + g[2:], [g]) for g in guards]
+    return ret
+
+def solve(solver, guards, active, objective):
+    """maximizes `objective` with the cuts of the `active` guards only, and
+    returns a triplet with the status, the optimum value (None if unknown) and
+    the time taken"""
+    value = None
+    solver.push()
+    for g in guards:
+        solver.assert_formula(g if g in active else "(not " + g + ")")
+    solver.maximize(objective)
+    start_time = time.time()
+    status = solver.check_sat()
+    elapsed = time.time() - start_time
+    if status == "sat":
+        value = solver.get_objectives().get(objective)
+    solver.pop()
+    return status, value, elapsed
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    main()
@@ -1,8 +1,20 @@
 #!/usr/bin/env python
 
-import argparse
+import os, re, sys, argparse, multiprocessing
 from smt2_env import *
 from graph import *
+from cost_table import *
+from smt2_solver import *
+from mem_profile import *
+from compression import *
+
+###
+### Globals
+###
+
+# constants of the cost block of the parametric encoding
+COST_CONST = re.compile(r"^\(define-fun (k[0-9a-z_]*) \(\) Int [0-9]+\)$")
+COST_CUT = re.compile(r"^\(define-fun kcut_([0-9]+_[0-9]+) \(\) Int [0-9]+\)$")
 
 ###
 ###
@@ -15,39 +27,114 @@ def main():
     time taken by an SMT solver."""
     opts = get_cmdline_options();
 
+    if opts.compress:
+        sys.stdout = compress_stream(sys.stdout, opts.compress)
+
+    profile = MemoryProfile(opts.membudget, opts.memprofile is not None)
+    try:
+        generate(opts, profile)
+    except MemoryError:
+        if profile.get_budget() > 0:
+            print(";; ERROR: memory budget of " + str(profile.get_budget()) + " MB exceeded in phase `" + str(profile.get_phase()) + "`, quitting.")
+        else:
+            print(";; ERROR: out of memory in phase `" + str(profile.get_phase()) + "`, quitting.")
+        quit(1)
+    finally:
+        profile.close()
+        if opts.memprofile:
+            profile.dump(opts.memprofile)
+        if opts.compress:
+            stream, sys.stdout = sys.stdout, sys.__stdout__
+            stream.close()
+
+def generate(opts, profile):
+    """runs each phase of main(), marking its beginning in `profile`"""
     # load file containing smt2 formula + source code blocks generated by pagai
+    profile.enter("load")
     try:
-        with open(opts.filename, 'r') as fd:
+        with open_file(opts.filename, 'r') as fd:
             smt_txt, graph_txt = fd.read().rsplit('-------', 1)
+    except MemoryError:
+        raise
     except Exception:
         print(";; ERROR: file `" + opts.filename + "` does not exist or can not be read, quitting.\n")
         quit(1)
 
-    # preload initial environment and graph
-    env = preload_smt_env(smt_txt)
-    graph = preload_graph(graph_txt, env.is_declared('bs_0'))
+    # preload initial environment and graph, the smt2 formula is not needed
+    # to re-time a parametric formula
+    profile.enter("preload")
+    if opts.updatecosts:
+        env = None
+        graph = preload_graph(graph_txt, re.search(r"\(declare-fun bs_0 ", smt_txt) is not None)
+    else:
+        env = preload_smt_env(smt_txt)
+        graph = preload_graph(graph_txt, env.is_declared('bs_0'))
 
-    # Update costs with Matching File, if available
+    # Update costs with Matching File, if available (compiled into a cost table)
+    profile.enter("costs")
     if (opts.matchingfile):
         try:
-            with open(opts.matchingfile, 'r') as fd:
-                matchings = fd.read()
-                graph.update_costs_with_matchings(matchings)
+            graph.update_costs_with_cost_table(get_cost_table(opts.matchingfile, graph.get_label2uid()))
+        except MemoryError:
+            raise
         except Exception:
             print(";; ERROR: matching file does not exist, ignored.")
             quit(1)
 
-    # detect loops
-    ret = graph.has_loop()
-    if ret > 0:
-        print(";; ERROR: loop detected.")
+    # detect loops, and summarize them with their iteration bounds
+    profile.enter("loops")
+    try:
+        graph.summarize_loops(opts.loopbounds, opts.loopbound)
+    except IOError:
+        print(";; ERROR: loop bounds file does not exist, quitting.")
+        quit(1)
+    except MemoryError:
+        raise
+    except Exception as e:
+        print(";; ERROR: " + str(e) + ", quitting.")
         quit(1)
 
+    # Simplify graph
+    profile.enter("simplify")
+    if opts.simplify:
+        graph.simplify()
+
+    # Re-time a formula generated with the parametric encoding
+    if opts.updatecosts:
+        try:
+            update_cost_block(opts.updatecosts, graph)
+        except IOError:
+            print(";; ERROR: file `" + opts.updatecosts + "` does not exist or can not be written, quitting.")
+            quit(1)
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(";; ERROR: " + str(e) + ", quitting.")
+            quit(1)
+        return
+
+    # Check feasibility of longest syntactic path
+    if opts.pathcheck:
+        graph.add_path_check_to_env(env)
+        if opts.timeout:
+            env.set_option("timeout", str(opts.timeout) + ".0")
+        env.dump()
+        return
+
     # Compute and add cuts
+    profile.enter("cuts")
     if not opts.nosummaries:
         graph.add_dominator_cuts()
         graph.add_semantic_cuts(opts.cutsfile, opts.recursivecuts)
+        if opts.pathcore:
+            try:
+                graph.add_path_core_cuts(load_unsat_assumptions(opts.pathcore))
+            except IOError:
+                print(";; ERROR: path check output file does not exist, quitting.")
+                quit(1)
         graph.compute_longest_syntactic_path(not opts.nosummaries)
+        if opts.selectcuts or opts.maxcuts:
+            graph.select_cuts(opts.maxcuts)
 
     # Dump Relevant Information into files, if needed
     if opts.smtmatching:
@@ -57,13 +144,41 @@ def main():
     if opts.printcutslist:
         graph.dump_cuts_list(opts.printcutslist)
 
+    # Check feasibility of top-K longest syntactic paths
+    profile.enter("bounds")
+    lower, upper = None, None
+    if opts.toppaths:
+        try:
+            lower, upper = check_longest_paths(env, graph, opts.toppaths, opts.solver, opts.checktimeout)
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(";; ERROR: longest paths check failed, " + str(e) + ", quitting.")
+            quit(1)
+
+    # Solve single-entry/single-exit regions independently
+    if opts.regions:
+        try:
+            reg_lower, reg_upper = solve_regions(env, graph, opts.regions, opts.solver, opts.checktimeout)
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(";; ERROR: region decomposition failed, " + str(e) + ", quitting.")
+            quit(1)
+        if reg_lower is not None and (lower is None or reg_lower > lower):
+            lower = reg_lower
+        if reg_upper is not None and (upper is None or reg_upper < upper):
+            upper = reg_upper
+
     # Dump Graph over Environment
-    graph.add_graph_to_env(env, opts.encoding)
+    profile.enter("encode")
+    graph.add_graph_to_env(env, opts.encoding, lower, upper, opts.guardcuts)
 
     if opts.timeout:
         env.set_option("timeout", str(opts.timeout) + ".0")
 
     # Dump SMT2 Formula
+    profile.enter("dump")
     env.dump()
 
 
@@ -80,12 +195,62 @@ def get_cmdline_options():
     parser.add_argument("--matchingfile", type=str, help="name of the matching file")
     parser.add_argument("--smtmatching", type=str, help="name of the file matching labels to booleans")
     parser.add_argument("--cutsfile", type=str, help="name of the cuts file")
+    parser.add_argument("--loopbounds", type=str, help="name of the file listing the iteration bound of loops, as `header label, bound` pairs")
+    parser.add_argument("--loopbound", type=int, help="iteration bound of loops with no bound given in --loopbounds or annotated in the code", default=0)
     parser.add_argument("--printlongestsyntactic", type=str, help="name of the file storing the longest syntactic path")
     parser.add_argument("--printcutslist", type=str, help="name of the file that lists the different cuts, in order of difficulty")
-    parser.add_argument("--encoding", type=int, help="0: default, 1: assert-soft, 2: difference logic")
+    parser.add_argument("--simplify", help="prune dead nodes and collapse chains of nodes before encoding", action="store_true")
+    parser.add_argument("--selectcuts", help="drop redundant cuts and rank the remaining ones", action="store_true")
+    parser.add_argument("--maxcuts", type=int, help="keep only the given number of top-ranked cuts, implies --selectcuts", default=0)
+    parser.add_argument("--pathcheck", help="check feasibility of the longest syntactic path instead of optimizing", action="store_true")
+    parser.add_argument("--pathcore", type=str, help="name of the solver output of an unsat path check, used to add a cut")
+    parser.add_argument("--toppaths", type=int, help="check feasibility of up to the given number of longest syntactic paths, to bound the optimum value", default=0)
+    parser.add_argument("--guardcuts", help="make each cut implied by a boolean guard, asserted on a line of its own", action="store_true")
+    parser.add_argument("--regions", type=int, help="maximize the cost of each single-entry/single-exit region with the given number of parallel solvers, to bound the optimum value", default=0)
+    parser.add_argument("--solver", type=str, help="smt solver used for feasibility checks, z3 or optimathsat", default="z3")
+    parser.add_argument("--checktimeout", type=int, help="Timeout value for each feasibility check (seconds)")
+    parser.add_argument("--encoding", type=int, help="0: default, 1: assert-soft, 2: difference logic, 3: default (LCTES14), 4: bit-vector, 5: partial sums, 6: parametric")
+    parser.add_argument("--updatecosts", type=str, help="name of a formula generated with the parametric encoding from the same input and options, "
+                        "whose cost block is rewritten in place with the costs of --matchingfile, instead of generating a formula; "
+                        "bounds from --toppaths and --regions are reset to 0 and the longest syntactic path")
     parser.add_argument("--timeout", type=int, help="Timeout value (seconds)")
+    parser.add_argument("--memprofile", type=str, help="name of the file storing the peak memory of each phase and the sites holding most of the memory")
+    parser.add_argument("--compress", type=str, help="compress the output formula with the given tool, as it is generated", choices=["gzip", "zstd"])
+    parser.add_argument("--membudget", type=int, help="memory budget (MB), allocations exceeding it make the generator quit with an error, "
+                        "the budget applies to solvers run for --toppaths and --regions as well", default=0)
     return parser.parse_args()
 
+def update_cost_block(file, graph):
+    """rewrites in place the cost block of a formula generated with the parametric
+    encoding, with the costs of the nodes and edges of `graph` and the cut bounds
+    these imply. The rest of the formula is left untouched."""
+    with open_file(file, 'r') as fd:
+        lines = fd.read().split('\n')
+
+    cut_uids = [res.group(1) for res in [COST_CUT.match(line) for line in lines] if res is not None]
+    longest_path = graph.get_longest_path_cost()
+    constants = dict(graph.get_cost_constants(graph.compute_cut_bounds(cut_uids), 0, longest_path))
+
+    num_constants = 0
+    for idx in range(0, len(lines)):
+        res = COST_CONST.match(lines[idx])
+        if res is not None:
+            name = res.group(1)
+            if name not in constants:
+                raise Exception("unknown cost constant `" + name + "`, not generated from the same input")
+            lines[idx] = "(define-fun " + name + " () " + Environment.INT + " " + str(constants[name]) + ")"
+            num_constants += 1
+        elif lines[idx].startswith("; LONGEST_PATH = "):
+            lines[idx] = "; LONGEST_PATH = " + str(longest_path)
+    if num_constants != len(constants):
+        raise Exception("incomplete cost block, not generated with the parametric encoding from the same input")
+
+    base_name, suffix = split_compression_suffix(file)
+    tmp_file = base_name + "." + str(os.getpid()) + suffix
+    with open_file(tmp_file, 'w') as fd:
+        fd.write('\n'.join(lines))
+    os.rename(tmp_file, file)
+
 def preload_smt_env(smt_formula):
     """parses input smt2 formula, storing it into an SMT2 environment object,
     returned to the caller.
@@ -120,6 +285,182 @@ def preload_smt_env(smt_formula):
     env.assert_formula(f)
     return env
 
+def check_longest_paths(env, graph, max_paths, solver_name, timeout):
+    """checks the feasibility of up to `max_paths` longest syntactic paths of `graph`
+    against the formula in `env`, in order of non-increasing cost, stopping at the
+    first feasible one. Returns a (lower, upper) pair of bounds on the optimum value,
+    which are None when unknown.
+
+    The cost of a feasible path is the optimum value, since every path with a higher
+    cost has been found infeasible. Otherwise, the cost of the first path that has not
+    been checked, or whose check timed out, bounds the optimum value from above."""
+    lower, upper = None, None
+    num_paths = 0
+    solver = SmtSolver(solver_name, timeout)
+    try:
+        solver.load_environment(env)
+        for cost, node_uids in graph.enumerate_longest_paths():
+            if num_paths >= max_paths:
+                upper = cost
+                break
+            num_paths += 1
+            status = solver.check_sat_assuming(graph.get_path_bvars(node_uids))
+            if status == "sat":
+                lower, upper = cost, cost
+                break
+            elif status == "unknown":
+                upper = cost
+                break
+    finally:
+        solver.close()
+    env.add_comment("TOP_PATHS_CHECKED = " + str(num_paths))
+    return lower, upper
+
+def solve_regions(env, graph, num_jobs, solver_name, timeout):
+    """maximizes the cost of each single-entry/single-exit region of `graph` on its
+    own, with up to `num_jobs` solvers running in parallel, and returns a (lower, upper)
+    pair of bounds on the optimum value, which are None when unknown.
+
+    The sum of the maxima of the regions bounds the optimum value from above, the
+    longest syntactic path of a region being used in place of its maximum on timeout.
+    When the worst-case paths of all regions can be taken together, their sum is
+    the optimum value."""
+    regions = graph.compute_sese_regions()
+    env.add_comment("NB_REGIONS = " + str(len(regions)))
+    if len(regions) < 2:
+        return None, None # nothing to decompose
+
+    tasks = []
+    bounds = []
+    for entry_uid, exit_uid in regions:
+        renv = Environment()
+        renv.add_declarations(env.get_declarations())
+        bvars, bound = graph.add_region_to_env(renv, entry_uid, exit_uid, "cost")
+        commands = renv.get_declarations() + restrict_assertions(env, bvars) + renv.get_assertions()
+        tasks.append((solver_name, timeout, commands, "cost", bvars))
+        bounds.append(bound)
+
+    pool = multiprocessing.Pool(min(num_jobs, len(tasks)))
+    try:
+        results = pool.map(solve_region, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+    upper = 0
+    path_bvars = []
+    for idx in range(0, len(results)):
+        status, value, true_bvars = results[idx]
+        if status == "sat":
+            upper += min(value, bounds[idx])
+            if path_bvars is not None:
+                path_bvars += true_bvars
+        else:
+            upper += bounds[idx]
+            path_bvars = None
+    env.add_comment("REGIONS_BOUND = " + str(upper))
+    if path_bvars is None or len(path_bvars) == 0:
+        return None, upper
+
+    solver = SmtSolver(solver_name, timeout)
+    try:
+        solver.load_environment(env)
+        status = solver.check_sat_assuming(path_bvars)
+    finally:
+        solver.close()
+    if status == "sat":
+        return upper, upper
+    return None, upper
+
+def solve_region(task):
+    """maximizes the objective of a region formula, and returns a triplet with the
+    search status, the optimum value and the boolean terms that hold in the model"""
+    solver_name, timeout, commands, objective, bvars = task
+    try:
+        solver = SmtSolver(solver_name, timeout)
+        try:
+            for cmd in commands:
+                solver.send(cmd)
+            solver.maximize(objective)
+            status = solver.check_sat()
+            if status != "sat":
+                return status, None, []
+            value = int(solver.get_objectives()[objective])
+            values = solver.get_value(bvars)
+            return status, value, [b for b in bvars if values.get(b) == "true"]
+        finally:
+            solver.close()
+    except Exception:
+        return "unknown", None, []
+
+def split_conjuncts(term):
+    """returns the list of conjuncts of `term`, flattening nested `and`s; any
+    other term is returned as a single conjunct"""
+    term = term.strip()
+    if not term.startswith("(and") or len(term) < 5 or not (term[4].isspace() or term[4] == "("):
+        return [term]
+    conjuncts = []
+    depth = 0
+    start = None
+    for idx in range(4, len(term) - 1):
+        c = term[idx]
+        if depth == 0 and start is None and not c.isspace():
+            start = idx
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        if start is not None and depth == 0 and (c == ")" or term[idx + 1].isspace() or term[idx + 1] in "()"):
+            conjuncts += split_conjuncts(term[start:idx + 1])
+            start = None
+    if depth != 0 or start is not None:
+        return [term] # unbalanced, left untouched
+    return conjuncts
+
+def restrict_assertions(env, symbols):
+    """returns the assertions of `env` restricted to the conjuncts that share some
+    declared symbol with `symbols`, either directly or through other retained
+    conjuncts. The dropped conjuncts share no symbol with the retained ones, thus
+    they can be satisfied independently whenever the whole formula is satisfiable."""
+    declared = set(re.findall(r"\(declare-fun (\S+)", "\n".join(env.get_declarations())))
+    conjuncts = []
+    for a in env.get_assertions():
+        conjuncts += split_conjuncts(a.strip()[len("(assert"):-1])
+    conj_symbols = [set(re.findall(r"[^\s()]+", c)) & declared for c in conjuncts]
+
+    closure = set(symbols)
+    retained = [False] * len(conjuncts)
+    changed = True
+    while changed:
+        changed = False
+        for idx in range(0, len(conjuncts)):
+            if not retained[idx] and (len(conj_symbols[idx]) == 0 or len(conj_symbols[idx] & closure) > 0):
+                retained[idx] = True
+                closure |= conj_symbols[idx]
+                changed = True
+    return ["(assert " + conjuncts[idx] + ")" for idx in range(0, len(conjuncts)) if retained[idx]]
+
+def load_unsat_assumptions(file):
+    """parses the solver output of an unsat path check, and returns the list
+    of unsat assumptions printed after the search status"""
+    with open_file(file, 'r') as fd:
+        txt = fd.read()
+    res = re.search(r"^unsat$", txt, re.MULTILINE)
+    if res is None:
+        return []
+    start = txt.find("(", res.end())
+    if start < 0 or txt[start:start + 6] == "(error":
+        return []
+    depth = 0
+    for end in range(start, len(txt)):
+        if txt[end] == "(":
+            depth += 1
+        elif txt[end] == ")":
+            depth -= 1
+            if depth == 0:
+                break
+    return txt[start + 1:end].split()
+
 def preload_graph(graph_txt, use_bs):
     """parses input source code graph generated with pagai, storing into a
     SourceCodeGraph instance, returned to the caller."""
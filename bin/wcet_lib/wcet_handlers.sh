@@ -19,6 +19,10 @@ z3_globals+=""
 smtopt_globals=""
 smtopt_globals+=""
 
+driver_globals=""
+driver_globals+=" --search linear"  # linear: model-improving, binary: bisection
+driver_globals+=" --steptimeout 10" # seconds per check, on expiration more cuts are activated
+
 optimathsat_globals=""
 optimathsat_globals+=" -optimization.dpll.print_partial_sol=True" # True: prints each search interval improvement
 optimathsat_globals+=" -optimization.dpll.search_strategy=0"      # 0: linear, 1: binary, 2: adaptive
@@ -30,7 +34,7 @@ optimathsat_globals+=" -optimization.dpll.search_strategy=0"      # 0: linear, 1
 # wcet_generic_handler:
 #   runs an omt solver over a given problem, and returns the parsed results
 #       ${1}        -- full path to smt2+blocks file (ext: `.gen`)
-#       ${2}        -- encoding type (0: default, 1: assert-soft, 2: difference-logic)
+#       ${2}        -- encoding type (0: default, 1: assert-soft, 2: difference-logic, 4: bit-vector, 5: partial-sums, 6: parametric)
 #       ${3}        -- if != 0 then cuts are disabled
 #       ${4}        -- omt solver identifier (e.g. 'z3', 'optimathsat')
 #       ${5}        -- full path to benchmark file under statistics folder
@@ -45,14 +49,38 @@ optimathsat_globals+=" -optimization.dpll.search_strategy=0"      # 0: linear, 1
 function wcet_generic_handler()
 {
     wcet_generic_handler=
+    local path_core= ; local log_suffix= ;
+
+    # solver outputs are compressed along with formulas, if COMPRESSION is set
+    wcet_compression_suffix
+    log_suffix="${wcet_compression_suffix}"
+
+    if (( 0 != PATH_CHECK )); then
+        wcet_path_check "${1}" "${4}" "${PATH_CHECK}" "${5}.pc.log${log_suffix}" "${7}" || \
+            { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "path check error" "${?}"; return "${?}"; };
+        if wcet_zcat "${5}.pc.log${log_suffix}" | grep -q "^# Path-check optimum:"; then
+            wcet_parse_output "${wcet_path_check}" "${5}.pc.log${log_suffix}" || \
+                { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "parsing error" "${?}"; return "${?}"; };
+            wcet_generic_handler="${wcet_parse_output}"
+            return 0;
+        fi
+        wcet_zcat "${5}.pc.log${log_suffix}" | grep -q "^unsat$" && path_core="${5}.pc.log${log_suffix}"
+    fi
 
-    wcet_gen_omt "${1}" "${2}" 0 "${3}" 0 0 "${7}" || \
+    wcet_gen_omt "${1}" "${2}" 0 "${3}" 0 0 "${7}" "${MAX_CUTS}" "${SIMPLIFY_GRAPH}" "${path_core}" \
+                 "${TOP_PATHS}" "${4}" "${TIMEOUT}" "${GUARD_CUTS}" "${REGION_JOBS}" || \
         { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "formula generation error" "${?}"; return "${?}"; };
+    if (( 0 != GUARD_CUTS )); then
+        wcet_update_guards "${wcet_gen_omt}" "$(( 0 == ${3} ))" || \
+            { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "formula guards update error" "${?}"; return "${?}"; };
+    fi
     wcet_update_timeout "${wcet_gen_omt}" "${TIMEOUT}" || \
         { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "formula timeout update error" "${?}"; return "${?}"; };
     wcet_update_seed "${wcet_gen_omt}" "${6}" || \
         { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "formula random seed update error" "${?}"; return "${?}"; };
-    wcet_run_omt_solver "${4}" "${TIMEOUT}" "${wcet_gen_omt}" "${5}.log" ${@:8} || \
+    wcet_update_statistics "${wcet_gen_omt}" "${PRINT_STATISTICS}" || \
+        { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "formula statistics update error" "${?}"; return "${?}"; };
+    wcet_run_omt_solver "${4}" "${TIMEOUT}" "${wcet_gen_omt}" "${5}.log${log_suffix}" ${@:8} || \
         { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "omt solver error at <${wcet_gen_omt}>" "${?}"; return "${?}"; };
     wcet_parse_output "${wcet_gen_omt}" "${wcet_run_omt_solver}" || \
         { error "${NAME_WCET_HANDLERS}" "${FUNCNAME[1]}" "$((LINENO - 1))" "parsing error" "${?}"; return "${?}"; };
@@ -613,6 +641,293 @@ function wcet_optimathsat_3_cuts_handler
 }
 
 
+###
+### Z3 + BIT-VECTOR ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_z3_4_handler
+{
+    wcet_z3_4_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    z3_locals=""
+    wcet_generic_handler "${1}" 4 1 "z3" "${2}" "${3}" "${4}" "${z3_globals}" "${z3_locals}" || return "${?}"
+
+    wcet_z3_4_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+# shellcheck disable=SC2034
+function wcet_z3_4_cuts_handler
+{
+    wcet_z3_4_cuts_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    z3_locals=""
+    wcet_generic_handler "${1}" 4 0 "z3" "${2}" "${3}" "${4}" "${z3_globals}" "${z3_locals}" || return "${?}"
+
+    wcet_z3_4_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### OPTIMATHSAT + BIT-VECTOR ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_optimathsat_4_handler
+{
+    wcet_optimathsat_4_handler= ;
+
+    optimathsat_locals=""
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        optimathsat_locals+=" -random_seed=${3}"
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+    wcet_generic_handler "${1}" 4 1 "optimathsat" "${2}" "${3}" "${4}" "${optimathsat_globals}" "${optimathsat_locals}" || return "${?}"
+
+    wcet_optimathsat_4_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+# shellcheck disable=SC2034
+function wcet_optimathsat_4_cuts_handler
+{
+    wcet_optimathsat_4_cuts_handler= ;
+
+    optimathsat_locals=""
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        optimathsat_locals+=" -random_seed=${3}"
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+    wcet_generic_handler "${1}" 4 0 "optimathsat" "${2}" "${3}" "${4}" "${optimathsat_globals}" "${optimathsat_locals}" || return "${?}"
+
+    wcet_optimathsat_4_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### Z3 + PARTIAL-SUMS ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_z3_5_cuts_handler
+{
+    wcet_z3_5_cuts_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    z3_locals=""
+    wcet_generic_handler "${1}" 5 0 "z3" "${2}" "${3}" "${4}" "${z3_globals}" "${z3_locals}" || return "${?}"
+
+    wcet_z3_5_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### OPTIMATHSAT + PARTIAL-SUMS ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_optimathsat_5_cuts_handler
+{
+    wcet_optimathsat_5_cuts_handler= ;
+
+    optimathsat_locals=""
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        optimathsat_locals+=" -random_seed=${3}"
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+    wcet_generic_handler "${1}" 5 0 "optimathsat" "${2}" "${3}" "${4}" "${optimathsat_globals}" "${optimathsat_locals}" || return "${?}"
+
+    wcet_optimathsat_5_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### Z3 + PARAMETRIC ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_z3_6_handler
+{
+    wcet_z3_6_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    z3_locals=""
+    wcet_generic_handler "${1}" 6 1 "z3" "${2}" "${3}" "${4}" "${z3_globals}" "${z3_locals}" || return "${?}"
+
+    wcet_z3_6_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+# shellcheck disable=SC2034
+function wcet_z3_6_cuts_handler
+{
+    wcet_z3_6_cuts_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    z3_locals=""
+    wcet_generic_handler "${1}" 6 0 "z3" "${2}" "${3}" "${4}" "${z3_globals}" "${z3_locals}" || return "${?}"
+
+    wcet_z3_6_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### OPTIMATHSAT + PARAMETRIC ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_optimathsat_6_handler
+{
+    wcet_optimathsat_6_handler= ;
+
+    optimathsat_locals=""
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        optimathsat_locals+=" -random_seed=${3}"
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+    wcet_generic_handler "${1}" 6 1 "optimathsat" "${2}" "${3}" "${4}" "${optimathsat_globals}" "${optimathsat_locals}" || return "${?}"
+
+    wcet_optimathsat_6_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+# shellcheck disable=SC2034
+function wcet_optimathsat_6_cuts_handler
+{
+    wcet_optimathsat_6_cuts_handler= ;
+
+    optimathsat_locals=""
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        optimathsat_locals+=" -random_seed=${3}"
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+    wcet_generic_handler "${1}" 6 0 "optimathsat" "${2}" "${3}" "${4}" "${optimathsat_globals}" "${optimathsat_locals}" || return "${?}"
+
+    wcet_optimathsat_6_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
+###
+### OMT DRIVER + DEFAULT ENCODING
+###
+
+
+# shellcheck disable=SC2034
+function wcet_driver_z3_0_cuts_handler
+{
+    wcet_driver_z3_0_cuts_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    driver_locals=""
+    wcet_generic_handler "${1}" 0 0 "driver_z3" "${2}" "${3}" "${4}" "${driver_globals}" "${driver_locals}" || return "${?}"
+
+    wcet_driver_z3_0_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+# shellcheck disable=SC2034
+function wcet_driver_optimathsat_0_cuts_handler
+{
+    wcet_driver_optimathsat_0_cuts_handler= ;
+
+    if (( "${3}" > 0 )); then
+        local out_file;
+
+        out_file="$(dirname "${2}")/seed_${3}_$(basename "${2}")"
+
+        set -- "${1}" "${out_file}" "${3}" "${4}"
+    fi
+
+    driver_locals=""
+    wcet_generic_handler "${1}" 0 0 "driver_optimathsat" "${2}" "${3}" "${4}" "${driver_globals}" "${driver_locals}" || return "${?}"
+
+    wcet_driver_optimathsat_0_cuts_handler="${wcet_generic_handler}"
+    return 0;
+}
+
+
 ###
 ### TESTING
 ###
@@ -11,13 +11,197 @@ VERBOSE_WARNINGS=$((0))
 VERBOSE_COMMANDS=$((0))
 VERBOSE_WORKFLOW=$((0))
 SKIP_EXISTING=$((0))
+PRINT_STATISTICS=$((0))
+MAX_CUTS=$((-1))
+SIMPLIFY_GRAPH=$((0))
+PATH_CHECK=$((0))
+TOP_PATHS=$((0))
+GUARD_CUTS=$((0))
+REGION_JOBS=$((0))
+SHARD_INDEX=$((0))
+SHARD_COUNT=$((0))
+RESUME=$((0))
+ESCALATION=$((0))
+BC_JOBS=$((1))
+MEM_BUDGET=$((0))
+COMPRESSION=
+JOURNAL_FILE=
+JOURNAL_KEY=
+JOURNAL_HASH=
+
+###
+### RESOURCE ACCOUNTING
+###
+
+# wcet_rusage:
+#   runs an external command through `/usr/bin/time`, which collects its
+#   resource usage with `wait4`, and appends it to an accounting file
+#       ${1}        -- full path to accounting file (ext: `.rusage`)
+#       ${2}        -- pipeline stage identifier (e.g. "pagai", "z3")
+#       ...         -- command to be executed, and its arguments
+#       return      -- the exit status of the command
+#
+function wcet_rusage ()
+{
+    /usr/bin/time -a -o "${1}" \
+        -f "# stage: ${2}\n# user-time: %U\n# sys-time: %S\n# max-rss: %M\n# fs-inputs: %I\n# fs-outputs: %O\n# exit-status: %x" \
+        "${@:3}"
+}
+
+# wcet_collect_rusage:
+#   aggregates the content of a number of accounting files, missing
+#   files are ignored
+#       ...         -- full path to accounting files (ext: `.rusage`)
+#       return ${wcet_collect_rusage}
+#                   -- space-separated list with, in order, the total
+#                      user time, the total system time, the peak
+#                      resident set size (KB), the stage with the
+#                      peak resident set size, the total number of
+#                      file system inputs and outputs, and the first
+#                      signal terminating a stage (0: none)
+#
+# shellcheck disable=SC2034
+function wcet_collect_rusage ()
+{
+    wcet_collect_rusage=
+    local files= ;
+
+    files=()
+    for file in "${@}";
+    do
+        [ -f "${file}" ] && [ -r "${file}" ] && files+=("${file}")
+    done
+
+    if (( 0 == ${#files[@]} )); then
+        wcet_collect_rusage="0.00 0.00 0 - 0 0 0"
+        return 0
+    fi
+
+    # NOTE: `/usr/bin/time` reports a stage killed by a signal with an explicit
+    # message, whereas `timeout` and the shell report it as `128 + signal`
+    wcet_collect_rusage="$(awk '
+        BEGIN                       { usr = 0; sys = 0; rss = 0; peak = "-"; fin = 0; fout = 0; sig = 0; cur_sig = 0 }
+        /terminated by signal/      { cur_sig = $NF }
+        /^# stage:/                 { stage = $3 }
+        /^# user-time:/             { usr += $3 }
+        /^# sys-time:/              { sys += $3 }
+        /^# max-rss:/               { if ($3 > rss) { rss = $3; peak = stage } }
+        /^# fs-inputs:/             { fin += $3 }
+        /^# fs-outputs:/            { fout += $3 }
+        /^# exit-status:/           { if (cur_sig == 0 && $3 > 128) { cur_sig = $3 - 128 }
+                                      if (sig == 0) { sig = cur_sig }
+                                      cur_sig = 0 }
+        END                         { printf "%.2f %.2f %d %s %d %d %d", usr, sys, rss, peak, fin, fout, sig }
+    ' "${files[@]}")"
+    return 0
+}
+
+###
+### COMPRESSED FILES
+###
+
+# wcet_compression_suffix:
+#   returns the suffix of the files compressed with the tool COMPRESSION
+#       return ${wcet_compression_suffix}
+#                   -- `.gz` (gzip), `.zst` (zstd), or empty (no compression)
+#
+# shellcheck disable=SC2034
+function wcet_compression_suffix ()
+{
+    case "${COMPRESSION}" in
+        gzip) wcet_compression_suffix=".gz"  ;;
+        zstd) wcet_compression_suffix=".zst" ;;
+        *)    wcet_compression_suffix=       ;;
+    esac
+}
+
+# wcet_strip_suffix:
+#   returns the name of a file without its compression suffix, if any
+#       ${1}        -- full path to a plain or compressed file
+#       return ${wcet_strip_suffix}
+#                   -- full path to the file, without `.gz` or `.zst`
+#
+# shellcheck disable=SC2034
+function wcet_strip_suffix ()
+{
+    wcet_strip_suffix="${1%.gz}"
+    wcet_strip_suffix="${wcet_strip_suffix%.zst}"
+}
+
+# wcet_zcat:
+#   prints the content of a plain or compressed file on stdout, the
+#   compression tool being given by the suffix of the file
+#       ${1}        -- full path to the file (ext: any, `.gz` or `.zst` if compressed)
+#
+function wcet_zcat ()
+{
+    case "${1}" in
+        *.gz)  gzip -d -c "${1}"    ;;
+        *.zst) zstd -q -d -c "${1}" ;;
+        *)     cat "${1}"           ;;
+    esac
+}
+
+# wcet_zwrite:
+#   writes stdin into a plain or compressed file, the compression tool
+#   being given by the suffix of the file
+#       ${1}        -- full path to the file (ext: any, `.gz` or `.zst` if compressed)
+#       [${2}]      -- if != 0, append to the file instead of overwriting it,
+#                      compressed data are appended as a new gzip member or
+#                      zstd frame, which are decompressed as a whole
+#
+function wcet_zwrite ()
+{
+    declare -a cmd ;
+
+    case "${1}" in
+        *.gz)  cmd=("gzip" "-c")        ;;
+        *.zst) cmd=("zstd" "-q" "-c")   ;;
+        *)     cmd=("cat")              ;;
+    esac
+
+    if [ -n "${2}" ] && (( 0 != ${2} )); then
+        "${cmd[@]}" >> "${1}"
+    else
+        "${cmd[@]}" > "${1}"
+    fi
+}
+
+# wcet_zsed:
+#   performs an inline edit of a plain or compressed file with sed, the
+#   compressed file is streamed through sed into a temporary file which
+#   then replaces it
+#       ${1}        -- full path to the file (ext: any, `.gz` or `.zst` if compressed)
+#       ...         -- sed script or options (e.g. `-e script`)
+#
+function wcet_zsed ()
+{
+    local tmp_file= ; declare -a ret ;
+
+    wcet_strip_suffix "${1}"
+    if [ "${wcet_strip_suffix}" = "${1}" ]; then
+        sed -i "${@:2}" "${1}"
+        return "${?}"
+    fi
+
+    tmp_file="${wcet_strip_suffix}.${$}${1#"${wcet_strip_suffix}"}"
+    wcet_zcat "${1}" | sed "${@:2}" | wcet_zwrite "${tmp_file}"
+    ret=("${PIPESTATUS[@]}")
+    if (( 0 != ret[0] || 0 != ret[1] || 0 != ret[2] )); then
+        rm -f "${tmp_file}"
+        return 1
+    fi
+    mv -f "${tmp_file}" "${1}"
+}
 
 ###
 ### FORMULAS GENERATION
 ###
 
 # wcet_gen_bytecode:
-#   generates bytecode from a C source code file
+#   generates bytecode from a C source code file, unless the bytecode is
+#   up-to-date w.r.t. the sources it has been generated from (ext: `.bc.sha1`);
+#   compiler warnings are saved next to the bytecode (ext: `.bc.log`)
 #       ...         -- full path to C file (ext: `.c`)
 #       return ${wcet_gen_bytecode}
 #                   -- full path to bytecode file (ext: `.bc`)
@@ -26,7 +210,7 @@ SKIP_EXISTING=$((0))
 function wcet_gen_bytecode()
 {
     wcet_gen_bytecode=
-    local dst_file=
+    local dst_file= ; local hash= ;
 
     for file in "${@}";
     do
@@ -42,21 +226,32 @@ function wcet_gen_bytecode()
 
     [[ "${dst_file}" =~ \.c$ ]] && dst_file="${dst_file:: -2}.bc" || dst_file="${dst_file}.bc"
 
-    if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+    hash="$(sha1sum "${@}" | sha1sum | cut -d\  -f 1)"
+
+    if [ -f "${dst_file}" ] && [ "${hash}" == "$(cat "${dst_file}.sha1" 2>/dev/null)" ]; then
+        log_cmd "# <${dst_file}> is up-to-date"
+    elif (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+
+        rm -f "${dst_file}.rusage" "${dst_file}.sha1"
 
         if (( 1 == "${#}" )); then
             log_cmd "clang -emit-llvm -c \"${@}\" -o \"${dst_file}\""
-            clang -emit-llvm -c "${@}" -o "${dst_file}" || \
-                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to generate bytecode" "${?}"; return "${?}"; };
+            wcet_rusage "${dst_file}.rusage" "clang" clang -emit-llvm -c "${@}" -o "${dst_file}" 2>"${dst_file}.log" || \
+                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to generate bytecode, see <${dst_file}.log>" "${?}"; return "${?}"; };
         else
             log_cmd "clang -emit-llvm -c \"${@}\""
-            clang -emit-llvm -c "${@}" || \
-                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to generate bytecode" "${?}"; return "${?}"; };
+            wcet_rusage "${dst_file}.rusage" "clang" clang -emit-llvm -c "${@}" 2>"${dst_file}.log" || \
+                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to generate bytecode, see <${dst_file}.log>" "${?}"; return "${?}"; };
 
-            llvm-link -o="${dst_file}" "${@/%.c/.bc}"
+            wcet_rusage "${dst_file}.rusage" "llvm-link" llvm-link -o="${dst_file}" "${@/%.c/.bc}"
 
             rm "${@/%.c/.bc}" 2>/dev/null
         fi
+
+        [ -s "${dst_file}.log" ] && \
+            warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "compiler warnings for <${dst_file}>, see <${dst_file}.log>"
+
+        echo "${hash}" > "${dst_file}.sha1"
     fi
 
     wcet_gen_bytecode="${dst_file}"
@@ -79,8 +274,9 @@ function wcet_bytecode_optimization()
     [[ "${1}" =~ \.bc$ ]] && dst_file="${1:: -3}.opt.ll" || dst_file="${1}.opt.ll"
 
     if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+        rm -f "${dst_file}.rusage"
         log_cmd "pagai -i \"${1}\" --dump-ll --wcet --loop-unroll -s z3_api > \"${dst_file}\""
-        pagai -i "${1}" --dump-ll --wcet --loop-unroll -s z3_api > "${dst_file}" || \
+        wcet_rusage "${dst_file}.rusage" "pagai" pagai -i "${1}" --dump-ll --wcet --loop-unroll -s z3_api > "${dst_file}" || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "pagai error" "${?}"; return "${?}"; };
 
         # pagai does not set error status
@@ -93,8 +289,9 @@ function wcet_bytecode_optimization()
     src_file="${dst_file}"
     dst_file="${dst_file::-3}.bc"
     if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+        rm -f "${dst_file}.rusage"
         log_cmd "llvm-as -o \"${dst_file}\" \"${src_file}\""
-        llvm-as -o "${dst_file}" "${src_file}" || \
+        wcet_rusage "${dst_file}.rusage" "llvm-as" llvm-as -o "${dst_file}" "${src_file}" || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "llvm-as error" "${?}"; return "${?}"; };
     fi
 
@@ -124,8 +321,8 @@ function wcet_unroll_loops()
         # -unroll-count=N
         # NOTE: -Oz is fundamental to reduce #blocks and #paths to a reasonable size
         log_cmd "opt -Oz -mem2reg -simplifycfg -loops -lcssa -loop-rotate -loop-unroll -debug -unroll-threshold=1000000000 \"${1}\" -o \"${dst_file}\" &>\"${err_file}\""
-
-        opt -Oz -mem2reg -simplifycfg -loops -lcssa -loop-rotate -loop-unroll -debug -unroll-threshold=1000000000 "${1}" -o "${dst_file}" &>"${err_file}" || \
+        rm -f "${dst_file}.rusage"
+        wcet_rusage "${dst_file}.rusage" "opt" opt -Oz -mem2reg -simplifycfg -loops -lcssa -loop-rotate -loop-unroll -debug -unroll-threshold=1000000000 "${1}" -o "${dst_file}" &>"${err_file}" || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "opt error, see <${err_file}>" "${?}"; return "${?}"; };
     fi
 
@@ -144,10 +341,12 @@ function wcet_unroll_loops()
 function wcet_gen_blocks()
 {
     wcet_gen_blocks=
-    local dst_file= ; local errmsg= ;
+    local dst_base= ; local dst_file= ; local errmsg= ; local ret= ;
 
     is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
-    [[ "${1}" =~ \.bc$ ]] && dst_file="${1:: -3}.gen" || dst_file="${1}.gen"
+    [[ "${1}" =~ \.bc$ ]] && dst_base="${1:: -3}" || dst_base="${1}"
+    wcet_compression_suffix
+    dst_file="${dst_base}.gen${wcet_compression_suffix}"
     (( ${#} == 2 )) && solver="${2}" || solver="z3";
 
     if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
@@ -156,14 +355,17 @@ function wcet_gen_blocks()
             warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 2))" "pagai segmentation fault with  <${1}>"; return 139;
         fi
 
+        rm -f "${dst_base}.gen.rusage"
         log_cmd "pagai -i \"${1}\" --wcet --printformula --skipnonlinear --loop-unroll -s z3_api > \"${dst_file}\""
-        pagai -i "${1}" --wcet --printformula --skipnonlinear --loop-unroll -s z3_api > "${dst_file}" || \
-            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "pagai error" "${?}"; return "${?}"; };
+        wcet_rusage "${dst_base}.gen.rusage" "pagai" pagai -i "${1}" --wcet --printformula --skipnonlinear --loop-unroll -s z3_api | wcet_zwrite "${dst_file}"
+        ret="${PIPESTATUS[0]}"
+        (( 0 == ret )) || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 3))" "pagai error" "${ret}"; return "${?}"; };
 
         # pagai does not set error status
-        errmsg="$(head -n 1 "${dst_file}" | grep "ERROR" | cut -d\  -f 2-)"
+        errmsg="$(wcet_zcat "${dst_file}" | head -n 1 | grep "ERROR" | cut -d\  -f 2-)"
         if [ -n "${errmsg}" ]; then
-            error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 6))" "${errmsg:: -1}"; return "${?}";
+            error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 8))" "${errmsg:: -1}"; return "${?}";
         fi
     fi
 
@@ -173,18 +375,50 @@ function wcet_gen_blocks()
 
 # wcet_gen_omt:
 #   generates OMT formula starting from the blocks file
-#       ${1}        -- full path to blocks file (ext: `.gen`)
+#       ${1}        -- full path to blocks file (ext: `.gen`, `.gen.gz` or `.gen.zst`)
 #       [${2}]      -- encoding type
 #                           0: default, [same as Henry:2014:CWE:2597809.2597817]
 #                           1: assert-soft based
 #                           2: difference-logic based
+#                           3: default, without later improvements
+#                           4: bit-vector based
+#                           5: partial-sums based
+#                           6: parametric, i.e. default with costs in a separate
+#                              cost block, which is rewritten in place when the
+#                              formula exists and `.edges.match` is newer
 #       [${3}]      -- timeout in seconds
 #       [${4}]      -- disable summaries if non-zero
 #       [${5}]      -- dump matchings to file if non-zero (ext: `.llvmtosmtmatch`)
 #       [${6}]      -- dump longest execution path to file if non-zero (ext: `.longestsyntactic`)
 #       [${7}]      -- use edges costs file `.edges.match`, 0: ignored
+#       [${8}]      -- cut selection, ignored if summaries are disabled
+#                          <0: disabled
+#                           0: drop redundant cuts, rank the remaining ones
+#                           N: as above, keep only the N top-ranked cuts
+#       [${9}]      -- simplify the source code graph if non-zero
+#       [${10}]     -- full path to the output of an unsat path check, whose
+#                      unsat assumptions are used to add a cut, ignored if
+#                      empty or if summaries are disabled
+#       [${11}]     -- number of longest syntactic paths checked for feasibility,
+#                      to bound the optimum value, 0: disabled
+#       [${12}]     -- smt solver used for such checks and for regions ("z3" or "optimathsat")
+#       [${13}]     -- seconds to timeout for each check or region, 0: disabled
+#       [${14}]     -- if non-zero, cuts are always generated and each one of
+#                      them is guarded by a boolean literal (ext: `.gcuts.smt2`),
+#                      so that the same formula can be run with or without cuts
+#                      (see wcet_update_guards)
+#       [${15}]     -- number of parallel solvers used to maximize the cost of
+#                      each single-entry/single-exit region, to bound the optimum
+#                      value, 0: disabled
 #       return ${wcet_gen_omt}
-#                   -- full path to OMT formula file (ext: `.smt2`)
+#                   -- full path to OMT formula file (ext: `.smt2`, compressed
+#                      if COMPRESSION is set, see wcet_compression_suffix)
+#
+#   loops are summarized with the iteration bounds listed in `.loops`, if any,
+#   or annotated in the code (see wcet_generator.py --loopbounds)
+#
+#   the generator fails as soon as it exceeds MEM_BUDGET MB, if non-zero,
+#   rather than being killed by the system (see wcet_generator.py --membudget)
 #
 # shellcheck disable=SC2034
 function wcet_gen_omt()
@@ -192,50 +426,143 @@ function wcet_gen_omt()
     wcet_gen_omt=
     local encoding=      ; local timeout=  ; local no_summaries= ; local print_matching= ;
     local print_maxpath= ; local dst_base= ; local dst_file=     ; declare -a options    ;
+    local max_cuts=      ; local simplify= ; local dst_tag=      ; local path_core=      ;
+    local top_paths=     ; local check_solver= ; local check_timeout= ; local guard_cuts= ;
+    local region_jobs=   ; local rusage_file= ;
 
     is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
-    [ -n "${2}" ] && (( 0 <= "${2}" )) && (( "${2}" <= 2 )) && encoding=$((${2})) || encoding=$((0))
+    [ -n "${2}" ] && (( 0 <= "${2}" )) && (( "${2}" <= 6 )) && encoding=$((${2})) || encoding=$((0))
     [ -n "${3}" ] && (( 0 <= "${3}" )) && timeout=$((${3})) || timeout=$((0))
-    [ -n "${4}" ] && no_summaries=$((${4}))   || no_summaries=$((0))
+    [ -n "${14}" ] && guard_cuts=$((${14}))   || guard_cuts=$((0))
+    [ -n "${15}" ] && region_jobs=$((${15}))  || region_jobs=$((0))
+    [ -n "${4}" ] && (( 0 == guard_cuts )) && no_summaries=$((${4})) || no_summaries=$((0))
     [ -n "${5}" ] && print_matching=$((${5})) || print_matching=$((0))
     [ -n "${6}" ] && print_maxpath=$((${6}))  || print_maxpath=$((0))
     [ -n "${7}" ] && use_edgecosts=$((${7}))  || use_edgecosts=$((0))
-    [[ "${1}" =~ \.gen$ ]] && dst_base="${1:: -4}" || dst_base="${1}"
-
-    if (( 0 != no_summaries )); then
-        dst_file="${dst_base}.${encoding}.smt2"
-    else
-        dst_file="${dst_base}.${encoding}.cuts.smt2"
+    [ -n "${8}" ] && max_cuts=$((${8}))       || max_cuts=$((-1))
+    [ -n "${9}" ] && simplify=$((${9}))       || simplify=$((0))
+    (( 0 == no_summaries )) && path_core="${10}"
+    [ -n "${11}" ] && top_paths=$((${11}))    || top_paths=$((0))
+    [[ "${12}" =~ ^(z3|optimathsat)$ ]] && check_solver="${12}" || check_solver="z3"
+    [ -n "${13}" ] && check_timeout=$((${13})) || check_timeout=$((0))
+    wcet_strip_suffix "${1}"
+    [[ "${wcet_strip_suffix}" =~ \.gen$ ]] && dst_base="${wcet_strip_suffix:: -4}" || dst_base="${wcet_strip_suffix}"
+
+    if (( 0 == no_summaries )); then
+        (( 0 != guard_cuts )) && dst_tag+=".gcuts" || dst_tag+=".cuts"
+        (( 0 <= max_cuts )) && dst_tag+=".k${max_cuts}"
+        [ -n "${path_core}" ] && dst_tag+=".core"
     fi
+    (( 0 != simplify )) && dst_tag+=".simp"
+    (( 0 < top_paths )) && dst_tag+=".top${top_paths}"
+    (( 0 < region_jobs )) && dst_tag+=".reg"
+    wcet_compression_suffix
+    dst_file="${dst_base}.${encoding}${dst_tag}.smt2${wcet_compression_suffix}"
+    rusage_file="${dst_base}.${encoding}${dst_tag}.smt2.rusage"
 
     if (( 0 != use_edgecosts )); then
         is_readable_file "${dst_base}.edges.match" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
     fi
 
+    if [ -n "${path_core}" ]; then
+        is_readable_file "${path_core}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+    fi
+
     options=("--encoding" "${encoding}")
     (( 0 != timeout ))        && options+=("--timeout" "${timeout}")
     (( 0 != no_summaries ))   && options+=("--nosummaries")
     (( 0 != print_matching )) && options+=("--smtmatching" "${dst_base}.llvmtosmtmatch")
     (( 0 != print_maxpath ))  && options+=("--printlongestsyntactic" "${dst_base}.longestsyntactic")
     (( 0 != use_edgecosts ))  && options+=("--matchingfile" "${dst_base}.edges.match")
+    [ -f "${dst_base}.loops" ] && options+=("--loopbounds" "${dst_base}.loops")
+    (( 0 < MEM_BUDGET ))      && options+=("--membudget" "${MEM_BUDGET}")
+    (( 0 == no_summaries )) && (( 0 <= max_cuts )) && options+=("--selectcuts" "--maxcuts" "${max_cuts}")
+    (( 0 != simplify ))       && options+=("--simplify")
+    [ -n "${path_core}" ]     && options+=("--pathcore" "${path_core}")
+    (( 0 < top_paths ))       && options+=("--toppaths" "${top_paths}")
+    (( 0 < region_jobs ))     && options+=("--regions" "${region_jobs}")
+    (( 0 < top_paths || 0 < region_jobs )) && options+=("--solver" "${check_solver}")
+    (( 0 < top_paths || 0 < region_jobs )) && (( 0 < check_timeout )) && options+=("--checktimeout" "${check_timeout}")
+    (( 0 != guard_cuts ))     && options+=("--guardcuts")
+    [ -n "${COMPRESSION}" ]   && options+=("--compress" "${COMPRESSION}")
 
     if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+        rm -f "${rusage_file}"
         log_cmd "wcet_generator.py ${options[*]} \"${1}\" > \"${dst_file}\""
-        wcet_generator.py "${options[@]}" "${1}" > "${dst_file}" || \
+        wcet_rusage "${rusage_file}" "generator" wcet_generator.py "${options[@]}" "${1}" > "${dst_file}" || \
         {
-            errmsg="$(grep ";; ERROR" "${dst_file}" | cut -d\  -f 3-)";
+            errmsg="$(wcet_zcat "${dst_file}" 2>/dev/null | grep ";; ERROR" | cut -d\  -f 3-)";
             if [ -n "${errmsg}" ]; then
                 error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 5))" "${errmsg:: -1}"; return "${?}";
             else
                 error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "wcet_generator.py error" "${?}"; return "${?}";
             fi
         };
+    elif (( 6 == encoding )) && (( 0 != use_edgecosts )) && [ "${dst_base}.edges.match" -nt "${dst_file}" ]; then
+        # new cost model, only the cost block is rewritten
+        log_cmd "wcet_generator.py ${options[*]} --updatecosts \"${dst_file}\" \"${1}\""
+        errmsg="$(wcet_rusage "${rusage_file}" "generator" wcet_generator.py "${options[@]}" --updatecosts "${dst_file}" "${1}")" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "wcet_generator.py error: ${errmsg}" "${?}"; return "${?}"; };
     fi
 
     wcet_gen_omt="${dst_file}"
     return 0;
 }
 
+# wcet_path_check:
+#   checks whether the longest syntactic path in the blocks file is feasible,
+#   by means of a plain satisfiability query over the boolean terms of its
+#   nodes and edges; if so, its cost is appended to the output file as the
+#   optimum value
+#       ${1}        -- full path to blocks file (ext: `.gen`, `.gen.gz` or `.gen.zst`)
+#       ${2}        -- smt solver to be used ("z3" or "optimathsat", else: "z3")
+#       ${3}        -- seconds to timeout, 0: disabled
+#       ${4}        -- full path to output file (ext: any)
+#       [${5}]      -- use edges costs file `.edges.match`, 0: ignored
+#       return ${wcet_path_check}
+#                   -- full path to path check formula (ext: `.pc.smt2`, compressed
+#                      if COMPRESSION is set)
+#
+# shellcheck disable=SC2034
+function wcet_path_check()
+{
+    wcet_path_check=
+    local solver= ; local use_edgecosts= ; local dst_base= ; local dst_file= ; declare -a options ;
+
+    is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+    [[ "${2}" =~ ^(z3|optimathsat)$ ]] && solver="${2}" || solver="z3"
+    [ -n "${5}" ] && use_edgecosts=$((${5}))  || use_edgecosts=$((0))
+    wcet_strip_suffix "${1}"
+    [[ "${wcet_strip_suffix}" =~ \.gen$ ]] && dst_base="${wcet_strip_suffix:: -4}" || dst_base="${wcet_strip_suffix}"
+    wcet_compression_suffix
+    dst_file="${dst_base}.pc.smt2${wcet_compression_suffix}"
+
+    options=("--pathcheck")
+    (( 0 != use_edgecosts ))  && options+=("--matchingfile" "${dst_base}.edges.match")
+    [ -f "${dst_base}.loops" ] && options+=("--loopbounds" "${dst_base}.loops")
+    (( 0 < MEM_BUDGET ))      && options+=("--membudget" "${MEM_BUDGET}")
+    [ -n "${COMPRESSION}" ]   && options+=("--compress" "${COMPRESSION}")
+
+    if (( 0 == SKIP_EXISTING )) || test ! \( -f "${dst_file}" -a -r "${dst_file}" \) ; then
+        rm -f "${dst_base}.pc.smt2.rusage"
+        log_cmd "wcet_generator.py ${options[*]} \"${1}\" > \"${dst_file}\""
+        wcet_rusage "${dst_base}.pc.smt2.rusage" "generator" wcet_generator.py "${options[@]}" "${1}" > "${dst_file}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "wcet_generator.py error" "${?}"; return "${?}"; };
+    fi
+
+    wcet_update_timeout "${dst_file}" "${3}" || return "${?}"
+    wcet_run_omt_solver "${solver}" "${3}" "${dst_file}" "${4}" || return "${?}"
+
+    if wcet_zcat "${4}" | grep -q "^sat$"; then
+        # unsat assumptions are not available for satisfiable queries
+        wcet_zsed "${4}" '/^(error .*assumptions/Id'
+        echo "# Path-check optimum: $(wcet_zcat "${dst_file}" | grep "LONGEST_PATH" | cut -d\  -f 4)" | wcet_zwrite "${4}" 1
+    fi
+
+    wcet_path_check="${dst_file}"
+    return 0;
+}
+
 # wcet_update_timeout:
 #   performs an inline update of the timeout value in an OMT formula
 #       ${1}        -- full path to the OMT formula (ext: `.smt2`)
@@ -248,16 +575,16 @@ function wcet_update_timeout ()
     [ -z "${2}" ] && set -- "${1}" "0"
 
     if (( 0 < ${2} )); then
-        if grep -q "set-option :timeout ${2}.0" "${1}"; then
+        if wcet_zcat "${1}" | grep -q "set-option :timeout ${2}.0"; then
             :   # avoid unecessary overwrite
-        elif grep -q "set-option :timeout" "${1}"; then
-            sed -i "s/[; ]*\((set-option :timeout\)  *\([0-9]*\.[0-9]*\)/\1 ${2}.0/" "${1}"
+        elif wcet_zcat "${1}" | grep -q "set-option :timeout"; then
+            wcet_zsed "${1}" "s/[; ]*\((set-option :timeout\)  *\([0-9]*\.[0-9]*\)/\1 ${2}.0/"
         else
-            sed -i "1s/^/(set-option :timeout ${2}.0)\n/" "${1}"
+            wcet_zsed "${1}" "1s/^/(set-option :timeout ${2}.0)\n/"
         fi
     else
-        if grep -q "set-option :timeout" "${1}"; then
-            sed -i 's/^ *\((set-option :timeout  *[0-9]*\.[0-9]*)\)//' "${1}"
+        if wcet_zcat "${1}" | grep -q "set-option :timeout"; then
+            wcet_zsed "${1}" 's/^ *\((set-option :timeout  *[0-9]*\.[0-9]*)\)//'
         else
             :   # avoid unecessary overwrite
         fi
@@ -278,16 +605,82 @@ function wcet_update_seed ()
     [ -z "${2}" ] && set -- "${1}" "0"
 
     if (( 0 < ${2} )); then
-        if grep -q "set-option :random-seed ${2}" "${1}"; then
+        if wcet_zcat "${1}" | grep -q "set-option :random-seed ${2}"; then
+            :   # avoid unecessary overwrite
+        elif wcet_zcat "${1}" | grep -q "set-option :random-seed"; then
+            wcet_zsed "${1}" "s/[; ]*\((set-option :random-seed\)  *\([0-9]*\)/\1 ${2}/"
+        else
+            wcet_zsed "${1}" "1s/^/(set-option :random-seed ${2})\n/"
+        fi
+    else
+        if wcet_zcat "${1}" | grep -q "set-option :random-seed"; then
+            wcet_zsed "${1}" 's/^ *\((set-option :random-seed  *[0-9]*)\)//'
+        else
+            :   # avoid unecessary overwrite
+        fi
+    fi
+    return 0;
+}
+
+# wcet_update_statistics:
+#   performs an inline update of the statistics request in an OMT formula
+#       ${1}        -- full path to the OMT formula (ext: `.smt2`)
+#       [${2}]      -- if != 0, the solver is asked to print all of its
+#                       statistics after the search, `0` or missing value
+#                       means comment out the request (if any)
+#
+function wcet_update_statistics ()
+{
+    is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+
+    [ -z "${2}" ] && set -- "${1}" "0"
+
+    if (( 0 != ${2} )); then
+        if wcet_zcat "${1}" | grep -q "^;(get-info :all-statistics)"; then
+            wcet_zsed "${1}" 's/^;\((get-info :all-statistics)\)/\1/'
+        elif wcet_zcat "${1}" | grep -q "^(get-info :all-statistics)"; then
             :   # avoid unecessary overwrite
-        elif grep -q "set-option :random-seed" "${1}"; then
-            sed -i "s/[; ]*\((set-option :random-seed\)  *\([0-9]*\)/\1 ${2}/" "${1}"
         else
-            sed -i "1s/^/(set-option :random-seed ${2})\n/" "${1}"
+            echo "(get-info :all-statistics)" | wcet_zwrite "${1}" 1
+        fi
+    else
+        if wcet_zcat "${1}" | grep -q "^(get-info :all-statistics)"; then
+            wcet_zsed "${1}" 's/^\((get-info :all-statistics)\)/;\1/'
+        else
+            :   # avoid unecessary overwrite
+        fi
+    fi
+    return 0;
+}
+
+# wcet_update_guards:
+#   performs an inline update of the guard assertions in an OMT formula
+#   generated with guarded cuts, enabling or disabling all of its cuts
+#       ${1}        -- full path to the OMT formula (ext: `.gcuts.smt2`)
+#       [${2}]      -- if != 0, every guard is asserted, `0` or missing value
+#                       means comment out every guard assertion, so that the
+#                       cuts have no effect
+#
+function wcet_update_guards ()
+{
+    local num_cuts= ;
+
+    is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+
+    [ -z "${2}" ] && set -- "${1}" "0"
+
+    if (( 0 != ${2} )); then
+        num_cuts="$(wcet_zcat "${1}" | grep "NB_GUARDED_CUTS" | cut -d\  -f 4)"
+        if wcet_zcat "${1}" | grep -q "^;(assert g_[0-9_]*)$"; then
+            wcet_zsed "${1}" -e 's/^;\((assert g_[0-9_]*)\)$/\1/' \
+                             -e "s/^; NB_CUTS = [0-9]*$/; NB_CUTS = ${num_cuts}/"
+        else
+            :   # avoid unecessary overwrite
         fi
     else
-        if grep -q "set-option :random-seed" "${1}"; then
-            sed -i 's/^ *\((set-option :random-seed  *[0-9]*)\)//' "${1}"
+        if wcet_zcat "${1}" | grep -q "^(assert g_[0-9_]*)$"; then
+            wcet_zsed "${1}" -e 's/^\((assert g_[0-9_]*)\)$/;\1/' \
+                             -e "s/^; NB_CUTS = [0-9]*$/; NB_CUTS = 0/"
         else
             :   # avoid unecessary overwrite
         fi
@@ -312,7 +705,7 @@ function wcet_update_seed ()
 function wcet_run_optimathsat ()
 {
     wcet_run_optimathsat=
-    local ret=
+    local ret= ; local rusage_file= ;
 
     is_readable_file "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
     is_directory "$(dirname "${3}")" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
@@ -320,12 +713,17 @@ function wcet_run_optimathsat ()
     if (( SKIP_EXISTING <= 1 )) || test ! \( -f "${3}" -a -r "${3}" \) ; then
         log_cmd "optimathsat ${*:4} < \"${2}\" &> \"${3}\""
 
-        timeout "${1}" /usr/bin/time -f "# real-time: %e" optimathsat "${@:4}" < "${2}" &> "${3}"
-        ret="${?}"
+        wcet_strip_suffix "${3}"
+        rusage_file="${wcet_strip_suffix%.*}.rusage"
+        rm -f "${rusage_file}"
+        wcet_zcat "${2}" | \
+            wcet_rusage "${rusage_file}" "optimathsat" \
+                timeout "${1}" /usr/bin/time -f "# real-time: %e" optimathsat "${@:4}" 2>&1 | wcet_zwrite "${3}"
+        ret="${PIPESTATUS[1]}"
 
         if (( ret != 0 )); then
             if (( ret == 124 )); then # timeout
-                echo -e "\ntimeout\n# real-time: ${1}.01" >> "${3}"
+                echo -e "\ntimeout\n# real-time: ${1}.01" | wcet_zwrite "${3}" 1
             else
                 { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 7))" "optimathsat error, see <${3}>" "${?}"; return "${?}"; };
             fi
@@ -349,7 +747,7 @@ function wcet_run_optimathsat ()
 function wcet_run_z3 ()
 {
     wcet_run_z3=
-    local ret=
+    local ret= ; local rusage_file= ;
 
     is_readable_file "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
     is_directory "$(dirname "${3}")" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
@@ -357,13 +755,17 @@ function wcet_run_z3 ()
     if (( SKIP_EXISTING <= 1 )) || test ! \( -f "${3}" -a -r "${3}" \) ; then
         log_cmd "z3 ${*:4} \"${2}\" &> \"${3}\""
 
-        sed 's/\((set-option :timeout [0-9][0-9]*\).0)/\1000.0)/;s/\((maximize .*\) \(:.* :.*)\)/\1)/' "${2}" | \
-            timeout "${1}" /usr/bin/time -f "# real-time: %e" z3 -in -smt2 "${@:4}" &> "${3}"
-        ret="${?}"
+        wcet_strip_suffix "${3}"
+        rusage_file="${wcet_strip_suffix%.*}.rusage"
+        rm -f "${rusage_file}"
+        wcet_zcat "${2}" | sed 's/\((set-option :timeout [0-9][0-9]*\).0)/\1000.0)/;s/\((maximize .*\) \(:.* :.*)\)/\1)/' | \
+            wcet_rusage "${rusage_file}" "z3" \
+                timeout "${1}" /usr/bin/time -f "# real-time: %e" z3 -in -smt2 "${@:4}" 2>&1 | wcet_zwrite "${3}"
+        ret="${PIPESTATUS[2]}"
 
         if (( ret != 0 )); then
             if (( ret == 124 )); then # timeout
-                echo -e "\ntimeout\n# real-time: ${1}.01" >> "${3}"
+                echo -e "\ntimeout\n# real-time: ${1}.01" | wcet_zwrite "${3}" 1
             else
                 { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 7))" "z3 error, see <${3}>" "${?}"; return "${?}"; };
             fi
@@ -387,29 +789,33 @@ function wcet_run_z3 ()
 function wcet_run_smtopt ()
 {
     wcet_run_smtopt=
-    local ret= ; local cost_var= ; local max= ;
+    local ret= ; local cost_var= ; local max= ; local rusage_file= ;
 
     is_readable_file "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
     is_directory "$(dirname "${3}")" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
     if (( SKIP_EXISTING <= 1 )) || test ! \( -f "${3}" -a -r "${3}" \) ; then
-        cost_var="$(grep maximize "${2}" | cut -d\  -f 2 | sed 's/)//')"
+        cost_var="$(wcet_zcat "${2}" | grep maximize | cut -d\  -f 2 | sed 's/)//')"
         [ -n "${cost_var}" ] || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 2))" "unable to parse cost variable"; return "${?}"; };
 
-        max="$(grep LONGEST_PATH "${2}" | cut -d\  -f 4)"
+        max="$(wcet_zcat "${2}" | grep LONGEST_PATH | cut -d\  -f 4)"
         [ -n "${max}" ] || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 2))" "unable to parse longest syntactic path"; return "${?}"; };
 
         log_cmd "smtopt - \"${cost_var}\" -v -M \"${max}\" ${*:4} \"${2}\" &> \"${3}\""
 
-        sed 's/\((set-option :timeout [0-9][0-9]*\).0)/\1000.0)/;s/(maximize .*)//' "${2}" | \
-            timeout "${1}" /usr/bin/time -f "\n# real-time: %e" smtopt - "${cost_var}" -v -M "${max}" "${@:4}" &> "${3}"
-        ret="${?}"
+        wcet_strip_suffix "${3}"
+        rusage_file="${wcet_strip_suffix%.*}.rusage"
+        rm -f "${rusage_file}"
+        wcet_zcat "${2}" | sed 's/\((set-option :timeout [0-9][0-9]*\).0)/\1000.0)/;s/(maximize .*)//;s/^(get-info :all-statistics)//' | \
+            wcet_rusage "${rusage_file}" "smtopt" \
+                timeout "${1}" /usr/bin/time -f "\n# real-time: %e" smtopt - "${cost_var}" -v -M "${max}" "${@:4}" 2>&1 | wcet_zwrite "${3}"
+        ret="${PIPESTATUS[2]}"
 
         if (( ret != 0 )); then
             if (( ret == 124 )); then # timeout
-                echo -e "\ntimeout\n# real-time: ${1}.01" >> "${3}"
+                echo -e "\ntimeout\n# real-time: ${1}.01" | wcet_zwrite "${3}" 1
             else
                 { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 7))" "smtopt error, see <${3}>" "${?}"; return "${?}"; };
             fi
@@ -420,9 +826,57 @@ function wcet_run_smtopt ()
     return 0;
 }
 
+# wcet_run_driver:
+#   runs the omt driver `wcet_omt_driver.py` over an OMT formula, on top
+#   of an smt solver
+#       ${1}        -- smt solver to be used ("z3" or "optimathsat")
+#       ${2}        -- seconds to timeout, 0: disabled
+#       ${3}        -- full path to OMT formula (ext: `.smt2`)
+#       ${4}        -- full path to output file (ext: any)
+#       [...]       -- driver options
+#   return ${wcet_run_driver}
+#                   -- full path to output file (= ${4})
+#
+# shellcheck disable=SC2034
+function wcet_run_driver ()
+{
+    wcet_run_driver=
+    local ret= ; local grace= ; local rusage_file= ;
+
+    is_readable_file "${3}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+    is_directory "$(dirname "${4}")" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+
+    # NOTE: the driver stops by itself at timeout, printing the best bounds found,
+    # `timeout` is only a safety net against unresponsive solvers
+    (( 0 < ${2} )) && grace=$((${2} + 10)) || grace=$((0))
+
+    if (( SKIP_EXISTING <= 1 )) || test ! \( -f "${4}" -a -r "${4}" \) ; then
+        log_cmd "wcet_omt_driver.py --solver \"${1}\" --timeout \"${2}\" ${*:5} \"${3}\" &> \"${4}\""
+
+        wcet_strip_suffix "${4}"
+        rusage_file="${wcet_strip_suffix%.*}.rusage"
+        rm -f "${rusage_file}"
+        wcet_rusage "${rusage_file}" "driver" \
+            timeout "${grace}" /usr/bin/time -f "# real-time: %e" wcet_omt_driver.py --solver "${1}" --timeout "${2}" "${@:5}" "${3}" 2>&1 | wcet_zwrite "${4}"
+        ret="${PIPESTATUS[0]}"
+
+        if (( ret != 0 )); then
+            if (( ret == 124 )); then # timeout
+                echo -e "\nunknown\n# real-time: ${2}.01" | wcet_zwrite "${4}" 1
+            else
+                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 7))" "wcet_omt_driver.py error, see <${4}>" "${?}"; return "${?}"; };
+            fi
+        fi
+    fi
+
+    wcet_run_driver="${4}"
+    return 0;
+}
+
 # wcet_run_omt_solver:
 #   runs an OMT solver over an OMT formula
-#       ${1}        -- omt solver to be used (e.g. "optimathsat", "z3")
+#       ${1}        -- omt solver to be used (e.g. "optimathsat", "z3",
+#                      "driver_z3" for wcet_omt_driver.py on top of z3)
 #       ${2}        -- seconds to timeout, 0: disabled
 #       ${3}        -- full path to OMT formula (ext: `.smt2`)
 #       ${4}        -- full path to output file (ext: any)
@@ -444,6 +898,9 @@ function wcet_run_omt_solver ()
     elif [[ "${1}" =~ ^smtopt$ ]]; then
         wcet_run_smtopt "${@:2}" || return "${?}"
         wcet_run_omt_solver="${wcet_run_smtopt}"
+    elif [[ "${1}" =~ ^driver_(z3|optimathsat)$ ]]; then
+        wcet_run_driver "${1#driver_}" "${@:2}" || return "${?}"
+        wcet_run_omt_solver="${wcet_run_driver}"
     else
         error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" "unknown smt2 solver <${1}>" && return "${?}"
     fi
@@ -464,7 +921,7 @@ function wcet_print_data()
 {
     eval "declare -A argArr=${1#*=}"
 
-    printf "| %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-64s | %-64s |\n" \
+    printf "| %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-64s | %-64s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s | %-12s |\n" \
         "${argArr["max_path"]}"   \
         "${argArr["opt_value"]}"  \
         "${argArr["gain"]}"       \
@@ -476,7 +933,15 @@ function wcet_print_data()
         "${argArr["llvm_size"]}"  \
         "${argArr["num_blocks"]}" \
         "${argArr["smt2_file"]}"  \
-        "${argArr["out_file"]}"
+        "${argArr["out_file"]}"   \
+        "${argArr["user_time"]}"  \
+        "${argArr["sys_time"]}"   \
+        "${argArr["max_rss"]}"    \
+        "${argArr["rss_stage"]}"  \
+        "${argArr["fs_inputs"]}"  \
+        "${argArr["fs_outputs"]}" \
+        "${argArr["signal"]}"     \
+        "${argArr["budget"]}"
 }
 
 # wcet_print_header:
@@ -497,6 +962,14 @@ function wcet_print_header()
     args["status"]="status"
     args["timeout"]="timeout"
     args["errors"]="# errors"
+    args["user_time"]="user (s.)"
+    args["sys_time"]="sys (s.)"
+    args["max_rss"]="max rss (KB)"
+    args["rss_stage"]="rss stage"
+    args["fs_inputs"]="fs inputs"
+    args["fs_outputs"]="fs outputs"
+    args["signal"]="signal"
+    args["budget"]="budget (s.)"
 
     wcet_print_data "$(declare -p args)"
 }
@@ -513,29 +986,37 @@ function wcet_parse_output ()
 {
     wcet_parse_output=
     local bc_file= ; local is_unknown=  ; local is_unsat= ; local is_sat= ;
-    local solver=  ; local has_timeout= ;
+    local solver=  ; local has_timeout= ; declare -a rusage_files ;
+    local smt2_base= ; local out_base= ;
+    local bv_value='s/(_ bv\([0-9]*\) [0-9]*)/\1/' ; # bit-vector values, i.e. `(_ bv28 8)` [encoding 4]
     declare -A args
 
     is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}" # smt2 formula
     is_readable_file "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}" # optimathsat/z3 output
 
-    bc_file="${1/\.[0-9]*\.smt2/}.bc"
-    [ -f "${bc_file}" ] && [ -r "${bc_file}" ] || bc_file="${1/\.[0-9]?(\.cuts)\.smt2/}"
+    # compressed files are parsed as they are decompressed, and the files
+    # stored next to them are named after their uncompressed name
+    wcet_strip_suffix "${1}" && smt2_base="${wcet_strip_suffix}"
+    wcet_strip_suffix "${2}" && out_base="${wcet_strip_suffix%.*}"
+
+    bc_file="${smt2_base/\.[0-9]*\.smt2/}.bc"
+    [ -f "${bc_file}" ] && [ -r "${bc_file}" ] || bc_file="${smt2_base/\.[0-9]?(\.cuts)\.smt2/}"
+    [ -f "${bc_file}" ] && [ -r "${bc_file}" ] || bc_file="${smt2_base%.pc.smt2}.bc"
     is_readable_file "${bc_file}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
     args["llvm_size"]="$(llvm-dis -o - "${bc_file}"          | wc -l)"
-    args["num_blocks"]="$(grep -c "declare-fun b_" "${1}" )"
-    args["num_cuts"]="$(grep "NB_CUTS" "${1}"      | cut -d\  -f 4)"
-    args["max_path"]="$(grep "LONGEST_PATH" "${1}" | cut -d\  -f 4)"
-    args["real_time"]="$(grep "real-time" "${2}"   | cut -d\  -f 3)"
+    args["num_blocks"]="$(wcet_zcat "${1}" | grep -c "declare-fun b_")"
+    args["num_cuts"]="$(wcet_zcat "${1}" | grep "NB_CUTS"      | cut -d\  -f 4)"
+    args["max_path"]="$(wcet_zcat "${1}" | grep "LONGEST_PATH" | cut -d\  -f 4)"
+    args["real_time"]="$(wcet_zcat "${2}" | grep "real-time"   | cut -d\  -f 3)"
     args["smt2_file"]="${1}"
     args["out_file"]="${2}"
 
     # status
 
-    is_unknown="$(grep -Eci -m 1 "^(timeout|unknown|# Timeout reached!)$" "${2}")"
-    is_unsat="$(grep -Eci -m 1 "(^unsat$|No solution was found)" "${2}")"
-    is_sat="$(grep -Eci -m 1 "(^sat$|The maximum value of)" "${2}")"
+    is_unknown="$(wcet_zcat "${2}" | grep -Eci -m 1 "^(timeout|unknown|# Timeout reached!)$")"
+    is_unsat="$(wcet_zcat "${2}" | grep -Eci -m 1 "(^unsat$|No solution was found)")"
+    is_sat="$(wcet_zcat "${2}" | grep -Eci -m 1 "(^sat$|The maximum value of)")"
     (( is_unknown )) && is_sat=$((0)) # optimathsat prints sat for partially optimized problems
 
     (( ( is_unknown + is_unsat + is_sat ) == 0 )) && \
@@ -549,46 +1030,113 @@ function wcet_parse_output ()
     (( is_sat ))     && args["status"]="sat"
 
     args["timeout"]=$((is_unknown))
+    args["budget"]=$((TIMEOUT))
 
     # opt value + solver
 
     if (( (is_unknown + is_unsat) >= 1 )) ; then
         args["opt_value"]="${args["max_path"]}"
     else
-        if grep -q "# Optimum:" "${2}"; then
-            args["opt_value"]="$(grep "Optimum" "${2}"           | cut -d\  -f 3)"
+        if wcet_zcat "${2}" | grep -q "# Path-check optimum:"; then
+            args["opt_value"]="$(wcet_zcat "${2}" | grep "Path-check optimum" | cut -d\  -f 4)"
+            solver="pathcheck"
+        elif wcet_zcat "${2}" | grep -q "# Driver optimum:"; then
+            args["opt_value"]="$(wcet_zcat "${2}" | grep "Driver optimum"     | cut -d\  -f 4)"
+            solver="driver"
+        elif wcet_zcat "${2}" | grep -q "# Optimum:"; then
+            args["opt_value"]="$(wcet_zcat "${2}" | grep "Optimum"           | sed "${bv_value}" | cut -d\  -f 3)"
             solver="optimathsat"
-        elif grep -q "(objectives" "${2}"; then
-            args["opt_value"]="$(grep "objectives" -A 1 "${2}"   | tail -n 1 | cut -d\  -f 3 | sed 's/)//')"
+        elif wcet_zcat "${2}" | grep -q "(objectives"; then
+            args["opt_value"]="$(wcet_zcat "${2}" | grep "objectives" -A 1   | tail -n 1 | sed "${bv_value}" | cut -d\  -f 3 | sed 's/)//')"
             solver="z3"
-        elif grep -q "maximum value of " "${2}"; then
-            args["opt_value"]="$(grep "maximum value of " "${2}" | cut -d\  -f 7)"
+        elif wcet_zcat "${2}" | grep -q "maximum value of "; then
+            args["opt_value"]="$(wcet_zcat "${2}" | grep "maximum value of " | cut -d\  -f 7)"
             solver="smtopt"
         else
             error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" "nothing to parse" && return "${?}"
         fi
     fi
 
+    # bit-vector values, i.e. `#x1c` or `#b11100` [encoding 4]
+    if [[ "${args["opt_value"]}" =~ ^#x([0-9a-fA-F]+)$ ]]; then
+        args["opt_value"]=$((16#${BASH_REMATCH[1]}))
+    elif [[ "${args["opt_value"]}" =~ ^#b([01]+)$ ]]; then
+        args["opt_value"]=$((2#${BASH_REMATCH[1]}))
+    fi
+
     # error
 
-    num_errors="$(awk '{ s=tolower($0) } s~/error/ && s!~/# error/ { count++ } END { print count }' "${2}")"
+    num_errors="$(wcet_zcat "${2}" | awk '{ s=tolower($0) } s~/error/ && s!~/# error/ { count++ } END { print count }')"
     args["errors"]=$((num_errors))
 
     args["gain"]=$(awk -v MAX="${args["max_path"]}" -v OPT="${args["opt_value"]}" \
         "BEGIN {printf \"%.2f\", ((MAX - OPT) * 100 / MAX)}")
 
+    # resource usage of each pipeline stage
+
+    rusage_files=("${bc_file%.unr.bc}")
+    [[ "${bc_file}" =~ \.unr\.bc$ ]] && rusage_files=("${rusage_files[0]}.bc.rusage" "${bc_file}.rusage") \
+                                      || rusage_files=("${bc_file}.rusage")
+    rusage_files+=("${bc_file%.bc}.gen.rusage" "${smt2_base}.rusage" "${out_base}.rusage")
+
+    wcet_collect_rusage "${rusage_files[@]}"
+    read -r args["user_time"] args["sys_time"] args["max_rss"] args["rss_stage"] \
+            args["fs_inputs"] args["fs_outputs"] args["signal"] <<< "${wcet_collect_rusage}"
+
+    # statistics
+
+    if (( 0 != PRINT_STATISTICS )); then
+        wcet_collect_statistics "${2}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to collect statistics, see <${2}>" "${?}"; return "${?}"; };
+    fi
+
     wcet_parse_output="$(wcet_print_data "$(declare -p args)")"
     return 0
 }
 
+# wcet_collect_statistics:
+#   parses the statistics printed by an OMT solver into normalized
+#   `key value` pairs, stored next to the solver's output file
+#       ${1}        -- full path to output data (ext: any)
+#       return ${wcet_collect_statistics}
+#                   -- full path to statistics file (ext: `.stats`)
+#
+# shellcheck disable=SC2034
+function wcet_collect_statistics ()
+{
+    wcet_collect_statistics=
+    local dst_file= ;
+
+    is_readable_file "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+    wcet_strip_suffix "${1}"
+    dst_file="${wcet_strip_suffix%.*}.stats"
+
+    log_cmd "solver_stats.py \"${1}\" > \"${dst_file}\""
+    solver_stats.py "${1}" > "${dst_file}" || \
+        { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "solver_stats.py error" "${?}"; return "${?}"; };
+
+    wcet_collect_statistics="${dst_file}"
+    return 0
+}
+
 ###
 ###
 ###
 
 # wcet_run_experiment:
-#   recursively explores a benchmark directory looking for `.c` and `.bc`
-#   files, applying to each file a function `wcet_{*}_handler` and storing
-#   the result within a similar folder structure in the target directory
+#   runs every job listed in the manifest of each handler (see
+#   `wcet_write_manifest`), applying to each `.bc` file a function
+#   `wcet_{*}_handler` and storing the result within a similar folder
+#   structure in the target directory; if SHARD_COUNT != 0, only the jobs
+#   of shard SHARD_INDEX are run, over manifests written beforehand,
+#   and the results are stored in per-shard summary files.
+#   Each completed job is recorded in an append-only journal along with
+#   the hash of its inputs, and the summary files are rebuilt from the
+#   journal; if RESUME != 0, jobs already completed with the same inputs
+#   are skipped.
+#   If 0 < ESCALATION < TIMEOUT, jobs are first run with a timeout of
+#   ESCALATION seconds, and those with an unknown result are run again
+#   with a timeout doubled at each round, up to TIMEOUT
 #       ${1}        -- full path to the benchmark directory
 #       ${2}        -- full path to the statistics directory
 #       ${3}        -- if != 0, then attempt unroll of all formulas
@@ -598,86 +1146,478 @@ function wcet_parse_output ()
 #       [...]       -- keywords `{*}`, where `{*}` is the id
 #                      of a handler with name `wcet_{*}_handler`
 #
+# shellcheck disable=SC2154
 function wcet_run_experiment ()
 {
-    local file_name= ; local file_ext= ;
+    local dest_dir= ; local shard_done= ; local stats_file= ; local journal= ;
+    local config= ; local pending= ; local edges_path= ; local row= ; local status= ;
+    local budget= ; local timeout=$((TIMEOUT)) ; local skip_existing=$((SKIP_EXISTING)) ;
+    local files= ; local num_pending= ; local round= ;
+    local -A pending_seeds ; local -A edges_files ; local -A job_hashes
 
     is_directory "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
     is_directory "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
     set -- "$(realpath "${1}")" "$(realpath "${2}")" "${@:3}"
 
+    if (( 0 == SHARD_COUNT )); then
+        wcet_write_manifest "${@}" || return "${?}"
+    fi
+
     for test_conf in "${@:6}"
     do
-        find "${2}/${test_conf}" -name "*.txt" -type f -delete &>/dev/null
+        dest_dir="${2}/${test_conf}"
+        shard_done="${dest_dir}/.${test_conf}.${SHARD_INDEX}-of-${SHARD_COUNT}.done"
+        wcet_get_stats_file "${dest_dir}"
+        stats_file="${wcet_get_stats_file}"
+        journal="${stats_file%.*}.journal"
+
+        wcet_check_manifest "${@:1:5}" "${test_conf}" || return "${?}"
+
+        rm -f "${shard_done}" "${stats_file}"
+        (( 0 != SHARD_COUNT )) || wcet_print_header > "${stats_file}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${stats_file}> can not be created or overwritten" "${?}"; return "${?}"; };
+
+        # at first, every seed of every benchmark (of this shard) is pending
+        files=() ; pending_seeds=() ; edges_files=() ; job_hashes=() ; num_pending=$((0))
+        while IFS=$'\t' read -r job _ seed_idx _ file edges_file
+        do
+            [[ "${job}" =~ ^# ]] && continue;
+
+            if (( seed_idx <= 1 )); then
+                if (( 0 != SHARD_COUNT )); then
+                    wcet_get_shard "${file}" "${SHARD_COUNT}"
+                    (( wcet_get_shard == SHARD_INDEX )) || continue;
+                fi
+                files+=("${file}")
+                edges_files["${file}"]="${edges_file}"
+            fi
+            [ -n "${edges_files["${file}"]}" ] || continue;
+            pending_seeds["${file}"]+=" ${seed_idx}"
+            num_pending=$((num_pending + 1))
+        done < "${wcet_check_manifest}"
+
+        # with escalation, jobs are first run with a short timeout, then those left
+        # unsolved are run again with a geometrically increasing timeout
+        budget=$((timeout))
+        (( ESCALATION > 0 && ESCALATION < timeout )) && budget=$((ESCALATION))
+        round=$((1))
+
+        while (( num_pending > 0 ))
+        do
+            TIMEOUT=$((budget))
+            # later rounds reuse the files generated by the first one
+            (( round > 1 )) && SKIP_EXISTING=$((1))
+            (( budget < timeout )) && \
+                log "${test_conf} -- round ${round}, ${num_pending} jobs with a timeout of ${budget} s."
+
+            # any option affecting the results of a job
+            config="${test_conf} unroll=${3} edges=${5} timeout=${TIMEOUT} stats=${PRINT_STATISTICS}"
+            config+=" cuts=${MAX_CUTS} simplify=${SIMPLIFY_GRAPH} path_check=${PATH_CHECK}"
+            config+=" top_paths=${TOP_PATHS} guard_cuts=${GUARD_CUTS} regions=${REGION_JOBS}"
+            config+=" compression=${COMPRESSION:-none}"
+
+            wcet_load_journal "${journal}"
+
+            for file in "${files[@]}"
+            do
+                [ -n "${pending_seeds["${file}"]}" ] || continue;
+
+                [ "${edges_files["${file}"]}" = "-" ] && edges_path="-" || edges_path="${1}/${edges_files["${file}"]}"
+                wcet_get_input_hash "${1}/${file}" "${edges_path}" "${config}"
+
+                # seeds of a benchmark share the same generated files, hence
+                # these are all run at once by `wcet_handle_file`
+                pending=()
+                for i in ${pending_seeds["${file}"]};
+                do
+                    job_hashes["${file}"$'\t'"${i}"]="${wcet_get_input_hash}"
+                    if (( 0 != RESUME )) && \
+                        [ -n "${wcet_load_journal["${file}"$'\t'"${i}"$'\t'"${wcet_get_input_hash}"]}" ]; then
+                        continue;
+                    fi
+                    pending+=("${i}")
+                done
+                if (( ${#pending[@]} == 0 )); then
+                    log "$(basename "${dest_dir}")($(basename "${file%.*}")) -- skipped, already in journal"
+                    continue;
+                fi
+
+                JOURNAL_FILE="${journal}"
+                JOURNAL_KEY="${file}"
+                JOURNAL_HASH="${wcet_get_input_hash}"
+
+                wcet_replicate_dirtree "${1}" "${dest_dir}" "${1}/${file}" || \
+                    { TIMEOUT=$((timeout)); SKIP_EXISTING=$((skip_existing)); return 1; };
+
+                wcet_handle_file "${dest_dir}" "${1}/${file}" "${wcet_replicate_dirtree}" "${3}" "${4}" "${5}" "${pending[*]}"
+            done
+
+            JOURNAL_FILE= ; JOURNAL_KEY= ; JOURNAL_HASH= ;
+
+            # only the jobs left unknown within a shorter timeout are run again
+            wcet_load_journal "${journal}"
+            num_pending=$((0))
+            for file in "${files[@]}"
+            do
+                pending=()
+                if (( budget < timeout )); then
+                    for i in ${pending_seeds["${file}"]};
+                    do
+                        row="${wcet_load_journal["${file}"$'\t'"${i}"$'\t'"${job_hashes["${file}"$'\t'"${i}"]}"]}"
+                        status="$(echo "${row}" | cut -d\| -f 7 | sed 's/ //g')"
+                        [ "${status}" = "unknown" ] && pending+=("${i}")
+                    done
+                fi
+                pending_seeds["${file}"]="${pending[*]}"
+                num_pending=$((num_pending + ${#pending[@]}))
+            done
+
+            budget=$((budget * 2))
+            (( budget < timeout )) || budget=$((timeout))
+            round=$((round + 1))
+        done
+
+        TIMEOUT=$((timeout))
+        SKIP_EXISTING=$((skip_existing))
+
+        # rebuild the summary file in manifest order
+        wcet_load_journal "${journal}"
+        {
+            (( 0 != SHARD_COUNT )) || wcet_print_header
+            while IFS=$'\t' read -r job _ seed_idx _ file _
+            do
+                [[ "${job}" =~ ^# ]] && continue;
+                [ -n "${job_hashes["${file}"$'\t'"${seed_idx}"]}" ] || continue;
+
+                row="${wcet_load_journal["${file}"$'\t'"${seed_idx}"$'\t'"${job_hashes["${file}"$'\t'"${seed_idx}"]}"]}"
+                [ -n "${row}" ] || continue;
+                if (( 0 != SHARD_COUNT )); then
+                    printf "%d\t%s\n" "${job}" "${row}"
+                else
+                    echo "${row}"
+                fi
+            done < "${wcet_check_manifest}"
+        } > "${stats_file}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${stats_file}> can not be created or overwritten" "${?}"; return "${?}"; };
+
+        if (( 0 != SHARD_COUNT )); then
+            touch "${shard_done}"
+        fi
     done
 
-    while read -r file
+    return 0
+}
+
+# wcet_get_input_hash:
+#   computes the hash of the inputs of a job
+#       ${1}        -- full path to the benchmark file
+#       ${2}        -- full path to the edge costs file, `-`: none
+#       ${3}        -- configuration of the job
+#       return ${wcet_get_input_hash}
+#                   -- sha1 digest of the inputs
+#
+# shellcheck disable=SC2034
+function wcet_get_input_hash ()
+{
+    wcet_get_input_hash="$( { echo "${3}"; cat "${1}"; [ "${2}" = "-" ] || cat "${2}"; } | sha1sum | cut -d\  -f 1)"
+}
+
+# wcet_load_journal:
+#   loads the result rows of the jobs completed according to a journal,
+#   in which each line is made of the tab-separated status (`ok` or
+#   `failed`), bytecode, seed index, input hash and result row of a job
+#       ${1}        -- full path to the journal (ext: `.journal`)
+#       return ${wcet_load_journal}
+#                   -- associative array mapping each key `bytecode<TAB>seed
+#                      index<TAB>input hash` to the last result row with
+#                      status `ok`
+#
+# shellcheck disable=SC2034
+function wcet_load_journal ()
+{
+    declare -gA wcet_load_journal
+    wcet_load_journal=()
+
+    [ -f "${1}" ] || return 0
+
+    while IFS=$'\t' read -r status file seed_idx hash row
     do
-        file_name="${file%.*}"
-        file_ext="${file##*.}"
+        [ "${status}" = "ok" ] || continue;
+        wcet_load_journal["${file}"$'\t'"${seed_idx}"$'\t'"${hash}"]="${row}"
+    done < "${1}"
+
+    return 0
+}
+
+# wcet_journal_append:
+#   records the outcome of a job in the journal of the benchmark being
+#   run, if any (see JOURNAL_FILE, JOURNAL_KEY and JOURNAL_HASH)
+#       ${1}        -- status, `ok` or `failed`
+#       ${2}        -- seed index, 0: no seed
+#       ${3}        -- result row
+#
+function wcet_journal_append ()
+{
+    [ -n "${JOURNAL_FILE}" ] || return 0
+
+    printf "%s\t%s\t%d\t%s\t%s\n" "${1}" "${JOURNAL_KEY}" "${2}" "${JOURNAL_HASH}" "${3}" >> "${JOURNAL_FILE}" || \
+        { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${JOURNAL_FILE}> can not be written" "${?}"; return "${?}"; };
+    return 0
+}
+
+# wcet_write_manifest:
+#   recursively explores a benchmark directory looking for `.bc` files,
+#   and lists in canonical order every job of each handler, that is each
+#   triplet (bytecode, handler, seed), along with its inputs
+#       ${1}        -- full path to the benchmark directory
+#       ${2}        -- full path to the statistics directory
+#       ${3}        -- if != 0, then attempt unroll of all formulas
+#       ${4}        -- if != 0, run benchmark up to ${4} times using
+#                       a list of predefined random seeds
+#       ${5}        -- if != 0, use `edges.match` file information
+#       [...]       -- keywords `{*}`, where `{*}` is the id
+#                      of a handler with name `wcet_{*}_handler`
+#
+#   the manifest of each handler is `${2}/{*}/{*}.manifest`, with one
+#   tab-separated line per job: job number, handler, seed index, seed,
+#   bytecode and edge costs file (`-`: none), paths are relative to ${1}
+#
+function wcet_write_manifest ()
+{
+    local manifest= ; local job= ; local edges_file= ; local files= ;
+
+    is_directory "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+    is_directory "${2}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
+    set -- "$(realpath "${1}")" "$(realpath "${2}")" "${@:3}"
+
+    files=()
+    while read -r file
+    do
         [[ "${file}" =~ /\.ignore/ ]] && continue;
 
         # skip generated `.opt.bc` and `.unr.bc` files
         [[ "${file}" =~ \.opt\.bc$ ]] && continue;
         [[ "${file}" =~ \.unr\.bc$ ]] && continue;
 
-        for test_conf in "${@:6}"
-        do
-            local dest_dir= ;
-            dest_dir="${2}/${test_conf}"
+        files+=("${file#"${1}/"}")
+    done < <(find "${1}" -name "*.bc" | LC_ALL=C sort)
+
+    for test_conf in "${@:6}"
+    do
+        manifest="${2}/${test_conf}/${test_conf}.manifest"
+        mkdir -p "${2}/${test_conf}" 2>/dev/null || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to create directory <${2}/${test_conf}>" "${?}"; return "${?}"; };
+
+        job=$((0))
+        {
+            echo "# bench: ${1}"
+            echo "# options: unroll=${3} seeds=${4} edges=${5}"
+            for file in "${files[@]}"
+            do
+                edges_file="-"
+                if (( ${5} )) && [ -f "${1}/${file%.*}.edges.match" ]; then
+                    edges_file="${file%.*}.edges.match"
+                fi
+
+                if (( "${4}" > 0 )); then
+                    for (( i = 1; i <= "${4}"; i++ ));
+                    do
+                        wcet_get_random_seed "${i}"
+                        job=$((job + 1))
+                        printf "%d\t%s\t%d\t%s\t%s\t%s\n" "${job}" "${test_conf}" "${i}" "${wcet_get_random_seed}" "${file}" "${edges_file}"
+                    done
+                else
+                    job=$((job + 1))
+                    printf "%d\t%s\t%d\t%s\t%s\t%s\n" "${job}" "${test_conf}" 0 0 "${file}" "${edges_file}"
+                fi
+            done
+        } > "${manifest}.${$}" && mv -f "${manifest}.${$}" "${manifest}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${manifest}> can not be created or overwritten" "${?}"; return "${?}"; };
+    done
+
+    return 0
+}
+
+# wcet_check_manifest:
+#   checks that the manifest of a handler exists and that it has been
+#   written for the same benchmark directory and options
+#       ${1}        -- full path to the benchmark directory
+#       ${2}        -- full path to the statistics directory
+#       ${3}        -- if != 0, then attempt unroll of all formulas
+#       ${4}        -- if != 0, run benchmark up to ${4} times using
+#                       a list of predefined random seeds
+#       ${5}        -- if != 0, use `edges.match` file information
+#       ${6}        -- handler id
+#       return ${wcet_check_manifest}
+#                   -- full path to the manifest
+#
+# shellcheck disable=SC2034
+function wcet_check_manifest ()
+{
+    wcet_check_manifest= ;
+
+    local manifest= ;
+    manifest="${2}/${6}/${6}.manifest"
+
+    is_readable_file "${manifest}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
+
+    grep -qxF "# bench: ${1}" "${manifest}" && \
+        grep -qxF "# options: unroll=${3} seeds=${4} edges=${5}" "${manifest}" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 2))" "<${manifest}> was written for other benchmarks or options" "${?}"; return "${?}"; };
+
+    wcet_check_manifest="${manifest}"
+    return 0
+}
+
+# wcet_get_shard:
+#   maps a job key onto a shard, the mapping only depends on the key
+#   and on the number of shards
+#       ${1}        -- job key (e.g. bytecode path relative to the benchmark directory)
+#       ${2}        -- number of shards
+#       return ${wcet_get_shard}
+#                   -- shard index, within [0, ${2})
+#
+# shellcheck disable=SC2034
+function wcet_get_shard ()
+{
+    local crc= ;
+    crc="$(printf "%s" "${1}" | cksum | cut -d\  -f 1)"
+    wcet_get_shard=$((crc % ${2}))
+}
+
+# wcet_merge_shards:
+#   merges the per-shard summary files of each handler into its usual
+#   summary file, with rows in manifest order
+#       ${1}        -- full path to the statistics directory
+#       ${2}        -- number of shards
+#       [...]       -- keywords `{*}`, where `{*}` is the id
+#                      of a handler with name `wcet_{*}_handler`
+#
+function wcet_merge_shards ()
+{
+    local dest_dir= ; local shard_files= ;
+
+    is_directory "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
-            wcet_replicate_dirtree "${1}" "${dest_dir}" "${file}" || return "${?}"
+    for test_conf in "${@:3}"
+    do
+        dest_dir="${1}/${test_conf}"
 
-            wcet_handle_file "${dest_dir}" "${file}" "${wcet_replicate_dirtree}" "${3}" "${4}" "${5}"
+        shard_files=()
+        for (( i = 0; i < "${2}"; i++ ));
+        do
+            [ -f "${dest_dir}/.${test_conf}.${i}-of-${2}.done" ] || \
+                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "shard ${i}/${2} of <${test_conf}> has not completed" "${?}"; return "${?}"; };
+            [ -f "${dest_dir}/${test_conf}.${i}-of-${2}.shard" ] && \
+                shard_files+=("${dest_dir}/${test_conf}.${i}-of-${2}.shard")
         done
-    done < <(find "${1}" -name "*.bc" )
+
+        {
+            wcet_print_header
+            # jobs are numbered in manifest order, rows of a job are already in
+            # order within the file of its shard
+            if (( ${#shard_files[@]} > 0 )); then
+                cat "${shard_files[@]}" | sort -s -n -t$'\t' -k 1,1 | cut -f 2-
+            fi
+        } > "${dest_dir}/${test_conf}.txt" || \
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${dest_dir}/${test_conf}.txt> can not be created or overwritten" "${?}"; return "${?}"; };
+
+        log "${test_conf} -- merged ${#shard_files[@]} out of ${2} shards"
+    done
+
+    return 0
 }
 
 # wcet_generate_bc:
 #   recursively explores a benchmark directory looking for `.c` files,
-#   and generates corresponding bytecode files.
+#   and generates corresponding bytecode files, with up to BC_JOBS
+#   compilation units (i.e. files, or directories if ${2} != 0) being
+#   compiled in parallel; the output of each unit is printed as soon as
+#   the unit and all the preceding ones are done, in exploration order
 #       ${1}        -- full path to the benchmark directory
 #       ${2}        -- if != 0, then compile together all `.c` in a directory
 #
 function wcet_generate_bc ()
 {
-    local file_name= ; local file_ext= ;
+    local log_dir= ; local num_jobs= ; local status= ;
+    declare -a units ; declare -a pids ; declare -a sources ;
 
     is_directory "${1}" "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "${LINENO}" || return "${?}"
 
     set -- "$(realpath "${1}")" "${@:2}"
+    (( 0 < BC_JOBS )) && num_jobs=$((BC_JOBS)) || num_jobs=$((1))
 
+    # collect compilation units, each one a tab-separated list of `.c` files
+    units=()
     while read -r dir_path
     do
         [[ "${dir_path}" =~ /\.ignore/ ]] && continue;
 
         if (( ${2} )); then
             # all `.c` files are considered part of one executable
-            pushd "${dir_path}"
-
-            sources=($(find "${dir_path}" -maxdepth 1 -name "*.c"))
-
-            (( ${#sources[@]} <= 0 )) || \
-                wcet_gen_bytecode "${sources[@]}" || \
-                    { warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "failed to generate bytecode in directory <${dir_path}>"; continue; };
-
-            popd
+            units+=("$(find "${dir_path}" -maxdepth 1 -name "*.c" | LC_ALL=C sort | paste -s -d $'\t')")
+            [ -n "${units[-1]}" ] || unset 'units[-1]'
         else
             # each `.c` file is considered a separate source code
             while read -r file
             do
-                wcet_gen_bytecode "${file}" || \
-                    { warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "failed to generate bytecode for <${file}>" "${?}"; continue; };
-
-            done < <( find "${dir_path}" -name "*.c" )
+                units+=("${file}")
+            done < <( find "${dir_path}" -maxdepth 1 -name "*.c" )
         fi
 
     done < <( find "${1}" -type d )
+
+    log_dir="$(mktemp -d)" || \
+        { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to create temporary directory" "${?}"; return "${?}"; };
+
+    pids=()
+    for idx in "${!units[@]}";
+    do
+        # wait for a free job slot
+        while (( num_jobs <= $(jobs -r -p | wc -l) ));
+        do
+            wait -n
+        done
+
+        IFS=$'\t' read -r -a sources <<< "${units[idx]}"
+        ( cd "$(dirname "${sources[0]}")" && wcet_gen_bytecode "${sources[@]}" ) \
+            >"${log_dir}/${idx}.out" 2>"${log_dir}/${idx}.err" &
+        pids[idx]=$!
+    done
+
+    for idx in "${!units[@]}";
+    do
+        wait "${pids[idx]}"; status=$?
+        cat "${log_dir}/${idx}.out"
+        cat "${log_dir}/${idx}.err" 1>&2
+        (( 0 == status )) || \
+            warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 4))" "failed to generate bytecode for <${units[idx]//$'\t'/ }>" "${status}";
+    done
+
+    rm -rf "${log_dir}"
+    return 0
 }
 
 
+# wcet_get_stats_file:
+#   returns the summary file of a configuration, which is private to the
+#   current shard if SHARD_COUNT != 0 (see `wcet_merge_shards`)
+#       ${1}        -- full path to statistics directory for a given configuration
+#       return ${wcet_get_stats_file}
+#                   -- full path to the summary file
+#
+# shellcheck disable=SC2034
+function wcet_get_stats_file ()
+{
+    if (( 0 != SHARD_COUNT )); then
+        wcet_get_stats_file="${1}/$(basename "${1}").${SHARD_INDEX}-of-${SHARD_COUNT}.shard"
+    else
+        wcet_get_stats_file="${1}/$(basename "${1}").txt"
+    fi
+}
+
 # wcet_replicate_dirtree:
 #   replicates folder structure used by a benchmark file within
 #   the statistics folder
@@ -707,8 +1647,9 @@ function wcet_replicate_dirtree ()
     mkdir -p "$(dirname "${dest_file}")" 2>/dev/null || \
         { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "unable to replicate folder tree" "${?}"; return "${?}"; };
 
-    stats_file="${2}/$(basename "${2}").txt"
-    [ -f "${stats_file}" ] || \
+    wcet_get_stats_file "${2}"
+    stats_file="${wcet_get_stats_file}"
+    [ -f "${stats_file}" ] || (( 0 != SHARD_COUNT )) || \
         wcet_print_header > "${stats_file}" || \
             { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${stats_file}> can not be created or overwritten" "${?}"; return "${?}"; };
 
@@ -727,6 +1668,8 @@ function wcet_replicate_dirtree ()
 #       ${5}        -- if != 0, run benchmark up to ${5} times using
 #                       a list of predefined random seeds
 #       ${6}        -- if != 0, use `edges.match` file information
+#       ${7}        -- optional, space-separated list of the indexes of the
+#                      random seeds to be used, default: 1 to ${5}
 #       return ${wcet_handle_file}
 #                   -- full path to the file in which benchmark data has been logged
 #
@@ -767,23 +1710,23 @@ function wcet_handle_file ()
     #   - should run the right omt solver
     #   - should save in ${func_name} the formatted string with collected data
     if (( "${5}" > 0 )); then
-        for (( i = 1; i <= "${5}"; i++ ));
+        for i in ${7:-$(seq 1 "${5}")};
         do
             local seed;
             wcet_get_random_seed "${i}"
             seed="${wcet_get_random_seed}"
             eval "${func_name} \"${wcet_gen_blocks}\" \"${3}\" \"${seed}\" \"${6}\"" || \
-                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${func_name}> unexpected error" "${?}"; return "${?}"; };
+                { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${func_name}> unexpected error" "${?}"; wcet_journal_append "failed" "${i}"; return 1; };
 
             # 4-5. statistics
-            wcet_store_statistics "${1}" "${2}" "${func_name}"
+            wcet_store_statistics "${1}" "${2}" "${func_name}" "${i}"
         done
     else
         eval "${func_name} \"${wcet_gen_blocks}\" \"${3}\" \"0\" \"${6}\"" || \
-            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${func_name}> unexpected error" "${?}"; return "${?}"; };
+            { error "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${func_name}> unexpected error" "${?}"; wcet_journal_append "failed" 0; return 1; };
 
         # 4-5. statistics
-        wcet_store_statistics "${1}" "${2}" "${func_name}"
+        wcet_store_statistics "${1}" "${2}" "${func_name}" 0
     fi
 
     wcet_handle_file="${wcet_store_statistics}"
@@ -796,6 +1739,7 @@ function wcet_handle_file ()
 #       ${1}        -- full path to statistics directory for a given configuration
 #       ${2}        -- full path to the benchmark file
 #       ${3}        -- function handler name
+#       ${4}        -- random seed index, 0: no seed
 #       return ${wcet_handle_file}
 #                   -- full path to the file in which benchmark data has been logged
 #
@@ -805,10 +1749,13 @@ function wcet_store_statistics()
     wcet_store_statistics=
 
     # 4. store data
-    stats_file="${1}/$(basename "${1}").txt"
+    wcet_get_stats_file "${1}"
+    stats_file="${wcet_get_stats_file}"
     [ -n "${!3}" ] || \
-        { warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${3}(${1})> empty result"; return 0; };
-    echo "${!3}" >> "${stats_file}"
+        { warning "${NAME_WCET_LIB}" "${FUNCNAME[0]}" "$((LINENO - 1))" "<${3}(${1})> empty result"; wcet_journal_append "failed" "${4}"; return 0; };
+    wcet_journal_append "ok" "${4}" "${!3}" || return "${?}"
+    # per-shard summary files are only built from the journal
+    (( 0 != SHARD_COUNT )) || echo "${!3}" >> "${stats_file}"
 
     # 5. log test
     stat_max="$(echo "${!3}"  | cut -d\| -f 2 | sed 's/ //g')"
@@ -896,7 +1843,7 @@ function wcet_delete_files ()
             { continue; }
 
         rm -v "${file}" || errors=$((errors + 1))
-    done < <(find "${1}" \( -name "*.bc" -o -name "*.gen" -o -name "*.ll" -o -name "*.smt2" -o -name "*.smt" -o -name "*.err" -o -name "*.longestsyntactic" -o -name "*.llvmtosmtmatch" \) -type f)
+    done < <(find "${1}" \( -name "*.bc" -o -name "*.gen" -o -name "*.gen.gz" -o -name "*.gen.zst" -o -name "*.ll" -o -name "*.smt2" -o -name "*.smt2.gz" -o -name "*.smt2.zst" -o -name "*.smt" -o -name "*.err" -o -name "*.longestsyntactic" -o -name "*.llvmtosmtmatch" -o -name "*.ctab" -o -name "*.bc.sha1" -o -name "*.bc.log" \) -type f)
 
     return $((errors))
 }
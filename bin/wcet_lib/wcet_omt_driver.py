@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+
+import re, time, argparse
+from smt2_solver import *
+from compression import *
+
+###
+### Globals
+###
+
+CUT_VAR = re.compile(r"\bcut_[0-9]+_[0-9]+\b")
+GUARDED = re.compile(r"^\(assert \(=> g_[0-9]+_[0-9]+ (.*)\)\)$", re.DOTALL)
+GUARD = re.compile(r"^\(assert g_[0-9]+_[0-9]+\)$")
+
+###
+### main
+###
+
+def main():
+    """Maximizes the objective of an OMT formula generated by wcet_generator.py
+    with a sequence of satisfiability checks over an SMT solver, searching the
+    optimum value either linearly or by bisection.
+
+    Cuts are kept out of the working formula, and each one of them is activated
+    only when the current model violates its bound, or when the solver does not
+    answer a check in time, in which case the next batch of cuts is activated in
+    the order they appear in the formula (i.e. in rank order, see --selectcuts).
+    Each improving bound is printed as soon as it is found."""
+    opts = get_options()
+    start_time = time.time()
+
+    try:
+        with open_file(opts.filename, 'r') as fd:
+            formula = parse_formula(fd.read())
+    except IOError:
+        print(";; ERROR: file `" + opts.filename + "` does not exist or can not be read, quitting.")
+        quit(1)
+    except Exception as e:
+        print(";; ERROR: " + str(e) + ", quitting.")
+        quit(1)
+
+    solver = SmtSolver(opts.solver)
+    try:
+        status, best, upper = optimize(solver, formula, opts, start_time)
+    finally:
+        solver.close()
+
+    print(status)
+    if status == "sat":
+        print("# Driver optimum: " + str(best))
+    elif status == "unknown" and best is not None:
+        print("# Driver bounds: " + str(best) + " " + str(upper))
+    print("# Driver active cuts: " + str(formula["num_active"]) + "/" + str(len(formula["cuts"])))
+
+###
+### help functions
+###
+
+def get_options():
+    """parses and returns input options"""
+    parser = argparse.ArgumentParser(description="wcet_omt_driver")
+    parser.add_argument("filename", type=str, help="omt formula generated by wcet_generator.py (encoding 0 or 3)")
+    parser.add_argument("--solver", type=str, help="smt solver, z3 or optimathsat", default="z3")
+    parser.add_argument("--search", type=str, help="search strategy, linear or binary", choices=["linear", "binary"], default="linear")
+    parser.add_argument("--timeout", type=int, help="Timeout value (seconds)", default=0)
+    parser.add_argument("--steptimeout", type=int, help="Timeout value of each check (seconds), on expiration more cuts are activated", default=0)
+    parser.add_argument("--batch", type=int, help="number of cuts activated when a check times out", default=4)
+    return parser.parse_args()
+
+def split_commands(txt):
+    """returns the list of top-level s-expressions in `txt`, skipping comments"""
+    commands = []
+    depth = 0
+    cmd = ""
+    for line in txt.split('\n'):
+        if line.strip()[0:1] == ';':
+            continue
+        cmd += line + "\n"
+        depth += line.count("(") - line.count(")")
+        if depth <= 0:
+            if len(cmd.strip()) > 0:
+                commands.append(cmd.strip())
+            cmd = ""
+            depth = 0
+    return commands
+
+def parse_formula(txt):
+    """parses an omt formula generated by wcet_generator.py, and returns a
+    dictionary with its declarations, assertions, objective and cuts"""
+    formula = {
+        "declarations" : [],
+        "assertions"   : [],
+        "objective"    : None,
+        "lower"        : 0,
+        "upper"        : None,
+        "cuts"         : [],    # cut names, in order of appearance
+        "cut_terms"    : {},    # cut name -> summed up terms
+        "cut_bounds"   : {},    # cut name -> bound
+        "cut_formulas" : {},    # cut name -> assertions
+        "active"       : {},    # cut name -> True iff asserted
+        "num_active"   : 0,
+    }
+    res = re.search(r"^; LONGEST_PATH = ([0-9]+)", txt, re.MULTILINE)
+    if res is not None:
+        formula["upper"] = int(res.group(1))
+
+    for cmd in split_commands(txt):
+        head = cmd[1:].split(None, 1)[0]
+        # guards of cuts (see --guardcuts) are dropped, since cuts are activated
+        # on demand anyway
+        if GUARD.match(cmd) is not None:
+            continue
+        res = GUARDED.match(cmd)
+        if res is not None:
+            cmd = "(assert " + res.group(1) + ")"
+        if head == "declare-fun":
+            formula["declarations"].append(cmd)
+        elif head == "assert" and CUT_VAR.search(cmd) is not None:
+            name = CUT_VAR.search(cmd).group(0)
+            if name not in formula["cut_formulas"]:
+                formula["cuts"].append(name)
+                formula["cut_formulas"][name] = []
+                formula["active"][name] = False
+            formula["cut_formulas"][name].append(cmd)
+            eq = re.match(r"\(assert \(= " + name + r" (.*)\)\)$", cmd)
+            if eq is not None:
+                term = eq.group(1)
+                formula["cut_terms"][name] = term[3:-1].split() if term[0:2] == "(+" else [term]
+            leq = re.match(r"\(assert \(<= " + name + r" ([0-9]+)\)\)$", cmd)
+            if leq is not None:
+                formula["cut_bounds"][name] = int(leq.group(1))
+        elif head == "assert":
+            formula["assertions"].append(cmd)
+        elif head == "maximize":
+            tokens = cmd[1:-1].split()
+            formula["objective"] = tokens[1]
+            if ":local-lb" in tokens:
+                formula["lower"] = int(tokens[tokens.index(":local-lb") + 1])
+            if ":local-ub" in tokens:
+                formula["upper"] = int(tokens[tokens.index(":local-ub") + 1]) - 1
+        elif head in ["assert-soft", "minimize"]:
+            raise Exception("unsupported command `" + head + "`")
+
+    if formula["objective"] is None or formula["upper"] is None:
+        raise Exception("no objective to maximize")
+    for name in formula["cuts"]:
+        if name not in formula["cut_terms"] or name not in formula["cut_bounds"]:
+            raise Exception("unsupported encoding of `" + name + "`")
+    return formula
+
+def activate_cut(solver, formula, name):
+    """asserts a cut in the working formula"""
+    for f in formula["cut_formulas"][name]:
+        solver.send(f)
+    formula["active"][name] = True
+    formula["num_active"] += 1
+
+def parse_int(value):
+    """returns the integer printed as `value` by the solver"""
+    value = value.replace("(", "").replace(")", "").split()
+    if value[0] == "-":
+        return -int(value[1])
+    return int(value[0])
+
+def get_violated_cuts(solver, formula):
+    """returns the names of inactive cuts whose bound is violated by the
+    current model"""
+    names = [name for name in formula["cuts"] if not formula["active"][name]]
+    terms = []
+    for name in names:
+        terms += [t for t in formula["cut_terms"][name] if t not in terms and not t.isdigit()]
+    if len(terms) == 0:
+        return []
+    values = solver.get_value(terms)
+    violated = []
+    for name in names:
+        cost = 0
+        for t in formula["cut_terms"][name]:
+            cost += int(t) if t.isdigit() else parse_int(values[t])
+        if cost > formula["cut_bounds"][name]:
+            violated.append(name)
+    return violated
+
+def optimize(solver, formula, opts, start_time):
+    """searches the optimum value of the objective, and returns a triplet with
+    the search status (sat: optimum found, unsat: no solution, unknown: timeout),
+    the best value found so far and the best known upper bound"""
+    objective = formula["objective"]
+    best = None
+    lower = formula["lower"]
+    upper = formula["upper"]
+
+    for d in formula["declarations"]:
+        solver.send(d)
+    for f in formula["assertions"]:
+        solver.send(f)
+
+    while best is None or best < upper:
+        if lower > upper:
+            return "unsat", best, upper
+
+        # set timeout of next check
+        remaining = None
+        if opts.timeout > 0:
+            remaining = opts.timeout - (time.time() - start_time)
+            if remaining < 1:
+                return "unknown", best, upper
+        step = opts.steptimeout if opts.steptimeout > 0 else None
+        if remaining is not None and (step is None or remaining < step):
+            step = remaining
+        if step is not None:
+            solver.set_timeout(step)
+
+        if opts.search == "linear" or best is None:
+            target = lower
+        else:
+            target = (lower + upper + 1) // 2
+
+        solver.push()
+        solver.assert_formula("(>= " + objective + " " + str(target) + ")")
+        status = solver.check_sat()
+
+        if status == "sat":
+            violated = get_violated_cuts(solver, formula)
+            if len(violated) > 0:
+                solver.pop()
+                for name in violated:
+                    activate_cut(solver, formula, name)
+                print("# Driver activated cuts: " + str(len(violated)) + " (violated)")
+                continue
+            best = parse_int(solver.get_value([objective])[objective])
+            lower = best + 1
+            print("# Driver lower bound: " + str(best))
+        elif status == "unsat":
+            upper = target - 1
+            print("# Driver upper bound: " + str(upper))
+        else:
+            inactive = [name for name in formula["cuts"] if not formula["active"][name]]
+            if len(inactive) == 0 or (remaining is not None and step >= remaining):
+                solver.pop()
+                return "unknown", best, upper
+            solver.pop()
+            for name in inactive[:opts.batch]:
+                activate_cut(solver, formula, name)
+            print("# Driver activated cuts: " + str(len(inactive[:opts.batch])) + " (timeout)")
+            continue
+        solver.pop()
+
+    return "sat", best, upper
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    main()
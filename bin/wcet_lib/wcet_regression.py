@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+
+import os, re, sys, json, math, time, argparse, tempfile, subprocess, shutil
+
+###
+### Globals
+###
+
+LOC_WCET_LIB = os.path.dirname(os.path.realpath(__file__))
+
+SEED_PREFIX = re.compile(r"^seed_[0-9]+_")
+
+# exit status when a regression is found, errors quit with 1
+EXIT_REGRESSION = 2
+
+# largest sample size for which the exact distribution of a rank statistic
+# is computed, the normal approximation is used otherwise
+MAX_EXACT_SIZE = 20
+
+###
+### main
+###
+
+def main():
+    """Records the timing distribution of a pinned set of benchmarks at a given
+    commit, or compares the distributions recorded at two commits.
+
+    Timings are either taken from the summary files of an experiment, either
+    run on purpose (see --run) or not (see --stats), or measured by running
+    wcet_generator.py on a set of `.gen` files (see --generator), which needs
+    no solver and is deterministic but for its running time. Each sample is
+    stored in `STORE/COMMIT.json` under a `benchmark|handler` key.
+
+    Each benchmark is compared with a two-sided Mann-Whitney U test, and each
+    handler is compared over all benchmarks with a Wilcoxon signed-rank test
+    on the log-ratios of the medians. A slowdown is a regression if it is
+    significant and the ratio of the medians exceeds 1 + threshold."""
+    opts = get_options()
+
+    if opts.command == "record":
+        record(opts)
+    else:
+        if not compare(opts):
+            quit(EXIT_REGRESSION)
+
+###
+### help functions
+###
+
+def get_options():
+    """parses and returns input options"""
+    parser = argparse.ArgumentParser(description="wcet_regression")
+    subparsers = parser.add_subparsers(dest="command")
+
+    rec = subparsers.add_parser("record", help="records timings at a commit")
+    rec.add_argument("store", type=str, help="directory storing the timings of each commit")
+    rec.add_argument("--commit", type=str, help="commit identifier, default: current HEAD", default=None)
+    rec.add_argument("--stats", type=str, nargs="+", help="summary files of an experiment (ext: `.txt`)", default=[])
+    rec.add_argument("--run", type=str, help="benchmarks directory on which to run an experiment", default=None)
+    rec.add_argument("--handlers", type=str, nargs="+", help="handlers run with --run", default=["z3_0"])
+    rec.add_argument("--seeds", type=int, help="number of seeds of each handler run with --run", default=5)
+    rec.add_argument("--timeout", type=int, help="timeout of each handler run with --run (seconds)", default=60)
+    rec.add_argument("--generator", type=str, nargs="+", help="blocks files on which to run wcet_generator.py (ext: `.gen`)", default=[])
+    rec.add_argument("--encodings", type=int, nargs="+", help="encodings used with --generator", default=[0])
+    rec.add_argument("--options", type=str, help="extra options of wcet_generator.py, e.g. --options=\"--simplify --recursivecuts\"", default="")
+    rec.add_argument("--repeat", type=int, help="number of runs of each generator configuration", default=5)
+
+    cmp = subparsers.add_parser("compare", help="compares the timings of two commits")
+    cmp.add_argument("store", type=str, help="directory storing the timings of each commit")
+    cmp.add_argument("base", type=str, help="commit identifier of the baseline")
+    cmp.add_argument("head", type=str, help="commit identifier compared against the baseline")
+    cmp.add_argument("--alpha", type=float, help="significance level", default=0.05)
+    cmp.add_argument("--threshold", type=float, help="smallest relative slowdown of the median regarded as a regression", default=0.10)
+    return parser.parse_args()
+
+def get_commit():
+    """returns the identifier of the commit checked out in the repository"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=LOC_WCET_LIB,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        print(";; ERROR: unable to get current commit, use --commit, quitting.")
+        quit(1)
+
+def get_store_file(store, commit):
+    return os.path.join(store, commit + ".json")
+
+def load_samples(store, commit):
+    """returns the samples recorded at `commit`, an empty map if none"""
+    try:
+        with open(get_store_file(store, commit), 'r') as fd:
+            return json.load(fd)["samples"]
+    except IOError:
+        return {}
+
+def store_samples(store, commit, samples):
+    """stores the samples of `commit`, atomically"""
+    if not os.path.isdir(store):
+        os.makedirs(store)
+    file = get_store_file(store, commit)
+    tmp_file = file + "." + str(os.getpid())
+    with open(tmp_file, 'w') as fd:
+        json.dump({"commit" : commit, "samples" : samples}, fd, indent=1, sort_keys=True)
+    os.rename(tmp_file, file)
+
+# record
+
+def record(opts):
+    """collects timings, and adds them to those already recorded at the commit"""
+    commit = opts.commit if opts.commit is not None else get_commit()
+    samples = load_samples(opts.store, commit)
+    new_samples = {}
+
+    for file in opts.stats:
+        collect_summary(file, new_samples)
+    if opts.run is not None:
+        run_experiment(opts.run, opts.handlers, opts.seeds, opts.timeout, new_samples)
+    for file in opts.generator:
+        for encoding in opts.encodings:
+            time_generator(file, encoding, opts.options.split(), opts.repeat, new_samples)
+
+    if len(new_samples) == 0:
+        print(";; ERROR: no timings collected, see --stats, --run and --generator, quitting.")
+        quit(1)
+
+    for key in new_samples.keys():
+        samples.setdefault(key, []).extend(new_samples[key])
+    store_samples(opts.store, commit, samples)
+    print("recorded " + str(sum(len(v) for v in new_samples.values())) + " samples of " +
+          str(len(new_samples)) + " benchmarks at " + commit)
+
+def collect_summary(file, samples):
+    """parses a summary file generated by wcet_omt, adding the time taken by each
+    row to `samples`, under the key `benchmark|handler`; the benchmark is the
+    path of the output file relative to the summary file, stripped of the seed"""
+    handler = os.path.splitext(os.path.basename(file))[0]
+    base_dir = os.path.dirname(os.path.realpath(file))
+    try:
+        with open(file, 'r') as fd:
+            for line in list(fd)[1:]:
+                fields = [f.strip() for f in line.split("|")[1:-1]]
+                if len(fields) < 12:
+                    continue
+                real_time, out_file = fields[4], fields[11]
+                bench = os.path.relpath(out_file, base_dir)
+                bench = os.path.join(os.path.dirname(bench), SEED_PREFIX.sub("", os.path.basename(bench)))
+                samples.setdefault(bench + "|" + handler, []).append(float(real_time))
+    except IOError:
+        print(";; ERROR: file `" + file + "` does not exist or can not be read, quitting.")
+        quit(1)
+    except ValueError:
+        print(";; ERROR: file `" + file + "` is not a summary file, quitting.")
+        quit(1)
+
+def run_experiment(bench_dir, handlers, seeds, timeout, samples):
+    """runs the given handlers over a benchmarks directory, with `seeds` seeds each,
+    and collects the resulting timings"""
+    stats_dir = tempfile.mkdtemp(prefix="wcet_regression.")
+    try:
+        cmd = [os.path.join(LOC_WCET_LIB, "..", "run_experiment.sh"), "-t", str(timeout)]
+        if seeds > 0:
+            cmd += ["-z", str(seeds)]
+        ret = subprocess.call(cmd + [bench_dir, stats_dir] + handlers)
+        if ret != 0:
+            print(";; ERROR: run_experiment.sh failed with status " + str(ret) + ", quitting.")
+            quit(1)
+        for handler in handlers:
+            collect_summary(os.path.join(stats_dir, handler, handler + ".txt"), samples)
+    finally:
+        shutil.rmtree(stats_dir)
+
+def time_generator(file, encoding, options, repeat, samples):
+    """runs wcet_generator.py `repeat` times over a blocks file, and collects the
+    time taken by each run"""
+    cmd = [sys.executable, os.path.join(LOC_WCET_LIB, "wcet_generator.py"),
+           "--encoding", str(encoding)] + options + [file]
+    key = os.path.basename(file) + "|generator_" + str(encoding)
+    with open(os.devnull, 'w') as devnull:
+        for idx in range(0, repeat):
+            start_time = time.time()
+            ret = subprocess.call(cmd, stdout=devnull)
+            elapsed = time.time() - start_time
+            if ret != 0:
+                print(";; ERROR: wcet_generator.py failed on `" + file + "`, quitting.")
+                quit(1)
+            samples.setdefault(key, []).append(elapsed)
+
+# compare
+
+def compare(opts):
+    """compares the timings recorded at two commits, prints a report and returns
+    False iff a regression is found"""
+    base = load_samples(opts.store, opts.base)
+    head = load_samples(opts.store, opts.head)
+    keys = sorted(set(base.keys()) & set(head.keys()))
+    if len(keys) == 0:
+        print(";; ERROR: no benchmark recorded at both `" + opts.base + "` and `" + opts.head + "`, quitting.")
+        quit(1)
+
+    ok = True
+    ratios = {}
+    print("| benchmark | handler | base median | head median | ratio | U | p-value | effect | verdict |")
+    for key in keys:
+        bench, handler = key.rsplit("|", 1)
+        base_median = median(base[key])
+        head_median = median(head[key])
+        ratio = get_ratio(base_median, head_median)
+        u, p_value = mann_whitney_u(head[key], base[key])
+        effect = 2.0 * u / (len(head[key]) * len(base[key])) - 1 # Cliff's delta, > 0: head is slower
+        verdict = get_verdict(ratio, p_value, opts)
+        ok = ok and verdict != "REGRESSION"
+        ratios.setdefault(handler, []).append(ratio)
+        print("| " + bench + " | " + handler + " | " + "%.3f" % base_median + " | " + "%.3f" % head_median +
+              " | " + "%.3f" % ratio + " | " + "%.1f" % u + " | " + "%.4f" % p_value + " | " + "%+.2f" % effect +
+              " | " + verdict + " |")
+
+    print("| handler | # benchmarks | geo. mean ratio | W+ | p-value | verdict |")
+    for handler in sorted(ratios.keys()):
+        log_ratios = [math.log(r) for r in ratios[handler]]
+        ratio = math.exp(sum(log_ratios) / len(log_ratios))
+        w, p_value = wilcoxon_signed_rank(log_ratios)
+        verdict = get_verdict(ratio, p_value, opts)
+        ok = ok and verdict != "REGRESSION"
+        print("| " + handler + " | " + str(len(log_ratios)) + " | " + "%.3f" % ratio + " | " + "%.1f" % w +
+              " | " + "%.4f" % p_value + " | " + verdict + " |")
+    return ok
+
+def get_verdict(ratio, p_value, opts):
+    if p_value >= opts.alpha:
+        return "-"
+    if ratio > 1.0 + opts.threshold:
+        return "REGRESSION"
+    return "slower" if ratio > 1.0 else "faster"
+
+def get_ratio(base_value, head_value):
+    """returns head / base, with times clamped to 1 ms"""
+    return max(head_value, 0.001) / max(base_value, 0.001)
+
+def median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    if len(values) % 2 == 0:
+        return (values[mid - 1] + values[mid]) / 2.0
+    return values[mid]
+
+# rank tests
+
+def get_ranks(values):
+    """returns the ranks of `values`, starting from 1, ties get their average rank"""
+    order = sorted(range(0, len(values)), key=lambda idx: values[idx])
+    ranks = [0.0] * len(values)
+    idx = 0
+    while idx < len(order):
+        end = idx
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[idx]]:
+            end += 1
+        for k in range(idx, end + 1):
+            ranks[order[k]] = (idx + end) / 2.0 + 1
+        idx = end + 1
+    return ranks
+
+def get_tie_sizes(values):
+    counts = {}
+    for v in values:
+        counts[v] = counts.get(v, 0) + 1
+    return [c for c in counts.values() if c > 1]
+
+def normal_sf(z):
+    """returns P(Z >= z) for a standard normal variable Z"""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def mann_whitney_u(xs, ys):
+    """returns the U statistic of `xs`, i.e. the number of pairs in which the
+    value of `xs` is greater (ties count 1/2), and the two-sided p-value of the
+    Mann-Whitney U test"""
+    n1, n2 = len(xs), len(ys)
+    ranks = get_ranks(xs + ys)
+    u = sum(ranks[0:n1]) - n1 * (n1 + 1) / 2.0
+    ties = get_tie_sizes(xs + ys)
+
+    if len(ties) == 0 and n1 <= MAX_EXACT_SIZE and n2 <= MAX_EXACT_SIZE:
+        counts = get_u_counts(n1, n2)
+        total = float(sum(counts))
+        lower = sum(counts[0:int(u) + 1]) / total
+        upper = sum(counts[int(u):]) / total
+        return u, min(1.0, 2 * min(lower, upper))
+
+    n = n1 + n2
+    mean = n1 * n2 / 2.0
+    var = n1 * n2 / 12.0 * ((n + 1) - sum(t ** 3 - t for t in ties) / float(n * (n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(var)
+    return u, min(1.0, 2 * normal_sf(max(z, 0.0)))
+
+def get_u_counts(n1, n2):
+    """returns the number of arrangements of two samples of size n1 and n2 for
+    each value of the U statistic, with no ties"""
+    # counts[i][j][u]: arrangements of i values of the first sample and j of the second one
+    counts = [[None] * (n2 + 1) for idx in range(0, n1 + 1)]
+    for i in range(0, n1 + 1):
+        for j in range(0, n2 + 1):
+            if i == 0 or j == 0:
+                counts[i][j] = [1]
+                continue
+            # the largest value belongs either to the first sample, and exceeds
+            # all the j values of the second one, or to the second sample
+            cur = [0] * (i * j + 1)
+            for u, c in enumerate(counts[i - 1][j]):
+                cur[u + j] += c
+            for u, c in enumerate(counts[i][j - 1]):
+                cur[u] += c
+            counts[i][j] = cur
+    return counts[n1][n2]
+
+def wilcoxon_signed_rank(diffs):
+    """returns the W+ statistic of `diffs`, i.e. the sum of the ranks of the positive
+    differences by absolute value, and the two-sided p-value of the Wilcoxon
+    signed-rank test; zero differences are dropped"""
+    diffs = [d for d in diffs if d != 0]
+    n = len(diffs)
+    if n == 0:
+        return 0.0, 1.0
+    ranks = get_ranks([abs(d) for d in diffs])
+    w = sum(r for r, d in zip(ranks, diffs) if d > 0)
+    ties = get_tie_sizes([abs(d) for d in diffs])
+
+    if len(ties) == 0 and n <= MAX_EXACT_SIZE:
+        # counts[s]: number of subsets of {1..n} summing up to s
+        counts = [1] + [0] * (n * (n + 1) // 2)
+        for k in range(1, n + 1):
+            for s in range(len(counts) - 1, k - 1, -1):
+                counts[s] += counts[s - k]
+        total = float(2 ** n)
+        lower = sum(counts[0:int(w) + 1]) / total
+        upper = sum(counts[int(w):]) / total
+        return w, min(1.0, 2 * min(lower, upper))
+
+    mean = n * (n + 1) / 4.0
+    var = n * (n + 1) * (2 * n + 1) / 24.0 - sum(t ** 3 - t for t in ties) / 48.0
+    if var <= 0:
+        return w, 1.0
+    z = (abs(w - mean) - 0.5) / math.sqrt(var)
+    return w, min(1.0, 2 * normal_sf(max(z, 0.0)))
+
+###
+###
+###
+
+if (__name__ == "__main__"):
+    main()